@@ -0,0 +1,115 @@
+import os
+import sys
+import time
+import subprocess
+import tkinter as tk
+
+from chat_view import CanvasChatView, ChatView, add_chat_bubble
+from joke_corpus import JokeCorpus
+
+# CHAT BENCHMARK
+# Appends messages to each way of showing the chat and reports, at each size:
+#     append ms  time per message over the last BATCH appended, including Tk's layout
+#     MB         how much the process grew (Tk's own memory included) since it started
+# Renderers: "widgets" is add_chat_bubble (a Frame and a Label per message, never removed),
+# "window" is ChatView (bounded, recycled bubbles) and "canvas" is CanvasChatView.
+# Each renderer runs in its own process so they don't share memory growth.
+# Needs a display. Run with: python bench_chat.py [messages ...]   (defaults to 1k, 10k and 100k)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+RENDERERS = ("widgets", "window", "canvas")
+BATCH = 100 # Messages appended between layout updates
+
+
+def rss_mb():
+    # Resident memory of this process in MB, or None where it can't be read
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource # Peak rather than current, but memory only grows here
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+    except ImportError:
+        return None
+
+def messages(count):
+    # Alternating "you" / "alexa" messages, jokes taken in turn from the corpus
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    jokes = JokeCorpus(os.path.join(base_dir, "resources", "randomJokes.txt"))
+    for i in range(count):
+        if i % 2 == 0:
+            yield "you", "Hey, Alexa.. Tell me a joke!"
+        else:
+            setup, punchline = jokes.joke(i // 2 % len(jokes))
+            yield "alexa", f"{setup} {punchline}"
+
+def make_renderer(name, root):
+    canvas = tk.Canvas(root, bg="#5FB1EF", highlightthickness=0, width=343, height=540)
+    canvas.pack(side="left", fill="both", expand=True)
+    scrollbar = tk.Scrollbar(root, orient="vertical", command=canvas.yview)
+    scrollbar.pack(side="right", fill="y")
+    if name == "canvas":
+        view = CanvasChatView(canvas, scrollbar)
+        return view.add
+    frame = tk.Frame(canvas, bg="#5FB1EF")
+    canvas.create_window((0, 0), window=frame, anchor="nw")
+    if name == "window":
+        view = ChatView(canvas, frame, scrollbar)
+        return view.add
+    # The original set-up: scroll region from bbox("all") on every resize of the frame
+    canvas.configure(yscrollcommand=scrollbar.set)
+    frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+    return lambda sender, text: add_chat_bubble(frame, text, sender=sender)
+
+def run_one(name, sizes):
+    # Prints "size append_ms mb" lines for one renderer (in a child process)
+    root = tk.Tk()
+    root.geometry("360x540")
+    add = make_renderer(name, root)
+    root.update()
+    start_mb = rss_mb()
+    sizes = sorted(sizes)
+    done = 0
+    for sender_text in messages(sizes[-1]):
+        if done % BATCH == 0:
+            batch_start = time.perf_counter()
+        add(*sender_text)
+        done += 1
+        if done % BATCH == 0 or done in sizes:
+            root.update_idletasks() # Layout (and for widgets, geometry) for the batch
+            batch_ms = (time.perf_counter() - batch_start) * 1000 / (done % BATCH or BATCH)
+        if done in sizes:
+            mb = rss_mb()
+            grown = "n/a" if mb is None or start_mb is None else f"{mb - start_mb:.1f}"
+            print(done, f"{batch_ms:.3f}", grown, flush=True)
+    root.destroy()
+
+def run(sizes):
+    print(f"{'messages':>10} {'renderer':>8} {'append ms':>10} {'MB':>8}")
+    results = {}
+    for name in RENDERERS:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--one", name, *map(str, sizes)],
+                             capture_output=True, text=True)
+        if out.returncode:
+            print(f"{name} failed:", out.stderr.strip().splitlines()[-1:])
+            continue
+        for line in out.stdout.split("\n"):
+            if line:
+                size, append_ms, mb = line.split()
+                results[int(size), name] = (float(append_ms), mb)
+    for size in sorted(sizes):
+        for name in RENDERERS:
+            if (size, name) in results:
+                append_ms, mb = results[size, name]
+                print(f"{size:>10} {name:>8} {append_ms:>10.3f} {mb:>8}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--one"]:
+        run_one(sys.argv[2], [int(arg) for arg in sys.argv[3:]])
+    else:
+        sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+        run(sizes)
@@ -0,0 +1,313 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from collections import OrderedDict, deque
+from frame_scheduler import FrameScheduler
+
+# CHAT VIEW
+# The whole conversation is kept as plain (sender, text) pairs in a ChatTranscript,
+# but only a window of the messages (WINDOW of them at most) has bubble widgets.
+# A new message reuses the oldest bubble instead of making another Frame and Label,
+# and scrolling to the top or bottom of the window moves it SHIFT messages along,
+# again by re-filling the bubbles that scrolled out. So each message costs the same
+# however long the chat has been running, and the widget count never grows.
+#
+# CanvasChatView is the other way of showing the chat: no widgets at all, each bubble
+# is a rectangle and a text item drawn on the canvas. It wraps the text itself (the
+# same way a Label with wraplength=260 does) using cached text widths, and keeps the
+# scroll region up to date itself. Pick it with CHAT_RENDERER=canvas (see joke.py).
+#
+# Both views leave scroll region updates and scrolling to a FrameScheduler, so adding
+# several messages and scrolling after each costs one update per frame, not one each.
+
+WINDOW = 60 # Bubbles alive at most
+SHIFT = 20 # Messages brought in when scrolling past either end of the window
+
+WRAP = 260 # Text width before wrapping, as the bubble labels' wraplength
+BUBBLE_FONT = ("Arial", 12)
+PAD_X = 13 # Text to bubble edge: frame padx 10 + border 1 + label border and padx 2
+PAD_Y = 10 # Frame pady 7 + border 1 + label border and pady 2
+GAP = 5 # Space above and below each bubble (pack pady)
+WIDTH_CACHE = 50_000 # Words whose width is remembered
+LAYOUT_CACHE = 4096 # Messages whose wrapped lines are remembered
+
+# sender -> (bubble color, alignment, space left and right)
+BUBBLE_STYLES = {
+    "you": ("#DCF8C6", "e", (50, 5)), # user green, on the right
+    "alexa": ("#FFFFFF", "w", (5, 50)), # bot white, on the left
+}
+
+
+# CHAT BUBBLE
+def add_chat_bubble(frame, text, sender="alexa"):
+    # Creates the "messenger" feel of the app (theme) with a new bubble per message.
+    # ChatView reuses bubbles instead; this is kept for one-off bubbles and comparisons
+    bubble_color, anchor_val, padx_val = BUBBLE_STYLES.get(sender, BUBBLE_STYLES["alexa"])
+
+    # Bubble frame
+    bubble = tk.Frame(
+        frame,
+        bg=bubble_color,
+        padx=10, pady=7,
+        bd=1, relief="solid"
+    )
+    bubble.pack(anchor=anchor_val, pady=5, padx=padx_val)
+
+    # Label inside bubble
+    label = tk.Label(
+        bubble,
+        text=text,
+        font=("Arial", 12),
+        wraplength=260, # to wrap text
+        justify="left",
+        bg=bubble_color
+    )
+    label.pack()
+
+
+class ChatTranscript:
+    def __init__(self):
+        self.messages = [] # (sender, text), oldest first
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __getitem__(self, i):
+        return self.messages[i]
+
+    def append(self, sender, text):
+        self.messages.append((sender, text))
+        return len(self.messages) - 1
+
+
+class Bubble:
+    # One bubble Frame + Label, filled with whichever message it currently shows
+    def __init__(self, parent):
+        self.frame = tk.Frame(parent, padx=10, pady=7, bd=1, relief="solid")
+        self.label = tk.Label(self.frame, font=("Arial", 12), wraplength=260, justify="left")
+        self.label.pack()
+
+    def show(self, sender, text, before=None):
+        bubble_color, anchor_val, padx_val = BUBBLE_STYLES.get(sender, BUBBLE_STYLES["alexa"])
+        self.frame.config(bg=bubble_color)
+        self.label.config(text=text, bg=bubble_color)
+        if before is None:
+            self.frame.pack(anchor=anchor_val, pady=5, padx=padx_val)
+        else:
+            self.frame.pack(anchor=anchor_val, pady=5, padx=padx_val, before=before.frame)
+
+    def hide(self):
+        self.frame.pack_forget()
+
+
+class ChatView:
+    def __init__(self, canvas, frame, scrollbar, window=WINDOW, shift=SHIFT, scheduler=None):
+        self.canvas = canvas
+        self.frame = frame # Frame inside the canvas that holds the bubbles
+        self.scrollbar = scrollbar
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler(canvas)
+        self.window = window
+        self.shift = min(shift, window)
+        self.transcript = ChatTranscript()
+        self.start = self.end = 0 # Messages start..end-1 have bubbles
+        self.bubbles = deque() # Bubbles showing those messages, top to bottom
+        self.spare = [] # Hidden bubbles waiting to be reused
+        # The scroll region is just the bubbles' frame, so no bbox("all") over the canvas
+        frame.bind("<Configure>", lambda e: self.scheduler.request("scrollregion", self._set_scrollregion))
+        canvas.configure(yscrollcommand=self._scrolled)
+
+    def _set_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, self.frame.winfo_width(), self.frame.winfo_height()))
+
+    def _bubble(self):
+        return self.spare.pop() if self.spare else Bubble(self.frame)
+
+    def _drop_top(self):
+        bubble = self.bubbles.popleft()
+        bubble.hide()
+        self.spare.append(bubble)
+        self.start += 1
+
+    def _drop_bottom(self):
+        bubble = self.bubbles.pop()
+        bubble.hide()
+        self.spare.append(bubble)
+        self.end -= 1
+
+    def add(self, sender, text):
+        i = self.transcript.append(sender, text)
+        if self.end == i: # Showing the newest messages: this one goes at the bottom
+            if self.end - self.start >= self.window:
+                self._drop_top() # ...and the oldest bubble is reused for it
+            bubble = self._bubble()
+            bubble.show(sender, text)
+            self.bubbles.append(bubble)
+            self.end += 1
+        # Otherwise someone is reading older messages: it shows when they scroll down
+
+    def scroll_to_end(self):
+        # Jumps to the newest message (bringing the window back there first if needed)
+        if self.end < len(self.transcript):
+            self.scheduler.request("layout", self._move_window, max(0, len(self.transcript) - self.window))
+        self.scheduler.request("scroll", self._scroll_end)
+
+    def _scroll_end(self):
+        self.frame.update_idletasks() # Bubbles added this frame are laid out first
+        self.scheduler.cancel("scrollregion") # Set here already, with the new size
+        self._set_scrollregion()
+        self.canvas.yview_moveto(1.0)
+
+    # SCROLLING
+    def _scrolled(self, first, last):
+        self.scrollbar.set(first, last)
+        # At the top or bottom of the window with more messages past it: move the window
+        if float(first) <= 0 and self.start > 0:
+            target = max(0, self.start - self.shift)
+        elif float(last) >= 1 and self.end < len(self.transcript):
+            target = max(0, min(self.start + self.shift, len(self.transcript) - self.window))
+        else:
+            return
+        self.scheduler.request("layout", self._move_window, target, True)
+
+    def _move_window(self, start, keep_place=False):
+        # Shows messages start..start+window-1, refilling bubbles rather than making new ones
+        end = min(len(self.transcript), start + self.window)
+        anchor = None
+        if keep_place and self.bubbles:
+            # Remember which message is at the top of the view and where, to put it back there
+            self.frame.update_idletasks()
+            top = float(self.canvas.yview()[0]) * self.frame.winfo_height()
+            for i, bubble in enumerate(self.bubbles):
+                if bubble.frame.winfo_y() + bubble.frame.winfo_height() > top:
+                    anchor, offset = self.start + i, top - bubble.frame.winfo_y()
+                    break
+
+        # Hide the messages that are leaving the window...
+        while self.start < self.end and self.start < start:
+            self._drop_top()
+        while self.start < self.end and self.end > end:
+            self._drop_bottom()
+        if self.start == self.end: # Nothing in common with the old window
+            self.start = self.end = start
+        # ...and fill the bubbles freed up with the ones coming in, on top or at the bottom
+        for i in range(self.start - 1, start - 1, -1):
+            bubble = self._bubble()
+            bubble.show(*self.transcript[i], before=self.bubbles[0] if self.bubbles else None)
+            self.bubbles.appendleft(bubble)
+            self.start -= 1
+        for i in range(self.end, end):
+            bubble = self._bubble()
+            bubble.show(*self.transcript[i])
+            self.bubbles.append(bubble)
+            self.end += 1
+
+        if anchor is not None and self.start <= anchor < self.end:
+            self.frame.update_idletasks()
+            self.scheduler.cancel("scrollregion") # The fraction below is of the new height, so set it now
+            self._set_scrollregion()
+            y = self.bubbles[anchor - self.start].frame.winfo_y() + offset
+            self.canvas.yview_moveto(y / max(1, self.frame.winfo_height()))
+
+
+# CANVAS BUBBLES
+def wrap_text(text, width, measure):
+    # Lines of text broken at spaces so none is wider than width, like a Tk Label's
+    # wraplength (measure(s) gives the width of s). A word too long for a line of its
+    # own is split wherever it has to be
+    lines = []
+    space = measure(" ")
+    for paragraph in text.split("\n"):
+        line, line_width = [], 0
+        for word in paragraph.split(" "):
+            word_width = measure(word)
+            if line and line_width + space + word_width > width:
+                lines.append(" ".join(line))
+                line, line_width = [], 0
+            if line:
+                line.append(word)
+                line_width += space + word_width
+                continue
+            while word_width > width and len(word) > 1:
+                # Longest start of the word that fits (at least one character)
+                low, high = 1, len(word) - 1
+                while low < high:
+                    middle = (low + high + 1) // 2
+                    if measure(word[:middle]) <= width:
+                        low = middle
+                    else:
+                        high = middle - 1
+                lines.append(word[:low])
+                word = word[low:]
+                word_width = measure(word)
+            line, line_width = [word], word_width
+        lines.append(" ".join(line))
+    return lines
+
+
+class TextMeasurer:
+    # Widths of words and wrapped layouts of whole messages, each worked out once
+    def __init__(self, font):
+        self.font = font
+        self.linespace = font.metrics("linespace")
+        self._widths = {}
+        self._layouts = OrderedDict() # text -> (lines, width, height), least recently used first
+
+    def width(self, text):
+        width = self._widths.get(text)
+        if width is None:
+            if len(self._widths) >= WIDTH_CACHE:
+                self._widths.clear()
+            width = self._widths[text] = self.font.measure(text)
+        return width
+
+    def layout(self, text, wrap=WRAP):
+        # (wrapped lines, widest line, height) of text
+        layout = self._layouts.get(text)
+        if layout is not None:
+            self._layouts.move_to_end(text)
+            return layout
+        lines = wrap_text(text, wrap, self.width)
+        width = max(sum(self.width(word) for word in line.split(" ")) + self.width(" ") * line.count(" ")
+                    for line in lines)
+        layout = self._layouts[text] = (lines, width, len(lines) * self.linespace)
+        if len(self._layouts) > LAYOUT_CACHE:
+            self._layouts.popitem(last=False)
+        return layout
+
+
+class CanvasChatView:
+    def __init__(self, canvas, scrollbar, font=BUBBLE_FONT, scheduler=None):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler(canvas)
+        self.transcript = ChatTranscript()
+        self.measurer = TextMeasurer(tkfont.Font(root=canvas, font=font))
+        self.width = int(canvas.cget("width")) # Corrected once the canvas is on screen
+        self.bottom = 0 # y just below the last bubble's gap
+        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.bind("<Configure>", self._resized)
+
+    def _resized(self, event):
+        if event.width != self.width:
+            self.canvas.move("you", event.width - self.width, 0) # Right-aligned bubbles follow the edge
+            self.width = event.width
+            self.scheduler.request("scrollregion", self._set_scrollregion)
+
+    def _set_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, self.width, self.bottom))
+
+    def add(self, sender, text):
+        self.transcript.append(sender, text)
+        bubble_color, anchor_val, padx_val = BUBBLE_STYLES.get(sender, BUBBLE_STYLES["alexa"])
+        lines, text_width, text_height = self.measurer.layout(text)
+        width, height = text_width + 2 * PAD_X, text_height + 2 * PAD_Y
+        x = padx_val[0] if anchor_val == "w" else self.width - padx_val[1] - width
+        y = self.bottom + GAP
+        tags = ("you",) if anchor_val == "e" else ()
+        self.canvas.create_rectangle(x, y, x + width, y + height, fill=bubble_color, outline="black", tags=tags)
+        self.canvas.create_text(x + PAD_X, y + PAD_Y, text="\n".join(lines), anchor="nw", justify="left",
+                                font=self.measurer.font, tags=tags)
+        self.bottom = y + height + GAP
+        self.scheduler.request("scrollregion", self._set_scrollregion)
+
+    def scroll_to_end(self):
+        self.scheduler.request("scroll", self.canvas.yview_moveto, 1.0) # After the scroll region is set
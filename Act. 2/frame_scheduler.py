@@ -0,0 +1,67 @@
+import tkinter as tk
+
+# FRAME SCHEDULER
+# Layout, scroll region and scroll updates for the chat are asked for here instead of
+# being done (or put on a timer) straight away. Everything asked for before the next
+# frame tick is done together in that one tick, and each kind of update at most once:
+#     "layout"        moving the chat's window of bubbles
+#     "scrollregion"  resizing the canvas' scroll region
+#     "scroll"        scrolling the canvas
+# in that order, so a scroll always sees the scroll region it needs.
+# Counters:
+#     requested  updates asked for
+#     coalesced  asked for again, the same way, before the tick (merged into the pending one)
+#     dropped    replaced by a different request of the same kind before the tick, cancelled,
+#                or asked for after the window was closed
+#     frames     ticks that actually ran
+
+FRAME_MS = 16 # About 60 ticks a second
+PHASES = ("layout", "scrollregion", "scroll")
+
+
+class FrameScheduler:
+    def __init__(self, widget, frame_ms=FRAME_MS):
+        self.widget = widget # Any widget, used for after()
+        self.frame_ms = frame_ms
+        self._pending = {} # kind -> (callback, args)
+        self._job = None # after() id of the next tick
+        self.requested = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.frames = 0
+
+    def request(self, kind, callback, *args):
+        # Runs callback(*args) at the next tick, instead of any earlier request of this kind
+        self.requested += 1
+        previous = self._pending.get(kind)
+        if previous is not None:
+            if previous == (callback, args):
+                self.coalesced += 1
+            else:
+                self.dropped += 1
+        self._pending[kind] = (callback, args)
+        if self._job is None:
+            try:
+                self._job = self.widget.after(self.frame_ms, self._tick)
+            except tk.TclError: # Window already closed
+                self._pending.clear()
+                self.dropped += 1
+
+    def cancel(self, kind):
+        if self._pending.pop(kind, None) is not None:
+            self.dropped += 1
+
+    def _tick(self):
+        self._job = None
+        pending, self._pending = self._pending, {} # Requests made from here on go to the next tick
+        self.frames += 1
+        for kind in PHASES:
+            if kind in pending:
+                callback, args = pending.pop(kind)
+                callback(*args)
+        for callback, args in pending.values(): # Any other kinds, in the order first asked for
+            callback(*args)
+
+    def stats(self):
+        return {"requested": self.requested, "coalesced": self.coalesced,
+                "dropped": self.dropped, "frames": self.frames}
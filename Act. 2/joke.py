@@ -1,64 +1,37 @@
 import tkinter as tk
 from PIL import Image, ImageTk
-import random
 import os
-import pygame
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For the shared modules at the top of the repo
+from joke_corpus import JokeCorpus # Indexed jokes file (see joke_corpus.py)
+from joke_picker import JokePicker # Chooses the next joke (see joke_picker.py)
+from chat_view import CanvasChatView, ChatView # Chat bubbles (see chat_view.py)
+from sound_bank import SoundBank # Music and sound effects (see sound_bank.py, next to build_assets.py)
+from build_assets import lookup_prebuilt # Pre-sized images (see build_assets.py)
 
 # LOAD JOKES
 def load_jokes():
-    # This load the jokes from my "radomJokes.txt" in my resources folder.
+    # This opens the jokes from my "radomJokes.txt" in my resources folder.
+    # Jokes are read one at a time when told, so a huge file opens just as quickly
     base_dir = os.path.dirname(os.path.abspath(__file__))
     jokes_path = os.path.join(base_dir, "resources", "randomJokes.txt") # File directory
 
-    jokes = []
     if not os.path.exists(jokes_path):
         print("Jokes file not found!") # In case the file isn't found in the folder
-        return jokes
-        
-    with open(jokes_path, "r", encoding="utf-8") as file:
-        for line in file:
-            line = line.strip()
-            if "?" not in line: # Skips invalid lines
-                continue
-            setup, punchline = line.split("?", 1)
-            jokes.append((setup.strip() + "?", punchline.strip()))
-    return jokes
-
-# CHAT BUBBLE
-def add_chat_bubble(frame, text, sender="alexa"):
-    # Creates the "messenger" feel of the app (theme)
-    # Determine bubble color and alignment
-    if sender == "you":
-        bubble_color = "#DCF8C6"  # user green
-        side = "right"  # align to right
-        anchor_val = "e"
-        padx_val = (50, 5)  # adds more space to the left
-    else:
-        bubble_color = "#FFFFFF"  # bot white
-        side = "left"  # align to left
-        anchor_val = "w"
-        padx_val = (5, 50)  # adds more space to the right
-
-    # Bubble frame
-    bubble = tk.Frame(
-        frame,
-        bg=bubble_color,
-        padx=10, pady=7,
-        bd=1, relief="solid"
-    )
-    bubble.pack(anchor=anchor_val, pady=5, padx=padx_val)
-
-    # Label inside bubble
-    label = tk.Label(
-        bubble,
-        text=text,
-        font=("Arial", 12),
-        wraplength=260, # to wrap text
-        justify="left",
-        bg=bubble_color
-    )
-    label.pack()
+        return None
+    return JokeCorpus(jokes_path) # Lines without a "?" are skipped
 
+# How a joke's weight changes: punchlines people want to hear come up more often,
+# jokes skipped (another joke asked for before the punchline) come up less
+HEARD_PUNCHLINE = 1.1
+SKIPPED = 0.8
+
+# RESIZED IMAGES
+def load_resized(path, size):
+    # Uses the pre-sized copy from build_assets.py (resources/build/manifest.json) when
+    # it was made from the current image, otherwise resizes the image here like before
+    img = lookup_prebuilt(path, size, "default")
+    return img if img is not None else Image.open(path).resize(size)
 
 # MAIN APP CLASS
 class alexaJoke:
@@ -67,8 +40,13 @@ class alexaJoke:
         self.root.title("Alexa, Tell Me A Joke")
         self.root.geometry("360x640")
         self.root.resizable(False, False) # disables resizing (same as Act. 1)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.jokes = load_jokes()
+        # Weights and recently told jokes are saved next to the jokes file
+        self.picker = (JokePicker(len(self.jokes), self.jokes.path + ".picks", fingerprint=self.jokes.fingerprint)
+                       if self.jokes else None)
+        self.current_joke = None # Number of the joke being told
         self.current_setup = ""
         self.current_punchline = ""
 
@@ -78,7 +56,7 @@ class alexaJoke:
 
         # START SCREEN BG IMAGE
         self.start_bg_img = ImageTk.PhotoImage(
-            Image.open(os.path.join(base_dir, "resources", "start.png")).resize((360, 640))
+            load_resized(os.path.join(base_dir, "resources", "start.png"), (360, 640))
         )
 
         # START SCREEN
@@ -105,7 +83,7 @@ class alexaJoke:
         # STICKY HEADER IMAGE
         # To make the page look like a messenger app. Further learning from ActiveState and GeeksforGeeks
         self.header_img = ImageTk.PhotoImage(
-            Image.open(os.path.join(base_dir, "resources", "alexheader.png")).resize((360, 100))
+            load_resized(os.path.join(base_dir, "resources", "alexheader.png"), (360, 100))
         )
         self.header_label = tk.Label(self.chat_frame, image=self.header_img, bg="#5FB1EF")
         self.header_label.pack(side="top", fill="x")
@@ -120,14 +98,14 @@ class alexaJoke:
         self.scrollbar = tk.Scrollbar(self.chat_area_frame, orient="vertical", command=self.chat_canvas.yview)
         self.scrollbar.pack(side="right", fill="y")
 
-        self.chat_inner_frame = tk.Frame(self.chat_canvas, bg="#5FB1EF")
-        self.chat_canvas.create_window((0, 0), window=self.chat_inner_frame, anchor="nw")
-        self.chat_canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        self.chat_inner_frame.bind(
-            "<Configure>",
-            lambda e: self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
-        )
+        if os.environ.get("CHAT_RENDERER") == "canvas":
+            # Bubbles drawn straight onto the canvas instead of made of widgets
+            self.chat = CanvasChatView(self.chat_canvas, self.scrollbar)
+        else:
+            self.chat_inner_frame = tk.Frame(self.chat_canvas, bg="#5FB1EF")
+            self.chat_canvas.create_window((0, 0), window=self.chat_inner_frame, anchor="nw")
+            # Keeps the whole chat but only a window of bubbles, and sets the scroll region
+            self.chat = ChatView(self.chat_canvas, self.chat_inner_frame, self.scrollbar)
 
         # Bottom buttons frame
         self.bottom_frame = tk.Frame(self.chat_frame, bg="#fff")
@@ -144,60 +122,68 @@ class alexaJoke:
                                 command=self.show_punchline)
         self.punch_btn.pack(pady=5)
 
-        # BACKGROUND MUSIC
-        pygame.mixer.init()
-        music_path = os.path.join(base_dir, "resources", "goofy.mp3")
-        if os.path.exists(music_path):
-            pygame.mixer.music.load(music_path)
-            pygame.mixer.music.set_volume(0.1)
-            pygame.mixer.music.play(-1) # loops the music throughout the game
+        # BACKGROUND MUSIC AND SOUNDS
+        self.sounds = SoundBank(os.path.join(base_dir, "resources"), {
+            "laugh": ("joke.mp3", 0.3), # clown honk for the punchline
+        })
+        self.sounds.play_music("goofy.mp3", 0.1) # loops the music throughout the game
+        self.root.after_idle(self.sounds.preload) # decodes the honk once the window is up
+
+    def on_close(self):
+        # Saves the joke weights and recently told jokes before the window closes
+        if self.picker is not None:
+            self.picker.close()
+        if self.jokes is not None:
+            self.jokes.close()
+        self.root.destroy()
 
     # CHAT OPENING
     def open_chat(self):
         # changes screen from start to main chat (joke)
         self.start_frame.pack_forget()
         self.chat_frame.pack(fill="both", expand=True)
-        add_chat_bubble(self.chat_inner_frame, "What's up? Wanna activate your funny bone? Tap 'Alexa tell me a Joke' to start C:", sender="alexa")
+        self.chat.add("alexa", "What's up? Wanna activate your funny bone? Tap 'Alexa tell me a Joke' to start C:")
         self.auto_scroll() # scrolls to the bottom automatically
 
     # JOKE FUNCTIONS
     def tell_joke(self):
         # selects random joke
-        self.current_setup, self.current_punchline = random.choice(self.jokes)
-        add_chat_bubble(self.chat_inner_frame, "Hey, Alexa.. Tell me a joke!", sender="you")
-        add_chat_bubble(self.chat_inner_frame, self.current_setup, sender="alexa")
+        if not self.jokes:
+            self.chat.add("alexa", "Sorry, I don't know any jokes yet :(")
+            self.auto_scroll()
+            return
+        if self.current_joke is not None and str(self.punch_btn["state"]) == "normal":
+            self.picker.adjust_weight(self.current_joke, SKIPPED) # didn't wait for the punchline
+        self.current_joke = self.picker.pick() # never one of the last few told
+        self.current_setup, self.current_punchline = self.jokes.joke(self.current_joke)
+        self.chat.add("you", "Hey, Alexa.. Tell me a joke!")
+        self.chat.add("alexa", self.current_setup)
         self.punch_btn.config(state="normal") # enables the punchline button
         self.auto_scroll()
 
     def show_punchline(self):
         # Add punchline to chat
-        add_chat_bubble(self.chat_inner_frame, self.current_punchline, sender="alexa")
+        self.chat.add("alexa", self.current_punchline)
         self.punch_btn.config(state="disabled")
+        self.picker.adjust_weight(self.current_joke, HEARD_PUNCHLINE)
         self.auto_scroll()
 
         # Play clown honk sound for comedic effect
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        joke_path = os.path.join(base_dir, "resources", "joke.mp3")  # your laugh sound file
-        if os.path.exists(joke_path):
-            try:
-                # Initialize mixer if not already
-                if not pygame.mixer.get_init():
-                    pygame.mixer.init()
-                laugh_sound = pygame.mixer.Sound(joke_path)
-                laugh_sound.set_volume(0.3)  # adjust volume
-                laugh_sound.play()
-            except Exception as e:
-                print("Error playing laugh sound:", e)
+        self.sounds.play("laugh")
 
 
     # AUTO SCROLL
     # Learned from PythonTutorial.net and GeeksforGeeks
     def auto_scroll(self):
-        # allows automatic scrolling to show latest message
-        self.root.after(50, lambda: self.chat_canvas.yview_moveto(1.0))
+        # allows automatic scrolling to show latest message (once per frame however often it's asked)
+        self.chat.scroll_to_end()
 
 # RUN PROGRAM
 root = tk.Tk()
 app = alexaJoke(root)
 
 root.mainloop()
+
+# Set CHAT_STATS=1 to see how many chat updates were merged into each frame
+if os.environ.get("CHAT_STATS"):
+    print("Chat updates:", app.chat.scheduler.stats())
@@ -0,0 +1,117 @@
+import os
+import mmap
+import random
+import struct
+import hashlib
+import numpy as np
+
+# JOKE CORPUS
+# The jokes file (one "setup? punchline" per line) is memory-mapped rather than read
+# into a list, and a sidecar index file next to it (randomJokes.txt.idx) holds the
+# byte offset of every valid joke line. Picking a joke is then one random offset and
+# one line read, however many jokes the file has. The index is built the first time
+# and again whenever the jokes file's size or modification time changes.
+#
+# Index file layout (little-endian):
+#     header: magic b"JIDX", version, jokes file size, jokes file mtime (ns), joke count
+#     then one uint64 start offset per joke
+
+MAGIC = b"JIDX"
+VERSION = 1
+HEADER = struct.Struct("<4sHQQQ")
+INDEX_SUFFIX = ".idx"
+BLOCK = 1 << 24 # Bytes scanned at a time while building the index
+
+
+def index_path(path):
+    return path + INDEX_SUFFIX
+
+def fingerprint(st):
+    # 8 bytes that change whenever the index would be rebuilt (same size and mtime check)
+    return hashlib.blake2b(struct.pack("<Qq", st.st_size, st.st_mtime_ns), digest_size=8).digest()
+
+def _scan(data):
+    # Start offsets of the lines in data that contain a "?"
+    newlines, questions = [], []
+    for start in range(0, len(data), BLOCK):
+        block = np.frombuffer(data, dtype=np.uint8, count=min(BLOCK, len(data) - start), offset=start)
+        newlines.append(np.flatnonzero(block == ord("\n")) + start)
+        questions.append(np.flatnonzero(block == ord("?")) + start)
+    newlines = np.concatenate(newlines) if newlines else np.empty(0, dtype=np.int64)
+    questions = np.concatenate(questions) if questions else np.empty(0, dtype=np.int64)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(data)]))
+    # A line has a "?" if one falls between its start and its end
+    valid = np.searchsorted(questions, ends) > np.searchsorted(questions, starts)
+    return starts[valid].astype("<u8")
+
+def build_index(path):
+    # Scans the jokes file and writes its index, returns the offsets
+    st = os.stat(path)
+    if st.st_size:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offsets = _scan(data)
+    else:
+        offsets = np.empty(0, dtype="<u8")
+    target = index_path(path)
+    try:
+        with open(target + ".tmp", "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, st.st_size, st.st_mtime_ns, len(offsets)))
+            f.write(offsets.tobytes())
+        os.replace(target + ".tmp", target)
+    except OSError:
+        pass # Read-only folder: the offsets are still used, just rebuilt next time
+    return offsets
+
+def read_index(path):
+    # The offsets from the index file (memory-mapped), or None if it is missing or stale
+    st = os.stat(path)
+    try:
+        with open(index_path(path), "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return None
+            magic, version, size, mtime, count = HEADER.unpack(header)
+            if (magic, version, size, mtime) != (MAGIC, VERSION, st.st_size, st.st_mtime_ns):
+                return None
+            if os.fstat(f.fileno()).st_size != HEADER.size + count * 8:
+                return None # Cut short
+            if not count:
+                return np.empty(0, dtype="<u8")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+    return np.frombuffer(data, dtype="<u8", count=count, offset=HEADER.size)
+
+
+class JokeCorpus:
+    def __init__(self, path):
+        self.path = path
+        self.offsets = read_index(path)
+        if self.offsets is None:
+            self.offsets = build_index(path)
+        self._file = open(path, "rb")
+        st = os.fstat(self._file.fileno())
+        self.fingerprint = fingerprint(st) # Lets JokePicker tell when its saved numbers are out of date
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else b""
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def joke(self, i):
+        # (setup, punchline) of joke i, split on the first "?" like before
+        start = int(self.offsets[i])
+        end = self._data.find(b"\n", start)
+        if end < 0:
+            end = len(self._data)
+        line = self._data[start:end].decode("utf-8", errors="replace").strip()
+        setup, punchline = line.split("?", 1)
+        return setup.strip() + "?", punchline.strip()
+
+    def random_joke(self, rng=random):
+        return self.joke(rng.randrange(len(self.offsets)))
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
@@ -0,0 +1,224 @@
+import os
+import random
+import struct
+import threading
+import numpy as np
+
+# JOKE PICKER
+# Picks which joke to tell next. Every joke has a weight (how likely it is to be
+# picked compared to the others) and the last few jokes told are never picked again
+# straight away. Picking is O(1) with an alias table (Vose's alias method): one random
+# slot, one coin flip. Changing a weight rebuilds the table on a worker thread, in O(n);
+# until it is done the previous table is used.
+# Weights and the recently told jokes are kept in a small file next to the jokes file
+# (randomJokes.txt.picks), memory-mapped, so they carry over to the next session and
+# saving an update only touches the bytes that changed. Jokes are known by their number,
+# so once the jokes file changes (a different fingerprint, see joke_corpus.py) the saved
+# weights would land on other jokes: then everything starts again.
+#
+# File layout (little-endian):
+#     header (32 bytes): magic b"JPIK", version, recency window, joke count, jokes told,
+#                        jokes file fingerprint (8 bytes)
+#     then the recency ring: one int64 joke number per slot (-1 = empty)
+#     then one float32 weight per joke
+
+MAGIC = b"JPIK"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIQ8s4x")
+NO_FINGERPRINT = bytes(8)
+RECENT = 20 # How many of the last jokes told can't come up again
+MIN_WEIGHT = 0.05 # Limits for adjust_weight(), so no joke disappears or takes over
+MAX_WEIGHT = 20.0
+MAX_TRIES = 32 # Redraws before giving up on avoiding a recent joke
+
+
+def _sorted_search(a, v, side):
+    # np.searchsorted(a, v, side) for an already sorted v, in O(n): a stable sort of two
+    # sorted runs is a single merge (NumPy's stable sort is timsort for floats).
+    # On ties, "left" puts the v items first and "right" puts the a items first
+    both = np.concatenate((v, a) if side == "left" else (a, v))
+    order = np.argsort(both, kind="stable")
+    is_v = order < len(v) if side == "left" else order >= len(a)
+    v_index = order[is_v] if side == "left" else order[is_v] - len(a)
+    result = np.empty(len(v), dtype=np.intp)
+    # The a items before a v item are its position minus the v items before it
+    result[v_index] = np.flatnonzero(is_v) - np.arange(len(v))
+    return result
+
+def build_alias(weights):
+    # (probability, alias) arrays for the weights, in O(n) and without a Python loop.
+    # Same table as Vose's method: the "small" slots (scaled weight below 1) are filled up
+    # in order from the "large" ones, and a large slot that drops below 1 while giving is
+    # filled from the next large one. Cumulative sums give each slot's donor directly
+    n = len(weights)
+    total = float(np.sum(weights, dtype=np.float64))
+    if n == 0 or total <= 0:
+        return np.ones(n), np.arange(n)
+    scaled = np.asarray(weights, dtype=np.float64) * (n / total)
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = np.flatnonzero(scaled < 1)
+    large = np.flatnonzero(scaled >= 1)
+    if not len(small) or not len(large):
+        return prob, alias
+    given = np.cumsum(1 - scaled[small]) # Amount given to the smalls so far (inclusive)
+    spare = np.cumsum(scaled[large] - 1) # What the first j large slots can give in total
+    # Each small slot is filled by the first large slot that still has something to give
+    before = np.concatenate(([0.0], given[:-1])) # Same sums as given, so both searches agree
+    donor = _sorted_search(spare, before, "left")
+    prob[small] = scaled[small]
+    alias[small] = large[np.minimum(donor, len(large) - 1)]
+    # A large slot has given too much once the running total passes its share: what it
+    # has left is its probability, and the next large slot makes up the rest
+    crossed = _sorted_search(given, spare[:-1], "right")
+    has_crossed = crossed < len(given)
+    left = 1 + spare[:-1][has_crossed] - given[crossed[has_crossed]]
+    donors = large[:-1][has_crossed]
+    prob[donors] = np.clip(left, 0, 1)
+    alias[donors] = large[1:][has_crossed]
+    return prob, alias
+
+
+class JokePicker:
+    def __init__(self, count, path, recent=RECENT, rng=random, fingerprint=NO_FINGERPRINT):
+        self.count = count
+        self.path = path
+        self.fingerprint = fingerprint # Of the jokes file these numbers refer to
+        self.rng = rng
+        self._lock = threading.Lock()
+        self._table = None # (prob, alias), None means all weights are equal
+        self._dirty = False
+        self._rebuilding = False
+        self._idle = threading.Event() # Set while no rebuild is running
+        self._idle.set()
+        self._open(recent)
+        # Never more than half the jokes are held back, or picking would keep retrying
+        self.window = min(recent, count // 2)
+        self._recent_counts = {} # joke -> times it is in the window
+        for joke in self.recent[:self.window].tolist():
+            if joke >= 0:
+                self._recent_counts[joke] = self._recent_counts.get(joke, 0) + 1
+        if count and (self.weights != self.weights[0]).any():
+            self._schedule_rebuild()
+
+    # STATE FILE
+    def _open(self, recent):
+        size = HEADER.size + recent * 8 + self.count * 4
+        old = self._read_old()
+        if old is not None and old[3] != self.fingerprint:
+            old = None # Another jokes file, or it was edited: nothing saved applies any more
+        if old is None:
+            old_weights, old_recent = None, None
+        else:
+            old_weights, old_recent, _, _ = old
+        try:
+            if old is None or old_weights.size != self.count or old_recent.size != recent:
+                # New file, or the joke count / window size changed: write it again, keeping what fits
+                with open(self.path + ".tmp", "wb") as f:
+                    f.truncate(size)
+                data = np.memmap(self.path + ".tmp", dtype=np.uint8, mode="r+", shape=(size,))
+                self._fill(data, recent, old_weights)
+                data.flush()
+                del data
+                os.replace(self.path + ".tmp", self.path)
+            self._data = np.memmap(self.path, dtype=np.uint8, mode="r+", shape=(size,))
+        except OSError as e: # Read-only folder etc.: works the same, just isn't saved
+            print("Joke picks not saved:", e)
+            self._data = np.zeros(size, dtype=np.uint8)
+            self._fill(self._data, recent, old_weights)
+        self.recent = self._data[HEADER.size:HEADER.size + recent * 8].view("<i8")
+        self.weights = self._data[HEADER.size + recent * 8:].view("<f4")
+        self.told = HEADER.unpack_from(self._data, 0)[4]
+
+    def _fill(self, data, recent, old_weights):
+        HEADER.pack_into(data, 0, MAGIC, VERSION, recent, self.count, 0, self.fingerprint) # The window starts again empty
+        data[HEADER.size:HEADER.size + recent * 8].view("<i8")[:] = -1
+        weights = data[HEADER.size + recent * 8:].view("<f4")
+        weights[:] = 1.0
+        if old_weights is not None:
+            keep = min(old_weights.size, self.count)
+            weights[:keep] = old_weights[:keep]
+
+    def _read_old(self):
+        # (weights, recency ring, jokes told, fingerprint) from an existing file, or None
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        if len(raw) < HEADER.size:
+            return None
+        magic, version, window, count, told, fingerprint = HEADER.unpack_from(raw, 0)
+        if (magic, version) != (MAGIC, VERSION) or len(raw) != HEADER.size + window * 8 + count * 4:
+            return None
+        ring = np.frombuffer(raw, dtype="<i8", count=window, offset=HEADER.size)
+        weights = np.frombuffer(raw, dtype="<f4", count=count, offset=HEADER.size + window * 8)
+        return weights, ring, told, fingerprint
+
+    # ALIAS TABLE
+    def _schedule_rebuild(self):
+        with self._lock:
+            self._dirty = True
+            if self._rebuilding:
+                return # The running rebuild will go round again
+            self._rebuilding = True
+            self._idle.clear()
+        threading.Thread(target=self._rebuild, daemon=True).start()
+
+    def _rebuild(self):
+        while True:
+            with self._lock:
+                if not self._dirty:
+                    self._rebuilding = False
+                    self._idle.set()
+                    return
+                self._dirty = False
+                weights = np.array(self.weights) # Snapshot, weights may change meanwhile
+            self._table = build_alias(weights) # Swapped in whole, so pick() never sees half a table
+
+    def wait(self):
+        # Blocks until the table matches the weights (for scripts and tests)
+        self._idle.wait()
+
+    def adjust_weight(self, joke, factor):
+        self.set_weight(joke, float(self.weights[joke]) * factor)
+
+    def set_weight(self, joke, weight):
+        self.weights[joke] = min(max(weight, MIN_WEIGHT), MAX_WEIGHT)
+        self._schedule_rebuild()
+
+    # PICKING
+    def _draw(self):
+        slot = self.rng.randrange(self.count)
+        table = self._table
+        if table is None:
+            return slot
+        prob, alias = table
+        return slot if self.rng.random() < prob[slot] else int(alias[slot])
+
+    def pick(self):
+        # Number of the next joke to tell; it is remembered as told
+        for _ in range(MAX_TRIES):
+            joke = self._draw()
+            if joke not in self._recent_counts:
+                break
+        self.told_joke(joke)
+        return joke
+
+    def told_joke(self, joke):
+        if not self.window:
+            return
+        slot = self.told % self.window
+        old = int(self.recent[slot])
+        if old >= 0 and old in self._recent_counts:
+            self._recent_counts[old] -= 1
+            if not self._recent_counts[old]:
+                del self._recent_counts[old]
+        self.recent[slot] = joke
+        self._recent_counts[joke] = self._recent_counts.get(joke, 0) + 1
+        self.told += 1
+        struct.pack_into("<Q", self._data, 12, self.told)
+
+    def close(self):
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
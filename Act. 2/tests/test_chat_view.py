@@ -0,0 +1,151 @@
+import pytest
+
+import chat_view
+from chat_view import ChatView, wrap_text
+from frame_scheduler import FrameScheduler
+
+# ChatView's bookkeeping checked without a display: bubbles, frame and canvas are stand-ins
+# that only remember what was asked of them. Every bubble is BUBBLE_HEIGHT tall.
+
+BUBBLE_HEIGHT = 10
+
+
+class FakeWidget:
+    def __init__(self):
+        self.jobs = []
+        self.packed = []
+
+    def after(self, ms, callback):
+        self.jobs.append(callback)
+        return len(self.jobs)
+
+    def run_frame(self):
+        jobs, self.jobs = self.jobs, []
+        for job in jobs:
+            job()
+
+
+class FakeFrame(FakeWidget):
+    def bind(self, event, callback):
+        self.configured = callback
+
+    def update_idletasks(self):
+        pass
+
+    def winfo_width(self):
+        return 300
+
+    def winfo_height(self):
+        return BUBBLE_HEIGHT * len(self.packed)
+
+
+class FakeBubbleFrame:
+    def __init__(self, bubble):
+        self.bubble = bubble
+
+    def winfo_y(self):
+        return BUBBLE_HEIGHT * self.bubble.parent.packed.index(self.bubble)
+
+    def winfo_height(self):
+        return BUBBLE_HEIGHT
+
+
+class FakeBubble:
+    made = 0
+
+    def __init__(self, parent):
+        FakeBubble.made += 1
+        self.parent = parent
+        self.frame = FakeBubbleFrame(self)
+        self.text = None
+
+    def show(self, sender, text, before=None):
+        self.text = text
+        self.parent.packed.insert(0 if before is not None else len(self.parent.packed), self)
+
+    def hide(self):
+        self.parent.packed.remove(self)
+
+
+class FakeCanvas(FakeWidget):
+    def __init__(self):
+        super().__init__()
+        self.top = 0.0
+        self.scrollregion = None
+        self.moves = []
+
+    def configure(self, scrollregion=None, yscrollcommand=None):
+        if scrollregion is not None:
+            self.scrollregion = scrollregion
+
+    def yview(self):
+        return (self.top, 1.0)
+
+    def yview_moveto(self, fraction):
+        self.moves.append((fraction, self.scrollregion))
+        self.top = fraction
+
+
+class FakeScrollbar:
+    def set(self, first, last):
+        pass
+
+
+@pytest.fixture
+def view(monkeypatch):
+    monkeypatch.setattr(chat_view, "Bubble", FakeBubble)
+    FakeBubble.made = 0
+    canvas = FakeCanvas()
+    return ChatView(canvas, FakeFrame(), FakeScrollbar(), window=10, shift=4,
+                    scheduler=FrameScheduler(canvas))
+
+def shown(view):
+    return [bubble.text for bubble in view.frame.packed]
+
+def test_bubbles_are_reused_once_the_window_is_full(view):
+    for i in range(25):
+        view.add("you", f"m{i}")
+    assert FakeBubble.made == 10
+    assert (view.start, view.end) == (15, 25)
+    assert shown(view) == [f"m{i}" for i in range(15, 25)]
+
+def test_scrolling_past_the_top_brings_older_messages_in(view):
+    for i in range(25):
+        view.add("alexa", f"m{i}")
+    view._scrolled("0.0", "0.5")
+    view.canvas.run_frame()
+    assert (view.start, view.end) == (11, 21)
+    assert shown(view) == [f"m{i}" for i in range(11, 21)]
+    view.add("you", "new") # Reading old messages: the new one waits off screen
+    assert view.end == 21 and len(view.transcript) == 26
+    view.scroll_to_end()
+    view.canvas.run_frame()
+    assert shown(view) == [f"m{i}" for i in range(16, 25)] + ["new"]
+    assert FakeBubble.made == 10
+
+def test_scroll_region_and_scroll_happen_once_per_frame(view):
+    for i in range(3):
+        view.add("you", f"m{i}")
+        view.frame.configured(None)
+        view.scroll_to_end()
+    assert view.canvas.moves == []
+    view.canvas.run_frame()
+    assert view.canvas.moves == [(1.0, (0, 0, 300, 3 * BUBBLE_HEIGHT))]
+    assert view.scheduler.stats()["frames"] == 1
+
+def test_moving_the_window_keeps_the_message_being_read_in_place(view):
+    for i in range(25):
+        view.add("alexa", f"m{i}")
+    view.canvas.top = 0.0 # m15 is at the top of the view
+    view._scrolled("0.0", "0.5")
+    view.canvas.run_frame()
+    fraction, region = view.canvas.moves[-1]
+    assert fraction * view.frame.winfo_height() == 4 * BUBBLE_HEIGHT # Below the 4 brought in
+    assert region == (0, 0, 300, view.frame.winfo_height()) # Scrolled within the new region
+
+
+def test_wrap_text_breaks_at_spaces_and_splits_long_words():
+    assert wrap_text("aa bb cc", 5, len) == ["aa bb", "cc"]
+    assert wrap_text("abcdefghij k", 4, len) == ["abcd", "efgh", "ij k"]
+    assert wrap_text("one\ntwo", 10, len) == ["one", "two"]
+    assert wrap_text("", 10, len) == [""]
@@ -0,0 +1,45 @@
+from frame_scheduler import FrameScheduler
+
+
+class FakeWidget:
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, ms, callback):
+        self.jobs.append(callback)
+        return len(self.jobs)
+
+
+def test_requests_are_merged_and_run_in_phase_order():
+    widget = FakeWidget()
+    scheduler = FrameScheduler(widget)
+    ran = []
+    scheduler.request("scroll", ran.append, "scroll")
+    scheduler.request("scrollregion", ran.append, "region")
+    scheduler.request("scrollregion", ran.append, "region") # Same again: coalesced
+    scheduler.request("layout", ran.append, "old layout")
+    scheduler.request("layout", ran.append, "layout") # Replaces the first: dropped
+    assert len(widget.jobs) == 1 and ran == []
+    widget.jobs.pop()()
+    assert ran == ["layout", "region", "scroll"]
+    assert scheduler.stats() == {"requested": 5, "coalesced": 1, "dropped": 1, "frames": 1}
+
+def test_cancelled_requests_do_not_run():
+    widget = FakeWidget()
+    scheduler = FrameScheduler(widget)
+    ran = []
+    scheduler.request("scrollregion", ran.append, "region")
+    scheduler.cancel("scrollregion")
+    scheduler.cancel("scrollregion") # Nothing pending any more
+    widget.jobs.pop()()
+    assert ran == [] and scheduler.dropped == 1
+
+def test_a_request_made_during_a_frame_waits_for_the_next():
+    widget = FakeWidget()
+    scheduler = FrameScheduler(widget)
+    ran = []
+    scheduler.request("layout", lambda: scheduler.request("scroll", ran.append, "scroll"))
+    widget.jobs.pop()()
+    assert ran == [] and len(widget.jobs) == 1
+    widget.jobs.pop()()
+    assert ran == ["scroll"]
@@ -0,0 +1,56 @@
+import os
+import random
+
+from joke_corpus import JokeCorpus, build_index, index_path, read_index
+
+
+def write_jokes(tmp_path, text):
+    path = str(tmp_path / "jokes.txt")
+    with open(path, "wb") as f:
+        f.write(text.encode("utf-8"))
+    return path
+
+def test_only_lines_with_a_question_are_jokes(tmp_path):
+    path = write_jokes(tmp_path, "Why? Because.\nnot a joke\n\nWho's there?Boo\nLast one? no newline")
+    corpus = JokeCorpus(path)
+    assert len(corpus) == 3
+    assert corpus.joke(0) == ("Why?", "Because.")
+    assert corpus.joke(1) == ("Who's there?", "Boo")
+    assert corpus.joke(2) == ("Last one?", "no newline")
+    assert corpus.random_joke(random.Random(1)) in [corpus.joke(i) for i in range(3)]
+    corpus.close()
+
+def test_index_is_reused_until_the_file_changes(tmp_path):
+    path = write_jokes(tmp_path, "A? a\nB? b\n")
+    JokeCorpus(path).close()
+    assert read_index(path).tolist() == [0, 5]
+    with open(path, "ab") as f:
+        f.write(b"C? c\n")
+    assert read_index(path) is None # Size changed
+    corpus = JokeCorpus(path)
+    assert len(corpus) == 3
+    corpus.close()
+
+def test_the_fingerprint_changes_with_the_file(tmp_path):
+    path = write_jokes(tmp_path, "A? a\n")
+    first = JokeCorpus(path)
+    again = JokeCorpus(path)
+    assert len(first.fingerprint) == 8 and first.fingerprint == again.fingerprint
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9)) # Saved again, same length
+    changed = JokeCorpus(path)
+    assert changed.fingerprint != first.fingerprint
+    for corpus in (first, again, changed):
+        corpus.close()
+
+def test_a_cut_short_index_is_rebuilt(tmp_path):
+    path = write_jokes(tmp_path, "A? a\nB? b\n")
+    build_index(path)
+    os.truncate(index_path(path), os.path.getsize(index_path(path)) - 1)
+    assert read_index(path) is None
+    assert JokeCorpus(path).joke(1) == ("B?", "b")
+
+def test_empty_file(tmp_path):
+    corpus = JokeCorpus(write_jokes(tmp_path, ""))
+    assert len(corpus) == 0
+    corpus.close()
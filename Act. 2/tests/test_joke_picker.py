@@ -0,0 +1,110 @@
+import random
+import numpy as np
+import pytest
+
+from joke_picker import MAX_WEIGHT, MIN_WEIGHT, JokePicker, _sorted_search, build_alias
+
+
+def alias_odds(prob, alias):
+    # Chance of each item being picked from an alias table: slot i, then a coin flip
+    n = len(prob)
+    odds = np.array(prob, dtype=np.float64) / n
+    np.add.at(odds, alias, (1 - np.asarray(prob)) / n)
+    return odds
+
+@pytest.mark.parametrize("side", ["left", "right"])
+def test_sorted_search_matches_searchsorted(side):
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        a = np.sort(rng.integers(0, 20, rng.integers(0, 30))).astype(np.float64)
+        v = np.sort(rng.integers(0, 20, rng.integers(0, 30))).astype(np.float64)
+        assert _sorted_search(a, v, side).tolist() == np.searchsorted(a, v, side).tolist()
+
+def test_alias_table_gives_each_joke_its_share():
+    rng = np.random.default_rng(2)
+    for n in (1, 2, 3, 10, 257):
+        for weights in (rng.random(n) * 5, np.ones(n), rng.integers(0, 3, n).astype(np.float64) + 0.1):
+            prob, alias = build_alias(weights)
+            assert ((prob >= 0) & (prob <= 1)).all()
+            assert np.allclose(alias_odds(prob, alias), weights / weights.sum())
+
+def test_alias_table_for_no_weight_at_all():
+    prob, alias = build_alias(np.zeros(3))
+    assert prob.tolist() == [1, 1, 1] and alias.tolist() == [0, 1, 2]
+
+
+@pytest.fixture
+def picks_path(tmp_path):
+    return str(tmp_path / "jokes.txt.picks")
+
+def test_recent_jokes_are_not_told_again(picks_path):
+    picker = JokePicker(40, picks_path, recent=10, rng=random.Random(3))
+    told = [picker.pick() for _ in range(500)]
+    for i in range(10, len(told)):
+        assert told[i] not in told[i - 10:i]
+    picker.close()
+
+def test_window_is_never_more_than_half_the_jokes(picks_path):
+    picker = JokePicker(6, picks_path, recent=20, rng=random.Random(4))
+    assert picker.window == 3
+    assert len({picker.pick() for _ in range(100)}) == 6
+
+def test_weights_change_how_often_a_joke_comes_up(picks_path):
+    picker = JokePicker(10, picks_path, recent=0, rng=random.Random(5))
+    picker.set_weight(7, MAX_WEIGHT)
+    picker.wait()
+    told = [picker.pick() for _ in range(5000)]
+    share = told.count(7) / len(told)
+    assert share == pytest.approx(MAX_WEIGHT / (MAX_WEIGHT + 9), abs=0.03)
+
+def test_weights_are_clamped(picks_path):
+    picker = JokePicker(3, picks_path)
+    picker.adjust_weight(0, 1000)
+    picker.adjust_weight(1, 0)
+    assert picker.weights.tolist() == pytest.approx([MAX_WEIGHT, MIN_WEIGHT, 1.0])
+    picker.wait()
+
+def test_weights_and_recent_jokes_carry_over(picks_path):
+    picker = JokePicker(30, picks_path, recent=5, rng=random.Random(6))
+    picker.set_weight(2, 4.0)
+    told = [picker.pick() for _ in range(12)]
+    picker.wait()
+    picker.close()
+    del picker
+
+    again = JokePicker(30, picks_path, recent=5, rng=random.Random(7))
+    assert again.told == 12
+    assert again.weights[2] == 4.0
+    assert sorted(again._recent_counts) == sorted(set(told[-5:]))
+    again.wait()
+    assert again._table is not None # Uneven weights: the table is rebuilt on open
+    assert again.pick() not in told[-5:]
+
+def test_a_new_joke_count_keeps_the_weights_that_fit(picks_path):
+    picker = JokePicker(4, picks_path)
+    picker.set_weight(3, 2.0)
+    picker.wait()
+    picker.close()
+    del picker
+    grown = JokePicker(6, picks_path)
+    assert grown.weights.tolist() == [1, 1, 1, 2, 1, 1]
+    assert grown.told == 0
+    grown.wait()
+
+def test_a_changed_jokes_file_starts_again(picks_path):
+    picker = JokePicker(5, picks_path, recent=2, rng=random.Random(8), fingerprint=b"jokes v1")
+    picker.set_weight(1, 3.0)
+    picker.pick()
+    picker.wait()
+    picker.close()
+    del picker
+    same = JokePicker(5, picks_path, recent=2, fingerprint=b"jokes v1")
+    assert same.weights[1] == 3.0 and same.told == 1
+    same.wait()
+    same.close()
+    del same
+    edited = JokePicker(5, picks_path, recent=2, fingerprint=b"jokes v2") # Same count, other jokes
+    assert edited.weights.tolist() == [1.0] * 5
+    assert edited.told == 0 and not edited._recent_counts
+    edited.close()
+    assert JokePicker(5, picks_path, recent=2, fingerprint=b"jokes v2").told == 0
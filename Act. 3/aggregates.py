@@ -0,0 +1,126 @@
+import numpy as np
+
+from roster import GRADES, TOTAL_POSSIBLE
+
+# ROSTER STATISTICS
+# Running totals for the whole roster: sums and sums of squares of each student's
+# score (coursework total + exam), sums of every mark column, students per grade and
+# how many students have each score (for the highest / lowest). Adding, updating or
+# deleting a student only adjusts these totals, so every figure is O(1) to read.
+# Scores are whole numbers, so the sums stay exact however many edits are made.
+# Like the indexes it subscribes to the Roster and is built on first use.
+
+MARK_COLUMNS = ("cw1", "cw2", "cw3", "exam")
+
+
+class RosterStats:
+    def __init__(self, roster):
+        self.roster = roster
+        self.count = None # None until built
+        roster.subscribe(self)
+
+    def _build(self):
+        if self.count is not None:
+            return
+        self.count = 0
+        self._score_sum = 0
+        self._score_squares = 0
+        self._mark_sums = [0] * len(MARK_COLUMNS)
+        self._grades = [0] * len(GRADES)
+        self._scores = {} # score -> students with that score
+        self._high = self._low = None
+        self._add_slots(self.roster.slots())
+
+    # KEEPING UP TO DATE
+    def _add_slots(self, slots):
+        marks = self.roster.raw_column("marks", slots).astype(np.int64)
+        exams = self.roster.raw_column("exam", slots).astype(np.int64)
+        scores = marks.sum(axis=1) + exams
+        self.count += len(slots)
+        self._score_sum += int(scores.sum())
+        self._score_squares += int((scores * scores).sum())
+        for i, total in enumerate(marks.sum(axis=0).tolist() + [int(exams.sum())]):
+            self._mark_sums[i] += total
+        for code, n in enumerate(np.bincount(self.roster.raw_column("grade", slots), minlength=len(GRADES)).tolist()):
+            self._grades[code] += n
+        values, counts = np.unique(scores, return_counts=True)
+        for score, n in zip(values.tolist(), counts.tolist()):
+            self._scores[score] = self._scores.get(score, 0) + n
+        if len(values):
+            self._high = values[-1].item() if self._high is None else max(self._high, values[-1].item())
+            self._low = values[0].item() if self._low is None else min(self._low, values[0].item())
+
+    def _remove(self, student):
+        # student is a plain dict (the "old" row from the Roster)
+        score = sum(student["marks"]) + student["exam"]
+        self.count -= 1
+        self._score_sum -= score
+        self._score_squares -= score * score
+        for i, mark in enumerate(list(student["marks"]) + [student["exam"]]):
+            self._mark_sums[i] -= mark
+        self._grades[GRADES.index(student["grade"])] -= 1
+        self._scores[score] -= 1
+        if not self._scores[score]:
+            del self._scores[score]
+            # Only when the last student with the top (or bottom) score goes do we look further
+            if not self._scores:
+                self._high = self._low = None
+            elif score == self._high:
+                self._high = max(self._scores)
+            elif score == self._low:
+                self._low = min(self._scores)
+
+    # Roster listener methods
+    def rows_added(self, roster, slots):
+        if self.count is not None:
+            self._add_slots(slots)
+
+    def row_changed(self, roster, slot, old):
+        if self.count is not None:
+            self._remove(old)
+            self._add_slots(np.array([slot]))
+
+    def row_removed(self, roster, slot, old):
+        if self.count is not None:
+            self._remove(old)
+
+    # FIGURES
+    def _percentage(self, score):
+        return score / TOTAL_POSSIBLE * 100
+
+    def students(self):
+        self._build()
+        return self.count
+
+    def mean_percentage(self):
+        self._build()
+        return self._percentage(self._score_sum / self.count) if self.count else None
+
+    def std_percentage(self):
+        # Population standard deviation, worked out from the exact integer sums
+        self._build()
+        if not self.count:
+            return None
+        variance = (self.count * self._score_squares - self._score_sum ** 2) / self.count ** 2
+        return self._percentage(variance ** 0.5)
+
+    def highest_percentage(self):
+        self._build()
+        return None if self._high is None else self._percentage(self._high)
+
+    def lowest_percentage(self):
+        self._build()
+        return None if self._low is None else self._percentage(self._low)
+
+    def grade_counts(self):
+        self._build()
+        return dict(zip(GRADES, self._grades))
+
+    def averages(self):
+        # Mean of each coursework, the exam and the coursework total
+        self._build()
+        if not self.count:
+            return None
+        means = {column: total / self.count for column, total in zip(MARK_COLUMNS, self._mark_sums)}
+        means["coursework_total"] = sum(self._mark_sums[:3]) / self.count
+        return means
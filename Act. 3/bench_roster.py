@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+from roster import read_roster_text
+from roster_binary import read_roster_binary, convert_roster
+
+# ROSTER BENCHMARK
+# Compares the old one-dict-per-student loader with the columnar Roster,
+# read from the text file and from the binary file (roster_binary.py).
+# Run with: python bench_roster.py [rows ...]   (defaults to 10k, 100k and 1M rows)
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+# The original load_student_data() body, kept here only as the baseline
+def load_dict_roster(filename):
+    students = []
+    with open(filename, "r") as file:
+        file.readline()
+        for line in file:
+            parts = line.strip().split(",")
+            marks = list(map(int, parts[2:5]))
+            exam_score = int(parts[5])
+            coursework_total = sum(marks)
+            percentage = ((coursework_total + exam_score) / (60 + 100)) * 100
+            if percentage >= 70:
+                grade = "A"
+            elif percentage >= 60:
+                grade = "B"
+            elif percentage >= 50:
+                grade = "C"
+            elif percentage >= 40:
+                grade = "D"
+            else:
+                grade = "F"
+            students.append({
+                "id": parts[0],
+                "name": parts[1],
+                "marks": marks,
+                "exam": exam_score,
+                "coursework_total": coursework_total,
+                "percentage": percentage,
+                "grade": grade
+            })
+    return students
+
+def write_roster_file(path, rows, seed=0):
+    # Random roster in the same format as assets/studentMarks.txt
+    rng = random.Random(seed)
+    first = ["John", "Sam", "Lee", "Matt", "Jake", "Alan", "Gareth", "Harry"]
+    last = ["Curry", "Scott", "Thompson", "Hobbs", "Shearer", "Southgate", "Kane"]
+    with open(path, "w") as f:
+        f.write(f"{rows}\n")
+        for i in range(rows):
+            marks = ",".join(str(rng.randint(0, 20)) for _ in range(3))
+            f.write(f"{1000 + i},{rng.choice(first)} {rng.choice(last)},{marks},{rng.randint(0, 100)}\n")
+
+def measure(loader, path):
+    # Timed on its own first, because tracemalloc slows every allocation down
+    start = time.perf_counter()
+    loader(path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = loader(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current, peak
+
+def run(sizes):
+    print(f"{'rows':>10} {'loader':>8} {'load s':>9} {'kept MB':>9} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"roster_{rows}.txt")
+            write_roster_file(path, rows)
+            binary_path = os.path.join(tmp, f"roster_{rows}.bin")
+            convert_roster(path, binary_path)
+            for label, loader, source in (("dict", load_dict_roster, path),
+                                          ("columnar", read_roster_text, path),
+                                          ("binary", read_roster_binary, binary_path)):
+                result, elapsed, current, peak = measure(loader, source)
+                print(f"{rows:>10} {label:>8} {elapsed:>9.3f} {current / 1e6:>9.1f} {peak / 1e6:>9.1f}")
+                del result
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    run(sizes)
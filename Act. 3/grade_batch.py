@@ -0,0 +1,119 @@
+import os
+import csv
+import sys
+import json
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from journal import RosterJournal
+from roster import GRADES, LoadReport
+from roster_binary import read_roster_file
+
+# BATCH GRADING (no window needed)
+# Grades many roster files at once, one process per CPU, and writes a short summary
+# for each: how many students got each grade, the highest, the lowest and the mean.
+# Grades come from the same rules as calculate_overall_percentage() / get_grade()
+# (Roster works them out for the whole file in one go, see roster.py).
+# Edits still waiting in a file's journal are counted too, as the app would show them.
+#
+# Run with:  python grade_batch.py term1/*.txt --format json --out summaries
+
+SUMMARY_FIELDS = ("file", "students", "mean_percentage",
+                  "highest_id", "highest_name", "highest_percentage",
+                  "lowest_id", "lowest_name", "lowest_percentage",
+                  *GRADES, "skipped_lines", "error")
+
+
+def summarize_roster(filename):
+    # One summary dict per file. Problems are reported in "error" instead of raised,
+    # so one bad file doesn't stop the rest of the batch
+    summary = dict.fromkeys(SUMMARY_FIELDS, "")
+    summary["file"] = filename
+    report = LoadReport(filename)
+    try:
+        students = read_roster_file(filename, report=report)
+        journal = RosterJournal(filename)
+        if journal.has_pending():
+            # Read-only: the app may still be writing to it
+            journal.replay(students, tidy_up=False)
+    except (OSError, ValueError) as e:
+        summary["error"] = str(e)
+        return summary
+
+    summary["students"] = len(students)
+    summary["skipped_lines"] = len(report.errors)
+    if not report.count_matches:
+        summary["error"] = report.summary()
+    counts = np.bincount(students.raw_column("grade", students.slots()), minlength=len(GRADES))
+    summary.update(zip(GRADES, counts.tolist()))
+    if students:
+        percentage = students.column("percentage")
+        summary["mean_percentage"] = round(float(percentage.mean()), 2)
+        # argmax/argmin return the first match, same as max()/min() over the list
+        for label, pos in (("highest", int(percentage.argmax())), ("lowest", int(percentage.argmin()))):
+            s = students[pos]
+            summary[f"{label}_id"] = s["id"]
+            summary[f"{label}_name"] = s["name"]
+            summary[f"{label}_percentage"] = round(s["percentage"], 2)
+    return summary
+
+def summary_path(filename, out_dir, fmt):
+    # <out_dir>/<roster file name>.summary.<csv|json>, next to the roster if out_dir is None
+    folder = out_dir if out_dir is not None else os.path.dirname(os.path.abspath(filename))
+    return os.path.join(folder, os.path.basename(filename) + f".summary.{fmt}")
+
+def find_clashes(filenames, out_dir, fmt):
+    # Roster files whose summaries would overwrite each other (e.g. term1/a.txt and term2/a.txt with --out)
+    seen = {}
+    for filename in filenames:
+        key = os.path.normcase(os.path.abspath(summary_path(filename, out_dir, fmt)))
+        seen.setdefault(key, []).append(filename)
+    return [names for names in seen.values() if len(names) > 1]
+
+def write_summary(summary, out_dir, fmt):
+    path = summary_path(summary["file"], out_dir, fmt)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "json":
+            json.dump(summary, f, indent=2)
+        else:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerow(summary)
+    return path
+
+def grade_files(filenames, workers=None):
+    # Summaries in the same order as filenames; files are spread over a process pool
+    if workers == 1 or len(filenames) < 2:
+        return [summarize_roster(filename) for filename in filenames]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(summarize_roster, filenames, chunksize=max(1, len(filenames) // 64)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade roster files without opening the app.")
+    parser.add_argument("files", nargs="+", help="studentMarks-style files (text or binary)")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv", help="summary file format")
+    parser.add_argument("--out", help="folder for the summaries (default: next to each roster)")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: one per CPU)")
+    args = parser.parse_args(argv)
+    clashes = find_clashes(args.files, args.out, args.format)
+    if clashes:
+        parser.error("these files would share one summary file: "
+                     + "; ".join(" and ".join(names) for names in clashes))
+
+    if args.out is not None:
+        os.makedirs(args.out, exist_ok=True)
+    failed = 0
+    for summary in grade_files(args.files, args.workers):
+        if summary["students"] == "":
+            failed += 1
+            print(f"{summary['file']}: {summary['error']}", file=sys.stderr)
+            continue
+        path = write_summary(summary, args.out, args.format)
+        grades = " ".join(f"{grade}={summary[grade]}" for grade in GRADES)
+        print(f"{summary['file']}: {summary['students']} students, mean {summary['mean_percentage']}%, {grades} -> {path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import os
+import sys
+import threading
+from PIL import Image, ImageTk
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For build_assets.py at the top of the repo
+from build_assets import lookup_prebuilt
+
+# IMAGE CACHE
+# Every page shows the same header, resized the same way. Instead of decoding and
+# resampling assets/header.png once per page, the resized image is made once per
+# (path, size, resample) and shared. The resized copy is also saved under
+# assets/.cache, named after the source file's size and modification time, so the
+# next launch just loads the small copy and skips resampling. Editing or replacing
+# the source image changes its size/mtime, which makes the old copy stale.
+# Before any of that, a copy pre-sized by build_assets.py (assets/build/manifest.json)
+# is used if the manifest says it was made from the current source image.
+
+CACHE_DIR = ".cache"
+RESAMPLE_NAMES = {int(Image.Resampling.LANCZOS): "lanczos"} # As written by build_assets.py
+
+_images = {} # (path, size, resample) -> PIL Image
+_photos = {} # (path, size, resample) -> PhotoImage
+_lock = threading.Lock()
+
+
+def _disk_name(path, size, resample):
+    st = os.stat(path)
+    base, _ = os.path.splitext(os.path.basename(path))
+    stamp = f"{st.st_size}-{st.st_mtime_ns}"
+    return os.path.join(os.path.dirname(path), CACHE_DIR,
+                        f"{base}-{size[0]}x{size[1]}-r{int(resample)}-{stamp}.png")
+
+def _load_from_disk(cached):
+    try:
+        with Image.open(cached) as img:
+            img.load()
+            return img
+    except (OSError, ValueError):
+        return None # Missing or damaged copy, it is simply made again
+
+def _save_to_disk(img, cached):
+    folder = os.path.dirname(cached)
+    prefix = os.path.basename(cached).rsplit("-", 2)[0] + "-"
+    try:
+        os.makedirs(folder, exist_ok=True)
+        # Older copies of the same image at this size are stale now
+        for name in os.listdir(folder):
+            if name.startswith(prefix) and name != os.path.basename(cached):
+                os.remove(os.path.join(folder, name))
+        temp_name = cached + ".tmp"
+        img.save(temp_name, format="PNG", compress_level=1)
+        os.replace(temp_name, cached)
+    except OSError:
+        pass # Read-only folder etc.: the in-memory copy still works
+
+def load_image(path, size, resample=Image.Resampling.LANCZOS):
+    # The image at path resized to size (width, height), made at most once
+    path = os.path.abspath(path)
+    size = tuple(size)
+    key = (path, size, int(resample))
+    with _lock:
+        img = _images.get(key)
+        if img is not None:
+            return img
+        img = lookup_prebuilt(path, size, RESAMPLE_NAMES.get(int(resample)))
+        if img is None:
+            cached = _disk_name(path, size, resample)
+            img = _load_from_disk(cached)
+            if img is None:
+                with Image.open(path) as source:
+                    img = source.resize(size, resample)
+                _save_to_disk(img, cached)
+        _images[key] = img
+        return img
+
+def load_photo(path, size, resample=Image.Resampling.LANCZOS):
+    # Same as load_image() but as a Tk PhotoImage, shared by every widget that shows it.
+    # Needs the Tk window to exist already
+    key = (os.path.abspath(path), tuple(size), int(resample))
+    photo = _photos.get(key)
+    if photo is None:
+        photo = _photos[key] = ImageTk.PhotoImage(load_image(path, size, resample))
+    return photo
+
+def clear():
+    # Forgets the in-memory copies (the saved ones stay on disk)
+    with _lock:
+        _images.clear()
+        _photos.clear()
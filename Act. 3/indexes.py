@@ -0,0 +1,161 @@
+import bisect
+
+# ROSTER INDEXES
+# Both indexes subscribe to the Roster, so every add, update and delete keeps
+# them current without a rescan. They are only built the first time they are
+# used, so opening the app costs nothing extra.
+
+BULK_REBUILD = 1000 # A batch bigger than this rebuilds the name index instead of inserting one by one
+
+
+def _key(student_id):
+    return str(student_id).encode("utf-8")
+
+
+# STUDENT ID INDEX
+class IdIndex:
+    # Hash index: student ID -> roster slot, for O(1) lookups and duplicate checks
+    def __init__(self, roster):
+        self.roster = roster
+        self._slots = None # ID bytes -> slot
+        self._duplicates = {} # ID bytes -> extra slots (only if the file already had repeats)
+        roster.subscribe(self)
+
+    def _build(self):
+        if self._slots is not None:
+            return
+        slots = self.roster.slots()
+        ids = self.roster.raw_column("id", slots).tolist()
+        self._slots = dict(zip(ids, slots.tolist()))
+        if len(self._slots) != len(ids):
+            # Some IDs appear twice; first one wins, the rest are remembered as duplicates
+            self._slots = {}
+            for key, slot in zip(ids, slots.tolist()):
+                self._insert(key, slot)
+
+    def _insert(self, key, slot):
+        if self._slots.setdefault(key, slot) != slot:
+            self._duplicates.setdefault(key, []).append(slot)
+
+    def _delete(self, key, slot):
+        extra = self._duplicates.get(key, [])
+        if self._slots.get(key) == slot:
+            if extra:
+                self._slots[key] = extra.pop(0)
+            else:
+                del self._slots[key]
+        elif slot in extra:
+            extra.remove(slot)
+        if key in self._duplicates and not extra:
+            del self._duplicates[key]
+
+    def get(self, student_id, default=None):
+        # The StudentRecord with this ID, or default
+        self._build()
+        slot = self._slots.get(_key(student_id))
+        return default if slot is None else self.roster.record(slot)
+
+    def __contains__(self, student_id):
+        self._build()
+        return _key(student_id) in self._slots
+
+    def duplicate_ids(self):
+        self._build()
+        return [key.decode("utf-8") for key in self._duplicates]
+
+    # Roster listener methods
+    def rows_added(self, roster, slots):
+        if self._slots is not None:
+            for key, slot in zip(roster.raw_column("id", slots).tolist(), slots.tolist()):
+                self._insert(key, slot)
+
+    def row_changed(self, roster, slot, old):
+        if self._slots is not None:
+            new_key = bytes(roster.raw_column("id", slot))
+            if new_key != _key(old["id"]):
+                self._delete(_key(old["id"]), slot)
+                self._insert(new_key, slot)
+
+    def row_removed(self, roster, slot, old):
+        if self._slots is not None:
+            self._delete(_key(old["id"]), slot)
+
+
+# NAME PREFIX INDEX
+class NamePrefixIndex:
+    # Names kept in sorted order (ignoring case) so a prefix search is a binary search
+    def __init__(self, roster):
+        self.roster = roster
+        self._keys = None # Sorted, casefolded names
+        self._slots = None # Slot for each entry in self._keys
+        roster.subscribe(self)
+
+    def _build(self):
+        if self._keys is not None:
+            return
+        slots = self.roster.slots().tolist()
+        names = [name.decode("utf-8").casefold() for name in self.roster.raw_column("name", slots).tolist()]
+        order = sorted(range(len(names)), key=names.__getitem__)
+        self._keys = [names[i] for i in order]
+        self._slots = [slots[i] for i in order]
+
+    def _insert(self, name, slot):
+        key = name.casefold()
+        i = bisect.bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._slots.insert(i, slot)
+
+    def _delete(self, name, slot):
+        key = name.casefold()
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_right(self._keys, key, lo)
+        for i in range(lo, hi):
+            if self._slots[i] == slot:
+                del self._keys[i]
+                del self._slots[i]
+                return
+
+    def search(self, prefix, limit=None):
+        # Slots of every student whose name starts with prefix, in name order
+        self._build()
+        key = prefix.casefold()
+        i = bisect.bisect_left(self._keys, key)
+        found = []
+        while i < len(self._keys) and self._keys[i].startswith(key):
+            if limit is not None and len(found) >= limit:
+                break
+            found.append(self._slots[i])
+            i += 1
+        return found
+
+    # Roster listener methods
+    def rows_added(self, roster, slots):
+        if self._keys is None:
+            return
+        if len(slots) > BULK_REBUILD:
+            self._keys = self._slots = None # Cheaper to sort everything again on next search
+            return
+        for name, slot in zip(roster.raw_column("name", slots).tolist(), slots.tolist()):
+            self._insert(name.decode("utf-8"), slot)
+
+    def row_changed(self, roster, slot, old):
+        if self._keys is not None:
+            name = roster.raw_column("name", slot).decode("utf-8")
+            if name != old["name"]:
+                self._delete(old["name"], slot)
+                self._insert(name, slot)
+
+    def row_removed(self, roster, slot, old):
+        if self._keys is not None:
+            self._delete(old["name"], slot)
+
+
+def search_students(id_index, name_index, text, limit=1000):
+    # Exact ID match first, then students whose name starts with the text
+    text = text.strip()
+    found = []
+    by_id = id_index.get(text)
+    if by_id is not None:
+        found.append(by_id.slot)
+    found += [slot for slot in name_index.search(text, limit) if slot not in found]
+    return found[:limit]
@@ -0,0 +1,242 @@
+import os
+import zlib
+import threading
+from contextlib import contextmanager
+
+from roster import check_student
+from roster_binary import write_roster_file
+
+# WRITE-AHEAD JOURNAL
+# Every add, update, delete and sort is appended as one short line to
+# studentMarks.txt.journal instead of rewriting the whole roster file.
+# Once enough edits pile up, a background thread writes a fresh copy of the
+# roster (compaction) and swaps it in with an atomic rename. The storage asks for
+# that with compact_if_due() after each edit has been applied to the roster.
+#
+# Journal line:  <op>,<fields...>,<crc32>
+#   A,<id>,<name>,<cw1>,<cw2>,<cw3>,<exam>           add at the end
+#   U,<pos>,<id>,<name>,<cw1>,<cw2>,<cw3>,<exam>     replace row at position
+#   D,<pos>                                          delete row at position
+#   S,<field>,<0|1>                                  sort by field (1 = descending), old journals only
+# The first line ("#journal,<base>") says which version of the base file the
+# edits apply to, so they are never replayed twice after a compaction.
+
+COMPACT_EVERY = 500 # Edits in the journal before a background compaction starts
+AFTER_COMPACTION = "after-compaction"
+
+
+def base_fingerprint(path):
+    # Changes whenever the base file is replaced (new inode) or edited
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return "missing"
+    return f"{st.st_size}:{st.st_mtime_ns}:{st.st_ino}"
+
+def _encode(fields):
+    payload = ",".join(str(field) for field in fields)
+    return f"{payload},{zlib.crc32(payload.encode('utf-8')):08x}\n"
+
+def _student_fields(student):
+    return [student["id"], student["name"], *student["marks"], student["exam"]]
+
+
+class RosterJournal:
+    def __init__(self, base_path, roster=None, compact_every=COMPACT_EVERY):
+        self.base_path = base_path
+        self.path = base_path + ".journal"
+        self.compacting_path = base_path + ".journal.compacting"
+        self.roster = roster
+        self.compact_every = compact_every
+        self.entries = 0 # Edits in the live journal
+        self.skipped = 0 # Damaged lines found during the last replay
+        self._file = None
+        self._lock = threading.Lock()
+        self._compactor = None
+        self._batch_depth = 0 # Inside batch(): one fsync at the end instead of one per edit
+
+    # READING BACK (crash recovery)
+    def has_pending(self):
+        return os.path.exists(self.path) or os.path.exists(self.compacting_path)
+
+    def _read(self, path):
+        # Returns the header and the valid entries, stopping at the first torn or damaged line
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            header = f.readline().rstrip("\n").split(",", 1)
+            entries = []
+            for line in f:
+                payload, _, crc = line.rstrip("\n").rpartition(",")
+                if not line.endswith("\n") or f"{zlib.crc32(payload.encode('utf-8')):08x}" != crc:
+                    self.skipped += 1
+                    break
+                entries.append(payload.split(","))
+        base = header[1] if len(header) == 2 and header[0] == "#journal" else None
+        return base, entries
+
+    def replay(self, roster=None, tidy_up=True):
+        # Re-applies edits that never made it into the base file, returns how many were applied.
+        # Readers that must not touch the files (e.g. grade_batch) pass tidy_up=False
+        roster = roster if roster is not None else self.roster
+        fingerprint = base_fingerprint(self.base_path)
+        pending = []
+        tidy_up = False
+        leftovers = False
+        if os.path.exists(self.compacting_path):
+            leftovers = True
+            base, entries = self._read(self.compacting_path)
+            if base == fingerprint:
+                # Compaction never got as far as replacing the base file
+                pending += entries
+        if os.path.exists(self.path):
+            base, entries = self._read(self.path)
+            if base not in (fingerprint, AFTER_COMPACTION):
+                raise ValueError(f"{self.path} does not belong to the current {self.base_path}")
+            leftovers = leftovers or base != fingerprint or self.skipped > 0
+            pending += entries
+        self._apply(roster, pending)
+
+        if leftovers and tidy_up:
+            # Leave a single journal behind that applies to the current base file
+            temp_name = self.path + ".tmp"
+            with open(temp_name, "w", encoding="utf-8", newline="") as f:
+                f.write(f"#journal,{fingerprint}\n")
+                f.writelines(_encode(entry) for entry in pending)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, self.path)
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)
+        self.entries = len(pending)
+        return len(pending)
+
+    def resume(self):
+        # Picks up an existing (already replayed) journal so new edits are appended to it
+        if os.path.exists(self.path):
+            base, entries = self._read(self.path)
+            if base != base_fingerprint(self.base_path):
+                raise ValueError(f"{self.path} has not been replayed into {self.base_path}")
+            self.entries = len(entries)
+
+    def _apply(self, roster, entries):
+        for entry in entries:
+            op = entry[0]
+            if op == "A":
+                roster.append(self._to_student(entry[1:]))
+            elif op == "U":
+                roster.update(int(entry[1]), **self._to_student(entry[2:]))
+            elif op == "D":
+                roster.pop(int(entry[1]))
+            elif op == "S":
+                # Nothing writes sort entries any more (sorting is a view now), but
+                # journals left by older versions may still hold them
+                roster.sort_by(entry[1], reverse=entry[2] == "1")
+            else:
+                raise ValueError(f"unknown journal entry {op!r}")
+
+    def _to_student(self, fields):
+        student = {"id": fields[0], "name": fields[1],
+                   "marks": [int(mark) for mark in fields[2:5]], "exam": int(fields[5])}
+        check_student(student) # Raises ValueError like any other entry that doesn't fit
+        return student
+
+    # WRITING (one small append per edit)
+    def log_add(self, student):
+        self._append(["A", *_student_fields(student)])
+
+    def log_update(self, position, student):
+        self._append(["U", position, *_student_fields(student)])
+
+    def log_delete(self, position):
+        self._append(["D", position])
+
+    def _append(self, fields):
+        with self._lock:
+            if self._file is None:
+                self._open(base_fingerprint(self.base_path))
+            self._file.write(_encode(fields))
+            if not self._batch_depth:
+                self._file.flush()
+                os.fsync(self._file.fileno()) # The edit is safe on disk before the page moves on
+            self.entries += 1
+
+    @contextmanager
+    def batch(self):
+        # For bulk edits: everything logged inside the with block is synced to disk once, at the end
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                with self._lock:
+                    if self._file is not None:
+                        self._file.flush()
+                        os.fsync(self._file.fileno())
+
+    def _open(self, base):
+        # Opens the live journal for appending, writing the header if it is new
+        is_new = not os.path.exists(self.path)
+        self._file = open(self.path, "a", encoding="utf-8", newline="")
+        if is_new:
+            self._file.write(f"#journal,{base}\n")
+
+    # COMPACTION
+    def compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def compact_if_due(self):
+        # Called by the storage once an edit has reached the roster, never from the
+        # log_*() methods: the snapshot would miss the edit just logged
+        if self.entries >= self.compact_every and not self._batch_depth:
+            self.compact()
+
+    def compact(self, background=True):
+        # Folds the journal into the base file. The roster is copied on this thread,
+        # the slow file writing happens on a worker thread
+        if self.compacting() or self.entries == 0:
+            return
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.path):
+                # New edits go to a fresh journal while this one is being folded in
+                os.replace(self.path, self.compacting_path)
+            self._open(AFTER_COMPACTION)
+            self.entries = 0
+        snapshot = self.roster.snapshot()
+        self._compactor = threading.Thread(target=self._write_base, args=(snapshot,), daemon=True)
+        self._compactor.start()
+        if not background:
+            self._compactor.join()
+
+    def _write_base(self, snapshot):
+        write_roster_file(self.base_path, snapshot) # Keeps the base file's format (text or binary)
+        with self._lock:
+            # The live journal now applies to the new base file, record that in its header
+            self._file.close()
+            with open(self.path, "r", encoding="utf-8", newline="") as f:
+                f.readline()
+                body = f.read()
+            temp_name = self.path + ".tmp"
+            with open(temp_name, "w", encoding="utf-8", newline="") as f:
+                f.write(f"#journal,{base_fingerprint(self.base_path)}\n{body}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, self.path)
+            self._file = open(self.path, "a", encoding="utf-8", newline="")
+        if os.path.exists(self.compacting_path):
+            os.remove(self.compacting_path)
+
+    def close(self):
+        # Called when the app exits: fold any remaining edits in and wait for it to finish
+        if self._compactor is not None:
+            self._compactor.join()
+        if self.entries:
+            self.compact(background=False)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self.entries == 0 and os.path.exists(self.path):
+            os.remove(self.path)
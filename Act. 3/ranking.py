@@ -0,0 +1,181 @@
+import bisect
+import numpy as np
+
+# RANK INDEX (order statistics on percentage)
+# Percentage only depends on coursework total + exam, which is a whole number,
+# so students are kept in one bucket per score. A Fenwick tree over the bucket
+# sizes answers "who is k-th" and "how many are below" in O(log range), and
+# the highest / lowest scores are cached so those two lookups are O(1).
+# Students who tie come back in display order, like the old max()/min() over
+# the list; that costs one vectorized pass over the order when a score is shared.
+# Like the other indexes it subscribes to the Roster and is built on first use.
+
+SCORE_OFFSET = 4 * 32768 # Marks are int16, so coursework total + exam fits in +/- 4 * 32768
+SCORE_RANGE = 2 * SCORE_OFFSET
+BULK_REBUILD = 1000 # Batches bigger than this rebuild instead of inserting one by one
+
+
+class RankIndex:
+    def __init__(self, roster):
+        self.roster = roster
+        self._tree = None # Fenwick tree over bucket sizes (1-based)
+        self._buckets = {} # score -> sorted slots with that score
+        self._score_of = {} # slot -> score
+        self._high = None # Highest occupied score
+        self._low = None # Lowest occupied score
+        roster.subscribe(self)
+
+    def _scores(self, slots):
+        totals = self.roster.raw_column("coursework_total", slots).astype(np.int64)
+        return totals + self.roster.raw_column("exam", slots) + SCORE_OFFSET
+
+    def _build(self):
+        if self._tree is not None:
+            return
+        slots = np.sort(self.roster.slots())
+        scores = self._scores(slots)
+        counts = np.bincount(scores, minlength=SCORE_RANGE)
+        # Fenwick tree built in O(range) from the counts
+        prefix = np.concatenate(([0], np.cumsum(counts)))
+        index = np.arange(SCORE_RANGE + 1)
+        tree = prefix - prefix[index - (index & -index)]
+        self._tree = tree.tolist()
+
+        # Slots grouped by score (slots are sorted, so every bucket is too)
+        order = np.argsort(scores, kind="stable")
+        sorted_scores = scores[order]
+        bounds = np.flatnonzero(np.diff(sorted_scores)) + 1
+        self._buckets = {int(group_scores[0]): group.tolist()
+                         for group, group_scores in zip(np.split(slots[order], bounds),
+                                                        np.split(sorted_scores, bounds)) if len(group)}
+        self._score_of = dict(zip(slots.tolist(), scores.tolist()))
+        self._high = max(self._buckets) if self._buckets else None
+        self._low = min(self._buckets) if self._buckets else None
+
+    # FENWICK TREE
+    def _add(self, score, delta):
+        i = score + 1
+        while i <= SCORE_RANGE:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_below(self, score):
+        # Number of students with a score lower than this one
+        total, i = 0, score
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _find(self, k):
+        # Score of the k-th lowest student (0-based) by walking down the tree
+        pos, remaining = 0, k + 1
+        step = 1 << (SCORE_RANGE.bit_length() - 1)
+        while step:
+            nxt = pos + step
+            if nxt <= SCORE_RANGE and self._tree[nxt] < remaining:
+                pos = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        return pos, remaining - 1 # Score and position inside its bucket
+
+    def _shown_first(self, bucket):
+        # A bucket's slots in display order (buckets themselves are kept in slot
+        # order, which stops matching the list once a deleted slot is reused)
+        if len(bucket) == 1:
+            return bucket
+        shown = self.roster.slots()
+        return shown[np.isin(shown, bucket)].tolist()
+
+    # KEEPING UP TO DATE
+    def _insert(self, slot, score):
+        bisect.insort(self._buckets.setdefault(score, []), slot)
+        self._score_of[slot] = score
+        self._add(score, 1)
+        if self._high is None or score > self._high:
+            self._high = score
+        if self._low is None or score < self._low:
+            self._low = score
+
+    def _delete(self, slot):
+        score = self._score_of.pop(slot)
+        bucket = self._buckets[score]
+        del bucket[bisect.bisect_left(bucket, slot)]
+        self._add(score, -1)
+        if not bucket:
+            del self._buckets[score]
+            if not self._buckets:
+                self._high = self._low = None
+            elif score == self._high:
+                self._high = self._find(len(self._score_of) - 1)[0]
+            elif score == self._low:
+                self._low = self._find(0)[0]
+
+    def rows_added(self, roster, slots):
+        if self._tree is None:
+            return
+        if len(slots) > BULK_REBUILD:
+            self._tree = None
+            return
+        for slot, score in zip(slots.tolist(), self._scores(slots).tolist()):
+            self._insert(slot, score)
+
+    def row_changed(self, roster, slot, old):
+        if self._tree is not None and int(self._scores(slot)) != self._score_of[slot]:
+            self._delete(slot)
+            self._insert(slot, int(self._scores(slot)))
+
+    def row_removed(self, roster, slot, old):
+        if self._tree is not None:
+            self._delete(slot)
+
+    # QUERIES
+    def __len__(self):
+        return len(self.roster)
+
+    def highest(self):
+        # Student with the highest percentage (the first one shown wins a tie), or None
+        self._build()
+        return None if self._high is None else self.roster.record(self._shown_first(self._buckets[self._high])[0])
+
+    def lowest(self):
+        self._build()
+        return None if self._low is None else self.roster.record(self._shown_first(self._buckets[self._low])[0])
+
+    def select(self, k):
+        # The k-th lowest student (0-based); students who tie are taken in slot order
+        self._build()
+        if not 0 <= k < len(self._score_of):
+            raise IndexError("rank out of range")
+        score, offset = self._find(k)
+        return self.roster.record(self._buckets[score][offset])
+
+    def rank(self, record):
+        # How many students have a lower percentage than this one
+        self._build()
+        return self._count_below(self._score_of[record.slot])
+
+    def top(self, k):
+        # The k best students, highest first; ties in display order
+        self._build()
+        n = len(self._score_of)
+        result = []
+        while len(result) < min(k, n):
+            score, _ = self._find(n - 1 - len(result))
+            bucket = self._buckets[score]
+            result += [self.roster.record(slot) for slot in self._shown_first(bucket)[:k - len(result)]]
+        return result
+
+    def percentile(self, p):
+        # Nearest-rank percentile, p from 0 to 100
+        self._build()
+        n = len(self._score_of)
+        if n == 0:
+            return None
+        k = min(n - 1, max(0, int(np.ceil(p / 100 * n)) - 1))
+        return self.select(k)
+
+    def median(self):
+        self._build()
+        n = len(self._score_of)
+        return self.select((n - 1) // 2) if n else None
@@ -0,0 +1,564 @@
+import os
+import warnings
+import numpy as np
+from collections import deque
+from collections.abc import Mapping
+from itertools import islice
+
+# COLUMNAR STUDENT ROSTER
+# Instead of one dict per student, every field lives in its own NumPy column.
+# IDs and names are stored as UTF-8 byte strings, marks and exam as small ints,
+# and coursework total, percentage and grade are worked out for many rows at once.
+
+TOTAL_POSSIBLE = 60 + 100 # Same total as calculate_overall_percentage()
+GRADES = ("A", "B", "C", "D", "F")
+GRADE_BOUNDS = np.array([40, 50, 60, 70]) # Same thresholds as get_grade()
+
+FIELDS = ("id", "name", "marks", "exam", "coursework_total", "percentage", "grade")
+DERIVED_FIELDS = ("coursework_total", "percentage", "grade")
+
+CHANGE_LOG_SIZE = 1000 # Changes remembered for pages that redraw only what changed
+
+MARK_DTYPE = np.int16
+MARK_MIN, MARK_MAX = np.iinfo(MARK_DTYPE).min, np.iinfo(MARK_DTYPE).max
+TOTAL_DTYPE = np.int32
+
+
+# VECTORIZED CALCULATIONS
+def compute_derived(marks, exams):
+    # Works out coursework total, percentage and grade code for a whole block of rows
+    coursework_total = marks.sum(axis=1, dtype=TOTAL_DTYPE)
+    percentage = ((coursework_total + exams) / TOTAL_POSSIBLE) * 100
+    grade_codes = grade_codes_for(percentage)
+    return coursework_total, percentage, grade_codes
+
+def grade_codes_for(percentage):
+    # 0 = A ... 4 = F, matching get_grade() at the exact boundaries
+    return (len(GRADE_BOUNDS) - np.searchsorted(GRADE_BOUNDS, percentage, side="right")).astype(np.uint8)
+
+def check_student(student):
+    # ValueError for a student that can't be saved, so it is caught before anything is written:
+    # the file and the journal are comma separated, one student per line
+    for field in ("id", "name"):
+        if any(c in str(student[field]) for c in ",\r\n"):
+            raise ValueError(f"{field} can't contain a comma or a line break")
+    for mark in (*student["marks"], student["exam"]):
+        if not MARK_MIN <= int(mark) <= MARK_MAX:
+            raise ValueError(f"mark {mark} is out of range ({MARK_MIN} to {MARK_MAX})")
+
+def encode_strings(values):
+    # Turns a list of str into a compact fixed-width bytes column
+    return np.array([v.encode("utf-8") for v in values], dtype=bytes)
+
+
+# RECORD VIEW
+class StudentRecord(Mapping):
+    # Dict-like view of one row so code written for s["name"], s["marks"] etc. keeps working
+    __slots__ = ("_roster", "_slot")
+
+    def __init__(self, roster, slot):
+        self._roster = roster
+        self._slot = slot
+
+    def __getitem__(self, key):
+        return self._roster._get_field(self._slot, key)
+
+    def __setitem__(self, key, value):
+        self._roster._set_field(self._slot, key, value)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __eq__(self, other):
+        if isinstance(other, StudentRecord):
+            return self._roster is other._roster and self._slot == other._slot
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash((id(self._roster), self._slot))
+
+    def __repr__(self):
+        return f"StudentRecord({self.to_dict()!r})"
+
+    @property
+    def slot(self):
+        return self._slot
+
+    def to_dict(self):
+        # Plain dict copy, same shape as the old load_student_data() rows
+        return {key: self[key] for key in FIELDS}
+
+
+# ROSTER
+class Roster:
+    # Rows live in "slots" that never move, so a StudentRecord stays valid while
+    # other students are added, deleted or sorted. self._order holds the slots
+    # in display order (what the listbox/table positions refer to).
+    def __init__(self, capacity=16):
+        capacity = max(int(capacity), 1)
+        self._size = 0 # Live students
+        self._used = 0 # Slots handed out so far
+        self._free = [] # Slots freed by deletes, reused by appends
+        self._order = np.zeros(capacity, dtype=np.int64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._ids = np.zeros(capacity, dtype="S1")
+        self._names = np.zeros(capacity, dtype="S1")
+        self._marks = np.zeros((capacity, 3), dtype=MARK_DTYPE)
+        self._exam = np.zeros(capacity, dtype=MARK_DTYPE)
+        self._coursework_total = np.zeros(capacity, dtype=TOTAL_DTYPE)
+        self._percentage = np.zeros(capacity, dtype=np.float64)
+        self._grade = np.zeros(capacity, dtype=np.uint8)
+        self._listeners = [] # Indexes etc. that follow every change (see subscribe)
+        self.version = 0 # Goes up by one on every change
+        self._changes = deque(maxlen=CHANGE_LOG_SIZE) # (version, kind, position, count)
+
+    @classmethod
+    def from_columns(cls, ids, names, marks, exams):
+        roster = cls(capacity=len(ids))
+        roster.extend_columns(ids, names, marks, exams)
+        return roster
+
+    @classmethod
+    def from_records(cls, students):
+        # Builds a roster from dicts shaped like the old load_student_data() rows
+        students = list(students)
+        return cls.from_columns(
+            [s["id"] for s in students],
+            [s["name"] for s in students],
+            [s["marks"] for s in students],
+            [s["exam"] for s in students],
+        )
+
+    # SEQUENCE BEHAVIOUR (so StudentApp.students can stay a "list")
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [StudentRecord(self, int(slot)) for slot in self._order[:self._size][pos]]
+        return StudentRecord(self, self._slot_at(pos))
+
+    def __iter__(self):
+        for slot in self._order[:self._size].tolist():
+            yield StudentRecord(self, slot)
+
+    def _slot_at(self, pos):
+        if pos < 0:
+            pos += self._size
+        if not 0 <= pos < self._size:
+            raise IndexError("roster index out of range")
+        return int(self._order[pos])
+
+    def slots(self):
+        # Slots in display order (read-only copy)
+        return self._order[:self._size].copy()
+
+    def record(self, slot):
+        if not (0 <= slot < self._used and self._alive[slot]):
+            raise KeyError(slot)
+        return StudentRecord(self, slot)
+
+    def position_of(self, record):
+        # Current listbox/table position of a record
+        hits = np.flatnonzero(self._order[:self._size] == record.slot)
+        if not len(hits):
+            raise ValueError("record is not in this roster")
+        return int(hits[0])
+
+    def raw_column(self, field, slots):
+        # Stored values for the given slots (IDs and names stay as UTF-8 bytes)
+        attr = {"id": "_ids", "name": "_names"}.get(field, "_" + field)
+        return getattr(self, attr)[slots]
+
+    def column(self, field):
+        # Whole column in display order, e.g. roster.column("percentage")
+        slots = self._order[:self._size]
+        if field == "id":
+            return np.char.decode(self._ids[slots], "utf-8")
+        if field == "name":
+            return np.char.decode(self._names[slots], "utf-8")
+        if field == "grade":
+            return np.array(GRADES)[self._grade[slots]]
+        return getattr(self, "_" + field)[slots]
+
+    # CHANGE NOTIFICATIONS
+    # A listener can define any of rows_added(roster, slots), row_changed(roster, slot, old),
+    # row_removed(roster, slot, old) and rows_reordered(roster); "old" is the row as a dict
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        for listener in self._listeners:
+            handler = getattr(listener, event, None)
+            if handler is not None:
+                handler(self, *args)
+
+    # CHANGE LOG
+    # kind is "insert" (count rows at position), "delete", "edit" or "reorder"
+    def _log_change(self, kind, position=0, count=1):
+        self.version += 1
+        self._changes.append((self.version, kind, position, count))
+
+    def changes_since(self, version):
+        # Changes made after the given version, or None if they are too old to replay
+        if version == self.version:
+            return []
+        if not self._changes or self._changes[0][0] > version + 1:
+            return None
+        return [change for change in self._changes if change[0] > version]
+
+    # STORAGE
+    def _capacity(self):
+        return len(self._alive)
+
+    def _reserve(self, needed):
+        # Grows every column by doubling so appends stay amortised O(1)
+        capacity = self._capacity()
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for attr in ("_order", "_alive", "_ids", "_names", "_marks", "_exam",
+                     "_coursework_total", "_percentage", "_grade"):
+            old = getattr(self, attr)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, attr, new)
+
+    def _fit_strings(self, attr, values):
+        # Widens a bytes column only when a longer value arrives
+        column = getattr(self, attr)
+        if values.dtype.itemsize > column.dtype.itemsize:
+            setattr(self, attr, column.astype(values.dtype))
+
+    def _new_slots(self, count):
+        reused = []
+        while self._free and len(reused) < count:
+            reused.append(self._free.pop())
+        fresh = count - len(reused)
+        self._reserve(self._used + fresh)
+        slots = np.array(reused + list(range(self._used, self._used + fresh)), dtype=np.int64)
+        self._used += fresh
+        return slots
+
+    # ADDING
+    def extend_columns(self, ids, names, marks, exams):
+        # Appends a whole batch of students and grades them in one vectorized pass
+        count = len(ids)
+        if count == 0:
+            return np.zeros(0, dtype=np.int64)
+        ids = encode_strings(ids) if not isinstance(ids, np.ndarray) or ids.dtype.kind != "S" else ids
+        names = encode_strings(names) if not isinstance(names, np.ndarray) or names.dtype.kind != "S" else names
+        marks = np.asarray(marks, dtype=MARK_DTYPE).reshape(count, 3)
+        exams = np.asarray(exams, dtype=MARK_DTYPE).reshape(count)
+
+        slots = self._new_slots(count)
+        self._reserve(self._size + count)
+        self._fit_strings("_ids", ids)
+        self._fit_strings("_names", names)
+
+        self._ids[slots] = ids
+        self._names[slots] = names
+        self._marks[slots] = marks
+        self._exam[slots] = exams
+        (self._coursework_total[slots],
+         self._percentage[slots],
+         self._grade[slots]) = compute_derived(marks, exams)
+        self._alive[slots] = True
+        self._order[self._size:self._size + count] = slots
+        self._size += count
+        self._log_change("insert", self._size - count, count)
+        self._notify("rows_added", slots)
+        return slots
+
+    def add_batch(self, batch):
+        # Appends one RosterBatch from iter_roster_batches()
+        return self.extend_columns(batch.ids, batch.names, batch.marks, batch.exams)
+
+    def append(self, student):
+        # Accepts the same dict the pages build; derived fields are recalculated
+        slots = self.extend_columns([str(student["id"])], [str(student["name"])],
+                                    [student["marks"]], [student["exam"]])
+        return StudentRecord(self, int(slots[0]))
+
+    def extend(self, students):
+        for student in students:
+            self.append(student)
+
+    # DELETING
+    def pop(self, pos=-1):
+        # Removes the student at a listbox position and returns a plain dict copy
+        if pos < 0:
+            pos += self._size
+        slot = self._slot_at(pos)
+        removed = StudentRecord(self, slot).to_dict()
+        self._order[pos:self._size - 1] = self._order[pos + 1:self._size]
+        self._size -= 1
+        self._alive[slot] = False
+        self._free.append(slot)
+        self._log_change("delete", pos)
+        self._notify("row_removed", slot, removed)
+        return removed
+
+    def remove(self, record):
+        return self.pop(self.position_of(record))
+
+    # UPDATING
+    def update(self, record, **fields):
+        # Changes several fields of one student and recalculates its grade once
+        slot = record.slot if isinstance(record, StudentRecord) else self._slot_at(record)
+        for key in fields:
+            if key in DERIVED_FIELDS:
+                raise KeyError(f"{key} is calculated from marks and exam")
+            if key not in FIELDS:
+                raise KeyError(key)
+        old = StudentRecord(self, slot).to_dict() if self._listeners else None
+        if "id" in fields:
+            self._store_string("_ids", slot, fields["id"])
+        if "name" in fields:
+            self._store_string("_names", slot, fields["name"])
+        if "marks" in fields:
+            self._marks[slot] = np.asarray(fields["marks"], dtype=MARK_DTYPE).reshape(3)
+        if "exam" in fields:
+            self._exam[slot] = fields["exam"]
+        if "marks" in fields or "exam" in fields:
+            self._recompute(slot)
+        self._log_change("edit", self.position_of(StudentRecord(self, slot)))
+        if old is not None:
+            self._notify("row_changed", slot, old)
+        return StudentRecord(self, slot)
+
+    def _store_string(self, attr, slot, value):
+        encoded = np.array([str(value).encode("utf-8")], dtype=bytes)
+        self._fit_strings(attr, encoded)
+        getattr(self, attr)[slot] = encoded[0]
+
+    def _recompute(self, slot):
+        total, percentage, grade = compute_derived(self._marks[slot:slot + 1], self._exam[slot:slot + 1])
+        self._coursework_total[slot] = total[0]
+        self._percentage[slot] = percentage[0]
+        self._grade[slot] = grade[0]
+
+    def _get_field(self, slot, key):
+        if key == "id":
+            return self._ids[slot].decode("utf-8")
+        if key == "name":
+            return self._names[slot].decode("utf-8")
+        if key == "marks":
+            return self._marks[slot].tolist()
+        if key == "exam":
+            return int(self._exam[slot])
+        if key == "coursework_total":
+            return int(self._coursework_total[slot])
+        if key == "percentage":
+            return float(self._percentage[slot])
+        if key == "grade":
+            return GRADES[self._grade[slot]]
+        raise KeyError(key)
+
+    def _set_field(self, slot, key, value):
+        self.update(StudentRecord(self, slot), **{key: value})
+
+    # SORTING
+    def sort_by(self, field, reverse=False):
+        # Stable vectorized sort on a column, e.g. roster.sort_by("percentage", True)
+        self._order[:self._size] = self._order[:self._size][self.argsort(field, reverse)]
+        self._log_change("reorder", 0, self._size)
+        self._notify("rows_reordered")
+
+    def argsort(self, field, reverse=False):
+        values = self.column(field)
+        if reverse:
+            # Stable descending sort: sort the reversed column, then map back
+            n = len(values)
+            return (n - 1 - np.argsort(values[::-1], kind="stable"))[::-1]
+        return np.argsort(values, kind="stable")
+
+    def to_dicts(self):
+        return [record.to_dict() for record in self]
+
+    def snapshot(self):
+        # Copies of the base columns in display order, safe to hand to another thread
+        slots = self._order[:self._size]
+        return self._ids[slots], self._names[slots], self._marks[slots], self._exam[slots]
+
+
+# REPLAYING CHANGES ON A LIST WIDGET
+def plan_list_updates(changes):
+    # Turns roster changes into the inserts/deletes a Listbox needs, plus the final
+    # positions whose text must be (re)read. Returns None if a full redraw is needed.
+    steps = []
+    dirty = set()
+    for _, kind, position, count in changes:
+        if kind == "insert":
+            steps.append(("insert", position, count))
+            dirty = {d + count if d >= position else d for d in dirty}
+            dirty.update(range(position, position + count))
+        elif kind == "delete":
+            steps.append(("delete", position, 1))
+            dirty = {d - 1 if d > position else d for d in dirty if d != position}
+        elif kind == "edit":
+            dirty.add(position)
+        else:
+            return None
+    # Group the dirty positions into runs so each run is rewritten in one go
+    runs = []
+    for d in sorted(dirty):
+        if runs and runs[-1][1] == d:
+            runs[-1][1] = d + 1
+        else:
+            runs.append([d, d + 1])
+    return steps, runs
+
+
+# READING THE TEXT FILE
+BATCH_SIZE = 50_000 # Lines parsed per batch, keeps memory bounded on huge files
+
+
+class LoadReport:
+    # Filled in while a roster file is streamed: header count, rows read and bad lines
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.header_count = None
+        self.rows_read = 0
+        self.errors = [] # (line number, reason, raw text)
+        self.finished = False
+
+    def add_error(self, line_no, reason, raw):
+        self.errors.append((line_no, reason, raw.decode("utf-8", "replace")))
+
+    @property
+    def count_matches(self):
+        return self.header_count is not None and self.header_count == self.rows_read
+
+    def summary(self, limit=5):
+        # Short human readable text for a messagebox or the console
+        lines = []
+        if self.header_count is None:
+            lines.append("Header line is missing or is not a number.")
+        elif not self.count_matches:
+            lines.append(f"Header says {self.header_count} students but {self.rows_read} were read.")
+        if self.errors:
+            lines.append(f"{len(self.errors)} malformed line(s) skipped:")
+            for line_no, reason, raw in self.errors[:limit]:
+                lines.append(f"  line {line_no}: {reason} ({raw!r})")
+            if len(self.errors) > limit:
+                lines.append(f"  ... and {len(self.errors) - limit} more")
+        return "\n".join(lines)
+
+
+class RosterBatch:
+    # One parsed chunk of the file, ready for Roster.extend_columns()
+    __slots__ = ("ids", "names", "marks", "exams", "first_line")
+
+    def __init__(self, ids, names, numbers, first_line):
+        self.ids = ids
+        self.names = names
+        self.marks = numbers[:, :3]
+        self.exams = numbers[:, 3]
+        self.first_line = first_line
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def iter_roster_batches(filename, batch_size=BATCH_SIZE, report=None):
+    # Generator that reads studentMarks.txt a batch at a time instead of all at once.
+    # Bad lines are recorded in the report (with their line numbers) and skipped.
+    if report is None:
+        report = LoadReport(filename)
+    with open(filename, "rb") as file:
+        header = file.readline()
+        try:
+            report.header_count = int(header.strip())
+        except ValueError:
+            report.add_error(1, "header is not a student count", header.strip())
+
+        line_no = 1
+        while True:
+            chunk = list(islice(file, batch_size))
+            if not chunk:
+                break
+            batch = _parse_chunk(chunk, line_no + 1, report)
+            line_no += len(chunk)
+            if len(batch):
+                report.rows_read += len(batch)
+                yield batch
+    report.finished = True
+
+def _parse_chunk(chunk, first_line, report):
+    # Fast path: every line has 6 fields and NumPy converts all the numbers in one go.
+    # If anything looks off, fall back to checking the chunk line by line.
+    lines = [line.strip() for line in chunk]
+    numbered = [(first_line + i, line) for i, line in enumerate(lines) if line]
+    if all(line.count(b",") == 5 for _, line in numbered):
+        rows = [line.split(b",", 2) for _, line in numbered]
+        try:
+            with warnings.catch_warnings():
+                # Older NumPy warns and stops at a number it can't parse, newer NumPy raises
+                warnings.simplefilter("ignore", DeprecationWarning)
+                numbers = np.fromstring(b",".join([row[2] for row in rows]).decode("ascii", "replace"),
+                                        dtype=np.int64, sep=",")
+        except ValueError:
+            numbers = np.empty(0, dtype=np.int64) # Sends the chunk to the line by line check
+        if (numbers.size == 4 * len(rows) and
+                (not numbers.size or (numbers.min() >= MARK_MIN and numbers.max() <= MARK_MAX))):
+            return _make_batch(rows, numbers.reshape(-1, 4), first_line)
+
+    rows, numbers = [], []
+    for line_no, line in numbered:
+        parts = line.split(b",")
+        if len(parts) != 6:
+            report.add_error(line_no, f"expected 6 fields, found {len(parts)}", line)
+            continue
+        try:
+            values = [int(part) for part in parts[2:]]
+        except ValueError:
+            report.add_error(line_no, "marks and exam must be whole numbers", line)
+            continue
+        if min(values) < MARK_MIN or max(values) > MARK_MAX:
+            report.add_error(line_no, "mark out of range", line)
+            continue
+        rows.append(parts[:2])
+        numbers.append(values)
+    return _make_batch(rows, np.array(numbers, dtype=np.int64).reshape(-1, 4), first_line)
+
+def _make_batch(rows, numbers, first_line):
+    ids = np.array([row[0] for row in rows], dtype=bytes)
+    names = np.array([row[1] for row in rows], dtype=bytes)
+    return RosterBatch(ids, names, numbers.astype(MARK_DTYPE), first_line)
+
+def read_roster_text(filename, report=None):
+    # Parses the whole of studentMarks.txt into a Roster, batch by batch
+    roster = Roster()
+    for batch in iter_roster_batches(filename, report=report):
+        roster.add_batch(batch)
+    return roster
+
+
+# WRITING THE TEXT FILE
+def write_roster_text(filename, snapshot):
+    # Writes a Roster.snapshot() to a temporary file first and then swaps it in with an
+    # atomic rename, so a crash half way through never leaves a broken studentMarks.txt
+    ids, names, marks, exams = snapshot
+    temp_name = filename + ".tmp"
+    with open(temp_name, "wb") as f:
+        f.write(b"%d\n" % len(ids))
+        for start in range(0, len(ids), BATCH_SIZE):
+            stop = start + BATCH_SIZE
+            rows = zip(ids[start:stop].tolist(), names[start:stop].tolist(),
+                       marks[start:stop].tolist(), exams[start:stop].tolist())
+            f.write(b"".join(b"%s,%s,%d,%d,%d,%d\n" % (sid, name, m[0], m[1], m[2], exam)
+                             for sid, name, m, exam in rows))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_name, filename)
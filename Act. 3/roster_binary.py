@@ -0,0 +1,185 @@
+import os
+import sys
+import mmap
+import struct
+import numpy as np
+
+from roster import Roster, RosterBatch, LoadReport, BATCH_SIZE, MARK_DTYPE, read_roster_text, iter_roster_batches, write_roster_text
+
+# BINARY ROSTER FILE
+# Same students as studentMarks.txt, but every row takes the same number of bytes,
+# so nothing has to be parsed: the file is mapped into memory and row i starts at
+#   HEADER.size + i * record_size
+# BinaryRosterFile reads rows and columns in place. The apps' Roster can be edited and
+# grows as students are added, so loading one (read_roster_binary, iter_binary_batches)
+# still copies each column out of the map once. That copy is a plain memory copy with
+# no parsing, which is where the speed-up over the text file comes from.
+#
+# Header (little-endian, 24 bytes):
+#   magic "SMRB", format version, header size, student count, ID width, name width, reserved
+# Record (struct "<{id width}s{name width}s4h"):
+#   ID and name as UTF-8 padded with zero bytes, then cw1, cw2, cw3 and exam as int16
+#
+# Convert with:  python roster_binary.py studentMarks.txt studentMarks.bin   (or the other way)
+
+MAGIC = b"SMRB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQHHI")
+
+
+def record_struct(id_width, name_width):
+    return struct.Struct(f"<{id_width}s{name_width}s4h")
+
+def record_dtype(id_width, name_width):
+    # NumPy view of the same layout as record_struct(), for reading whole columns at once
+    return np.dtype([("id", f"S{id_width}"), ("name", f"S{name_width}"),
+                     ("marks", "<i2", (3,)), ("exam", "<i2")])
+
+def is_binary_roster(filename):
+    try:
+        with open(filename, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+class BinaryRosterFile:
+    # A binary roster opened with mmap. Nothing is read until a row or column is asked for
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError(f"{filename} is too short to be a binary roster")
+        magic, version, header_size, count, id_width, name_width, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"{filename} is not a version {FORMAT_VERSION} binary roster")
+        self.header_size = header_size
+        self.header_count = count
+        self.record = record_struct(id_width, name_width)
+        self.dtype = record_dtype(id_width, name_width)
+        # A file cut short (e.g. a copy that didn't finish) only exposes its complete rows
+        self.count = min(count, (len(self._map) - header_size) // self.record.size)
+        self._records = np.frombuffer(self._map, dtype=self.dtype, count=self.count, offset=header_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._records = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass # Someone still holds a column view; the map closes when it is dropped
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        # Row i as the same dict shape the pages use, read straight from its offset
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("roster index out of range")
+        sid, name, cw1, cw2, cw3, exam = self.record.unpack_from(self._map, self.header_size + i * self.record.size)
+        return {"id": sid.rstrip(b"\0").decode("utf-8"), "name": name.rstrip(b"\0").decode("utf-8"),
+                "marks": [cw1, cw2, cw3], "exam": exam}
+
+    def columns(self, start=0, stop=None):
+        # (ids, names, marks, exams) for a range of rows, as views into the map (no copy)
+        rows = self._records[start:stop]
+        return rows["id"], rows["name"], rows["marks"], rows["exam"]
+
+
+# READING
+def read_roster_binary(filename, report=None):
+    with BinaryRosterFile(filename) as f:
+        if report is not None:
+            report.header_count = f.header_count
+            report.rows_read = len(f)
+            report.finished = True
+        # Not zero-copy: Roster.from_columns() copies the columns into its own (editable,
+        # growable) arrays, so the map can be closed straight after
+        return Roster.from_columns(*f.columns())
+
+def iter_binary_batches(filename, batch_size=BATCH_SIZE, report=None):
+    # Same as iter_roster_batches() for the binary format
+    if report is None:
+        report = LoadReport(filename)
+    with BinaryRosterFile(filename) as f:
+        report.header_count = f.header_count
+        for start in range(0, len(f), batch_size):
+            ids, names, marks, exams = f.columns(start, start + batch_size)
+            numbers = np.empty((len(ids), 4), dtype=MARK_DTYPE)
+            numbers[:, :3] = marks
+            numbers[:, 3] = exams
+            report.rows_read += len(ids)
+            yield RosterBatch(ids.copy(), names.copy(), numbers, start + 1)
+            del ids, names, marks, exams
+    report.finished = True
+
+# Either format, picked by looking at the first bytes of the file
+def read_roster_file(filename, report=None):
+    if is_binary_roster(filename):
+        return read_roster_binary(filename, report=report)
+    return read_roster_text(filename, report=report)
+
+def iter_roster_file_batches(filename, batch_size=BATCH_SIZE, report=None):
+    if is_binary_roster(filename):
+        return iter_binary_batches(filename, batch_size, report)
+    return iter_roster_batches(filename, batch_size, report)
+
+
+# WRITING
+def write_roster_binary(filename, snapshot):
+    # Writes a Roster.snapshot() in the binary format, swapped in with an atomic rename
+    ids, names, marks, exams = snapshot
+    id_width = max(ids.dtype.itemsize, 1)
+    name_width = max(names.dtype.itemsize, 1)
+    dtype = record_dtype(id_width, name_width)
+    temp_name = filename + ".tmp"
+    with open(temp_name, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, HEADER.size, len(ids), id_width, name_width, 0))
+        for start in range(0, len(ids), BATCH_SIZE):
+            stop = start + BATCH_SIZE
+            rows = np.zeros(len(ids[start:stop]), dtype=dtype)
+            rows["id"] = ids[start:stop]
+            rows["name"] = names[start:stop]
+            rows["marks"] = marks[start:stop]
+            rows["exam"] = exams[start:stop]
+            f.write(rows.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_name, filename)
+
+def write_roster_file(filename, snapshot):
+    # Keeps whichever format the file already has (text for a new file)
+    if is_binary_roster(filename):
+        write_roster_binary(filename, snapshot)
+    else:
+        write_roster_text(filename, snapshot)
+
+
+# CONVERTING
+def convert_roster(source, target):
+    # Text -> binary or binary -> text, depending on what source is. Returns the LoadReport
+    report = LoadReport(source)
+    if is_binary_roster(source):
+        write_roster_text(target, read_roster_binary(source, report=report).snapshot())
+    else:
+        write_roster_binary(target, read_roster_text(source, report=report).snapshot())
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python roster_binary.py <source> <target>")
+    report = convert_roster(sys.argv[1], sys.argv[2])
+    print(f"{report.rows_read} students written to {sys.argv[2]}")
+    if report.errors or not report.count_matches:
+        print(report.summary())
@@ -0,0 +1,140 @@
+import bisect
+import numpy as np
+
+# SORT VIEWS
+# A sort view is a list of roster slots in sorted order. Showing the roster
+# sorted never changes the roster itself (or the file on disk): pages read the
+# students through a view instead. Views are built on first use and cached per
+# key, ties keep the roster's own order (stable), and a cached view is only
+# thrown away when a field it sorts on actually changes.
+#
+# A key is a tuple of (field, descending) pairs, most important first, e.g.
+# (("grade", False), ("percentage", True)) is grade A-F, best percentage first.
+
+SORT_FIELDS = ("id", "name", "coursework_total", "exam", "percentage", "grade")
+DERIVED_FROM_MARKS = ("coursework_total", "percentage", "grade")
+BULK_REBUILD = 1000 # Batches bigger than this drop the views instead of inserting one by one
+
+# Choices offered by the All Students page (None is the roster's own order)
+SORT_CHOICES = {
+    "File order": None,
+    "Student ID": (("id", False),),
+    "Name": (("name", False),),
+    "Coursework Total": (("coursework_total", True),),
+    "Exam Score": (("exam", True),),
+    "Percentage (high to low)": (("percentage", True),),
+    "Percentage (low to high)": (("percentage", False),),
+    "Grade, then Percentage": (("grade", False), ("percentage", True)),
+    "Grade, then Name": (("grade", False), ("name", False)),
+}
+
+
+def make_key(*fields):
+    # make_key("grade", "-percentage") -> (("grade", False), ("percentage", True))
+    key = tuple((field.lstrip("-"), field.startswith("-")) for field in fields)
+    for field, _ in key:
+        if field not in SORT_FIELDS:
+            raise KeyError(f"cannot sort by {field!r}")
+    return key
+
+
+class _Descending:
+    # Flips the comparison of one value inside a key tuple
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+class SortViews:
+    def __init__(self, roster):
+        self.roster = roster
+        self._views = {} # key -> slots in sorted order
+        roster.subscribe(self)
+
+    def get(self, key):
+        # Slots in the order of this key (read-only, build on first use)
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = self._build(key)
+        return view
+
+    def records(self, key, start, stop):
+        return [self.roster.record(slot) for slot in self.get(key)[start:stop].tolist()]
+
+    def cached(self):
+        return list(self._views)
+
+    def _build(self, key):
+        slots = self.roster.slots()
+        columns = []
+        for field, descending in key:
+            column = self.roster.raw_column(field, slots)
+            if descending:
+                if column.dtype.kind == "S":
+                    column = np.unique(column, return_inverse=True)[1]
+                column = -column.astype(np.float64 if column.dtype.kind == "f" else np.int64)
+            columns.append(column)
+        # np.lexsort is stable and wants the most important key last
+        view = slots[np.lexsort(columns[::-1])]
+        view.flags.writeable = False
+        return view
+
+    def _key_of(self, key, slot):
+        values = []
+        for field, descending in key:
+            value = self.roster.raw_column(field, slot).item()
+            values.append(_Descending(value) if descending else value)
+        return tuple(values)
+
+    # Roster listener methods
+    def rows_added(self, roster, slots):
+        if len(slots) > BULK_REBUILD:
+            self._views = {}
+            return
+        # New rows are last in roster order, so they go after anything they tie with
+        for key, view in self._views.items():
+            view = view.tolist()
+            for slot in slots.tolist():
+                i = bisect.bisect_right(view, self._key_of(key, slot), key=lambda s: self._key_of(key, s))
+                view.insert(i, slot)
+            self._views[key] = self._freeze(view)
+
+    def row_removed(self, roster, slot, old):
+        for key, view in self._views.items():
+            self._views[key] = self._freeze(view[view != slot])
+
+    def row_changed(self, roster, slot, old):
+        changed = {field for field in ("id", "name", "exam") if old[field] != roster.record(slot)[field]}
+        if old["marks"] != roster.record(slot)["marks"] or "exam" in changed:
+            changed.update(DERIVED_FROM_MARKS)
+        stale = [key for key in self._views if any(field in changed for field, _ in key)]
+        if not stale:
+            return
+        # Where each slot sits in roster order, to put the row back among its ties
+        order = roster.slots()
+        position = np.empty(int(order.max()) + 1, dtype=np.int64)
+        position[order] = np.arange(len(order))
+        for key in stale:
+            view = self._views[key][self._views[key] != slot].tolist()
+            target = self._key_of(key, slot)
+            lo = bisect.bisect_left(view, target, key=lambda s: self._key_of(key, s))
+            hi = bisect.bisect_right(view, target, lo, key=lambda s: self._key_of(key, s))
+            ties = position[view[lo:hi]] if hi > lo else np.zeros(0, dtype=np.int64)
+            view.insert(lo + int(np.searchsorted(ties, position[slot])), slot)
+            self._views[key] = self._freeze(view)
+
+    def rows_reordered(self, roster):
+        # Ties follow roster order, so every view has to be rebuilt
+        self._views = {}
+
+    def _freeze(self, view):
+        view = np.asarray(view, dtype=np.int64)
+        view.flags.writeable = False
+        return view
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+
+# STARTUP TIMELINE
+# Writes one line per startup step with the time since the app started, e.g.
+#     312.4 ms  built MenuPage (41.0 ms)
+#     380.9 ms  first frame on screen
+# Switched on with the STARTUP_TIMELINE environment variable:
+#     STARTUP_TIMELINE=-            print to the console
+#     STARTUP_TIMELINE=startup.log  append to a file
+# Times count from when this module was first imported, which the apps do first thing.
+
+STARTED = time.perf_counter()
+
+
+class StartupTimeline:
+    def __init__(self, output=None):
+        self.output = output # File-like object, or None to record nothing
+        self.events = [] # (ms since start, event, cost in ms or None)
+
+    @classmethod
+    def from_env(cls, name="STARTUP_TIMELINE"):
+        target = os.environ.get(name)
+        if not target:
+            return cls()
+        if target == "-":
+            return cls(sys.stdout)
+        return cls(open(target, "a", encoding="utf-8"))
+
+    def now(self):
+        return (time.perf_counter() - STARTED) * 1000
+
+    def mark(self, event, cost=None):
+        # cost is how long the step itself took (ms), if it was measured
+        at = self.now()
+        self.events.append((at, event, cost))
+        if self.output is not None:
+            extra = "" if cost is None else f" ({cost:.1f} ms)"
+            self.output.write(f"{at:9.1f} ms  {event}{extra}\n")
+            self.output.flush()
+
+    def timed(self, event, step, *args):
+        # Runs step(*args), records how long it took and returns its result
+        start = time.perf_counter()
+        result = step(*args)
+        self.mark(event, (time.perf_counter() - start) * 1000)
+        return result
+
+    def close(self):
+        if self.output is not None and self.output is not sys.stdout:
+            self.output.close()
+        self.output = None
@@ -0,0 +1,250 @@
+import os
+import sys
+import sqlite3
+import numpy as np
+from contextlib import contextmanager
+
+from roster import Roster, RosterBatch, LoadReport, BATCH_SIZE, MARK_DTYPE, check_student
+from roster_binary import read_roster_file
+from journal import RosterJournal
+
+# STORAGE
+# Where the Add/Update/Delete pages save their changes. Both backends offer the same methods:
+#   add(student), update(record, **fields), delete(record), add_many(students), batch(),
+#   compact(), close()
+# Each change is made safe on disk first and then applied to the in-memory Roster.
+#
+# FileStorage    studentMarks.txt (or the binary form) plus the write-ahead journal
+# SQLiteStorage  a SQLite database (.db / .sqlite), saved with one transaction per edit or batch
+#
+# Either way the whole roster is loaded into memory and every page, index and statistic
+# reads it from there. SQLite is only where the edits are kept safe, not a query engine.
+
+DATABASE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+SQLITE_MAGIC = b"SQLite format 3\0"
+
+
+def is_database(filename):
+    try:
+        with open(filename, "rb") as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except FileNotFoundError:
+        return filename.lower().endswith(DATABASE_EXTENSIONS)
+
+def _student_row(student):
+    check_student(student)
+    marks = list(student["marks"])
+    return (str(student["id"]), str(student["name"]), *marks, int(student["exam"]))
+
+
+# TEXT / BINARY FILE + JOURNAL
+class FileStorage:
+    def __init__(self, filename, roster):
+        self.roster = roster
+        self.journal = RosterJournal(filename, roster)
+        self.journal.resume()
+
+    def add(self, student):
+        check_student(student) # An error here leaves nothing half saved
+        self.journal.log_add(student) # Written to disk first, then applied
+        record = self.roster.append(student)
+        self.journal.compact_if_due()
+        return record
+
+    def add_many(self, students):
+        students = list(students)
+        rows = [_student_row(student) for student in students] # Checked before any is logged
+        with self.journal.batch():
+            for student in students:
+                self.journal.log_add(student)
+        if rows:
+            ids, names, cw1, cw2, cw3, exams = zip(*rows)
+            self.roster.extend_columns(ids, names, list(zip(cw1, cw2, cw3)), exams)
+        self.journal.compact_if_due()
+
+    def update(self, record, **fields):
+        student = {key: fields.get(key, record[key]) for key in ("id", "name", "marks", "exam")}
+        check_student(student)
+        self.journal.log_update(self.roster.position_of(record), student)
+        record = self.roster.update(record, **fields)
+        self.journal.compact_if_due()
+        return record
+
+    def delete(self, record):
+        position = self.roster.position_of(record)
+        self.journal.log_delete(position)
+        removed = self.roster.pop(position)
+        self.journal.compact_if_due()
+        return removed
+
+    @contextmanager
+    def batch(self):
+        with self.journal.batch():
+            yield self
+        self.journal.compact_if_due() # Every edit in the block has reached the roster by now
+
+    def compact(self):
+        self.journal.compact()
+
+    def close(self):
+        self.journal.close()
+
+
+# SQLITE DATABASE
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    row INTEGER PRIMARY KEY AUTOINCREMENT, -- Never reused, also the display order
+    student_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    cw1 INTEGER NOT NULL,
+    cw2 INTEGER NOT NULL,
+    cw3 INTEGER NOT NULL,
+    exam INTEGER NOT NULL
+);
+"""
+
+COLUMNS = "row, student_id, name, cw1, cw2, cw3, exam"
+
+# The same statements are used every time, so sqlite3 keeps them prepared
+INSERT = "INSERT INTO students (student_id, name, cw1, cw2, cw3, exam) VALUES (?, ?, ?, ?, ?, ?)"
+UPDATE = "UPDATE students SET student_id = ?, name = ?, cw1 = ?, cw2 = ?, cw3 = ?, exam = ? WHERE row = ?"
+DELETE = "DELETE FROM students WHERE row = ?"
+
+
+def connect(filename, create=False):
+    if not create and not os.path.exists(filename):
+        raise FileNotFoundError(filename)
+    conn = sqlite3.connect(filename, cached_statements=64)
+    conn.execute("PRAGMA journal_mode = WAL") # A crash mid-save leaves the last committed state
+    conn.execute("PRAGMA synchronous = FULL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def iter_database_batches(filename, batch_size=BATCH_SIZE, report=None):
+    # Same as iter_roster_batches() for a database, in display order
+    if report is None:
+        report = LoadReport(filename)
+    conn = connect(filename)
+    try:
+        report.header_count = conn.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+        cursor = conn.execute(f"SELECT {COLUMNS} FROM students ORDER BY row")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            ids = np.array([row[1].encode("utf-8") for row in rows], dtype=bytes)
+            names = np.array([row[2].encode("utf-8") for row in rows], dtype=bytes)
+            numbers = np.array([row[3:] for row in rows], dtype=MARK_DTYPE)
+            yield RosterBatch(ids, names, numbers, report.rows_read + 1)
+            report.rows_read += len(rows)
+    finally:
+        conn.close()
+    report.finished = True
+
+def read_database(filename, report=None):
+    roster = Roster()
+    for batch in iter_database_batches(filename, report=report):
+        roster.add_batch(batch)
+    return roster
+
+
+class SQLiteStorage:
+    def __init__(self, filename, roster, create=False):
+        self.filename = filename
+        self.roster = roster
+        self.conn = connect(filename, create)
+        self._batch_depth = 0
+        # Roster slot -> table row. The roster holds the table's rows in order, and
+        # every row added to the roster later is the next row of the table
+        rows = [row for row, in self.conn.execute("SELECT row FROM students ORDER BY row LIMIT ?", (len(roster),))]
+        if len(rows) != len(roster):
+            raise ValueError(f"{filename} has fewer students than the roster")
+        self._rows = dict(zip(roster.slots().tolist(), rows))
+        self._last_row = rows[-1] if rows else 0
+        roster.subscribe(self)
+
+    # Roster listener methods
+    def rows_added(self, roster, slots):
+        rows = [row for row, in self.conn.execute("SELECT row FROM students WHERE row > ? ORDER BY row LIMIT ?",
+                                                  (self._last_row, len(slots)))]
+        if len(rows) != len(slots):
+            raise RuntimeError("students were added to the roster without being saved")
+        self._rows.update(zip(slots.tolist(), rows))
+        self._last_row = rows[-1]
+
+    def row_removed(self, roster, slot, old):
+        del self._rows[slot]
+
+    # SAVING
+    def _commit(self):
+        if not self._batch_depth:
+            self.conn.commit()
+
+    @contextmanager
+    def batch(self):
+        # Everything inside the with block is one transaction (one sync to disk)
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self._commit()
+
+    def add(self, student):
+        self.conn.execute(INSERT, _student_row(student))
+        self._commit()
+        return self.roster.append(student)
+
+    def add_many(self, students):
+        rows = [_student_row(student) for student in students]
+        with self.batch():
+            self.conn.executemany(INSERT, rows)
+        if rows:
+            ids, names, cw1, cw2, cw3, exams = zip(*rows)
+            self.roster.extend_columns(ids, names, list(zip(cw1, cw2, cw3)), exams)
+
+    def update(self, record, **fields):
+        student = {key: fields.get(key, record[key]) for key in ("id", "name", "marks", "exam")}
+        self.conn.execute(UPDATE, (*_student_row(student), self._rows[record.slot]))
+        self._commit()
+        return self.roster.update(record, **fields)
+
+    def delete(self, record):
+        self.conn.execute(DELETE, (self._rows[record.slot],))
+        self._commit()
+        return self.roster.remove(record)
+
+    def compact(self):
+        pass # SQLite folds its own write-ahead log back into the database
+
+    def close(self):
+        self.roster.unsubscribe(self)
+        self.conn.close()
+
+
+# IMPORTING A FILE INTO A DATABASE
+def import_roster(source, target):
+    # Copies studentMarks.txt (or its binary form) into a new or existing database
+    report = LoadReport(source)
+    ids, names, marks, exams = read_roster_file(source, report=report).snapshot()
+    conn = connect(target, create=True)
+    try:
+        for start in range(0, len(ids), BATCH_SIZE):
+            stop = start + BATCH_SIZE
+            rows = [(sid.decode("utf-8"), name.decode("utf-8"), *m, exam)
+                    for sid, name, m, exam in zip(ids[start:stop].tolist(), names[start:stop].tolist(),
+                                                  marks[start:stop].tolist(), exams[start:stop].tolist())]
+            with conn: # One transaction per batch
+                conn.executemany(INSERT, rows)
+    finally:
+        conn.close()
+    return report
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python storage.py <studentMarks file> <database>")
+    report = import_roster(sys.argv[1], sys.argv[2])
+    print(f"{report.rows_read} students imported into {sys.argv[2]}")
+    if report.errors or not report.count_matches:
+        print(report.summary())
@@ -0,0 +1,557 @@
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox
+from PIL import ImageTk
+from startup_timeline import StartupTimeline
+from image_cache import load_photo
+from roster import Roster, LoadReport, plan_list_updates
+from roster_binary import read_roster_file, iter_roster_file_batches
+from indexes import IdIndex, NamePrefixIndex, search_students
+from aggregates import RosterStats
+from sort_views import SORT_CHOICES
+from virtual_table import VirtualTable
+from journal import RosterJournal
+from storage import is_database, read_database, iter_database_batches
+
+# SHARED BY BOTH APPS
+# StudentManager.py (view only) and StudentManagerADD.py (view and edit) load the roster
+# the same way and show the same list, table, top 10 and statistics pages. Each app adds
+# its own menu (and, for StudentManagerADD.py, the pages that change students).
+
+# LOAD STUDENT DATA
+def default_roster_file():
+    # assets/studentMarks.txt next to the apps
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, "assets", "studentMarks.txt")
+
+def load_student_data(filename=None):
+    # A function that pretty much reads the text file that stores all the data/info of the students
+    if filename is None:
+        filename = default_roster_file()
+
+    report = LoadReport(filename)
+    try:
+        # Columnar roster: grades for every student are worked out in one vectorized pass.
+        # Each row still reads like the old dict (s["name"], s["percentage"], ...)
+        # The file may also be in the binary format (see roster_binary.py), which loads without parsing
+        if is_database(filename):
+            students = read_database(filename, report=report)
+        else:
+            students = read_roster_file(filename, report=report)
+    except FileNotFoundError:
+        # Show an error if the file is not found
+        messagebox.showerror("Error", f"File {filename} not found!")
+        return []
+    show_load_report(report)
+    if is_database(filename):
+        return students # SQLite keeps its own crash log, there is no journal to replay
+
+    # Edits saved to the journal but not yet folded into the file (e.g. after a crash)
+    journal = RosterJournal(filename)
+    if journal.has_pending():
+        try:
+            journal.replay(students)
+        except (ValueError, OverflowError):
+            # The file was changed by hand since; keep the old journal aside instead of applying it
+            os.replace(journal.path, journal.path + ".stale")
+            messagebox.showwarning("Student Data", "Unsaved edits no longer match the student file "
+                                   f"and were moved to {journal.path}.stale")
+    return students
+
+def stream_student_data(filename=None):
+    # Reads only the first batch of the file so the app can open straight away.
+    # Returns the roster so far plus the batches still to come (see StudentAppBase.load_in_background)
+    if filename is None:
+        filename = default_roster_file()
+
+    report = LoadReport(filename)
+    if is_database(filename):
+        batches = iter_database_batches(filename, report=report)
+    elif RosterJournal(filename).has_pending():
+        # The journal has to be replayed on top of the whole file, so load it all now.
+        # load_student_data() shows its own report, there is none left to show
+        return load_student_data(filename), iter(()), None
+    else:
+        batches = iter_roster_file_batches(filename, report=report)
+    students = Roster()
+    try:
+        first = next(batches, None)
+    except FileNotFoundError:
+        messagebox.showerror("Error", f"File {filename} not found!")
+        return students, iter(()), report
+    if first is not None:
+        students.add_batch(first)
+    return students, batches, report
+
+def show_load_report(report):
+    # Lets the user know about skipped lines or a wrong student count in the header
+    if report is None:
+        return
+    if report.errors or not report.count_matches:
+        messagebox.showwarning("Student Data", report.summary())
+
+
+# MAIN APPLICATION BASE
+class StudentAppBase(tk.Tk):
+    # Window, pages built on demand and loading in the background. Each app sets
+    # rank_index and sort_views, then calls show_first_page()
+    def __init__(self, students, pages, timeline=None, prewarm=True, size="724x650"):
+        super().__init__()
+        self.title("Student Management System")
+        self.geometry(size)
+        self.resizable(False, False)
+        self.students = students # To store the student data
+        self.id_index = IdIndex(students) # Student ID -> record
+        self.name_index = NamePrefixIndex(students) # Search by the start of a name
+        self.stats = RosterStats(students) # Running totals for the statistics page
+        self.current_page = None # Name of the page on top
+        self.pending_batches = None # Rest of the file while it is still loading
+        self.report = None
+
+        # School icon for the app
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        icon_path = os.path.join(base_dir, "assets", "icon.png")
+        self.iconphoto(False, ImageTk.PhotoImage(file=icon_path))
+
+        # Frame container
+        # Holds all pages stacked on top of each other
+        self.container = tk.Frame(self, bg="#4b1f24")
+        self.container.pack(fill="both", expand=True)
+
+        # PAGES
+        # Each page is only built the first time it is shown (see get_page), so the menu
+        # appears without waiting for the others. The rest are then built in idle time
+        self.timeline = timeline if timeline is not None else StartupTimeline()
+        self.prewarm = prewarm
+        self.frames = {} # Pages built so far
+        self.page_factories = {F.__name__: F for F in pages}
+
+    def show_first_page(self):
+        # Makes sure the menu page is shown first
+        self.show_frame("MenuPage")
+        self.frames["MenuPage"].bind("<Map>", self.on_first_frame)
+
+    # To switch to different pages
+    def show_frame(self, name):
+        self.get_page(name).tkraise() # tkraise() lifts the chosen page to the top to make it visible
+        self.current_page = name
+
+    # BUILDING PAGES ON DEMAND
+    def get_page(self, name, idle=False):
+        # The page with this class name, built now if it doesn't exist yet
+        page = self.frames.get(name)
+        if page is None:
+            event = f"built {name}" + (" in idle time" if idle else "")
+            page = self.timeline.timed(event, self.page_factories[name], self.container, self)
+            page.place(relwidth=1, relheight=1)
+            page.lower() # A new page would cover the current one until it is actually shown
+            self.frames[name] = page
+        return page
+
+    def on_first_frame(self, event):
+        self.frames["MenuPage"].unbind("<Map>")
+        self.after_idle(self.timeline.mark, "first frame on screen")
+        if self.prewarm:
+            self.after_idle(self.prewarm_pages)
+
+    def prewarm_pages(self):
+        # Builds one missing page per idle moment, so clicks in between are still handled
+        for name in self.page_factories:
+            if name not in self.frames:
+                self.get_page(name, idle=True)
+                self.after(1, self.after_idle, self.prewarm_pages)
+                return
+        self.timeline.mark("all pages built")
+
+    # LOADING IN THE BACKGROUND
+    # One batch is added per event loop tick, so the first students show up straight away
+    def load_in_background(self, batches, report):
+        self.pending_batches = batches
+        self.report = report
+        self.after_idle(self.load_next_batch)
+
+    def load_next_batch(self):
+        if self.pending_batches is None:
+            return
+        batch = next(self.pending_batches, None)
+        if batch is None:
+            self.pending_batches = None
+            self.timeline.mark(f"all {len(self.students)} students loaded")
+            show_load_report(self.report)
+            return
+        start = len(self.students)
+        self.students.add_batch(batch)
+        # Only the page on screen needs the new rows now, the others refresh when raised
+        page = self.frames[self.current_page]
+        if hasattr(page, "show_more"):
+            page.show_more(start)
+        self.after(1, self.load_next_batch)
+
+    def finish_loading(self):
+        # Reads whatever is left of the file before anything needs the full roster
+        if self.pending_batches is None:
+            return
+        for batch in self.pending_batches:
+            self.students.add_batch(batch)
+        self.pending_batches = None
+        show_load_report(self.report)
+
+
+# PAGE HEADER
+def add_header(parent):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    # All pages contain the same header image for uniformity
+    header_path = os.path.join(script_dir, "assets", "header.png")
+    photo = load_photo(header_path, (724, 200)) # Resized once and shared by every page (see image_cache.py)
+
+    label = tk.Label(parent, image=photo, bg="#4b1f24")
+    label.image = photo
+    label.pack(fill="x")
+
+
+# STUDENT LIST PAGES
+class StudentListPage(tk.Frame):
+    # Base for the pages that pick a student from a Listbox of "ID - Name" rows.
+    # The search bar uses the ID and name indexes (see indexes.py) instead of scanning the roster
+    def add_student_list(self, height):
+        search_frame = tk.Frame(self, bg="#4b1f24")
+        search_frame.pack()
+        tk.Label(search_frame, text="Search ID / Name:", fg="white", bg="#4b1f24").pack(side="left")
+        self.search_entry = tk.Entry(search_frame, width=25)
+        self.search_entry.pack(side="left", padx=5)
+        self.search_entry.bind("<Return>", lambda event: self.refresh_list())
+        tk.Button(search_frame, text="Search", cursor="hand2", bg="white", fg="#4b1f24",
+                command=self.refresh_list).pack(side="left")
+        tk.Button(search_frame, text="Clear", cursor="hand2", bg="white", fg="#4b1f24",
+                command=self.clear_search).pack(side="left", padx=5)
+
+        self.listbox = tk.Listbox(self, width=50, height=height)
+        self.listbox.pack(pady=10)
+        self.matches = None # Slots shown after a search, None means the whole roster
+        self.rendered_version = None # Roster version the Listbox currently shows
+
+    def tkraise(self, *args, **kwargs):
+        # This refreshes the Listbox to show the updated student names
+        self.refresh_list()
+        super().tkraise(*args, **kwargs)
+
+    def refresh_list(self):
+        text = self.search_entry.get().strip()
+        if not text:
+            if self.matches is not None:
+                self.matches = None
+                self.rendered_version = None # Search results on screen, redraw everything
+            self.sync_list()
+            return
+        self.controller.finish_loading() # Search the whole roster, not just what has loaded
+        self.matches = search_students(self.controller.id_index, self.controller.name_index, text)
+        self.listbox.delete(0, tk.END)
+        for slot in self.matches:
+            s = self.controller.students.record(slot)
+            self.listbox.insert(tk.END, f"{s['id']} - {s['name']}")
+
+    def clear_search(self):
+        self.search_entry.delete(0, tk.END)
+        self.refresh_list()
+
+    def show_more(self, start):
+        # New rows arrived while the file is loading
+        if self.matches is None:
+            self.sync_list()
+
+    def sync_list(self):
+        # Replays only the roster changes since the Listbox was last drawn (nothing if none)
+        students = self.controller.students
+        changes = None if self.rendered_version is None else students.changes_since(self.rendered_version)
+        plan = None if changes is None else plan_list_updates(changes)
+        if plan is None:
+            self.listbox.delete(0, tk.END)
+            runs = [[0, len(students)]] if len(students) else []
+        else:
+            steps, runs = plan
+            for kind, position, count in steps:
+                if kind == "insert":
+                    self.listbox.insert(position, *[""] * count)
+                else:
+                    self.listbox.delete(position)
+        for start, stop in runs:
+            self.listbox.delete(start, stop - 1)
+            self.listbox.insert(start, *[f"{s['id']} - {s['name']}" for s in students[start:stop]])
+        self.rendered_version = students.version
+
+    def selected_student(self):
+        # The student picked in the Listbox, or None
+        sel = self.listbox.curselection()
+        if not sel:
+            return None
+        if self.matches is None:
+            return self.controller.students[sel[0]]
+        return self.controller.students.record(self.matches[sel[0]])
+
+
+# ALL STUDENTS PAGE
+class AllStudentsPage(tk.Frame):
+    # I use ttk.Treeview to display info in a table
+    # Info derived from PythonTutorial and GeeksforGeeks
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#4b1f24")
+        self.controller = controller
+
+        add_header(self)
+
+        tk.Label(self, text="All Student Records",
+                font=("Georgia", 22, "bold"),
+                bg="#4b1f24", fg="white").pack(pady=10)
+        
+        # Table columns to show complete info to user
+        columns = (
+            "Student ID", "Name", "Coursework Total",
+            "Exam Score", "Overall Percentage", "Grade"
+        )
+
+        # Spreadsheet/table widget
+        # Only the visible rows are ever put in the Treeview (see virtual_table.py)
+        self.table = VirtualTable(self, columns, row_count=lambda: len(self.controller.students),
+                                  fetch_rows=self.fetch_rows, height=10, width=116, bg="#4b1f24")
+        self.table.pack(pady=10)
+
+        # Sorting only changes how the table reads the roster, never the roster or the file
+        self.sort_key = None
+        sort_frame = tk.Frame(self, bg="#4b1f24")
+        sort_frame.pack()
+        tk.Label(sort_frame, text="Sort by:", fg="white", bg="#4b1f24").pack(side="left")
+        self.sort_choice = tk.StringVar(value="File order")
+        tk.OptionMenu(sort_frame, self.sort_choice, *SORT_CHOICES,
+                command=lambda label: self.set_sort(SORT_CHOICES[label])).pack(side="left", padx=5)
+
+        # Button to let user return to the menu/previous page
+        tk.Button(self, text="Back to Menu", width=20,
+                bg="white", fg="#4b1f24", cursor="hand2",
+                command=lambda: controller.show_frame("MenuPage")).pack(pady=10)
+
+    # To update table every time page is shown. Only the visible window is redrawn
+    def tkraise(self, *args, **kwargs):
+        self.table.refresh()
+        super().tkraise(*args, **kwargs)
+
+    # Called while the file is still loading; new rows only matter if they are on screen
+    def show_more(self, start):
+        self.table.refresh()
+
+    def set_sort(self, key):
+        # key is one of the SORT_CHOICES values (see sort_views.py); None shows file order
+        if key is not None:
+            self.controller.finish_loading() # Sort the whole roster, not just what has loaded
+        self.sort_key = key
+        labels = [label for label, value in SORT_CHOICES.items() if value == key]
+        if labels:
+            self.sort_choice.set(labels[0])
+        self.table.scroll_to(0)
+        self.table.refresh()
+
+    # Formats just the rows the table asks for, color-coded by grade
+    def fetch_rows(self, start, stop):
+        if self.sort_key is None:
+            students = self.controller.students[start:stop]
+        else:
+            students = self.controller.sort_views.records(self.sort_key, start, stop)
+        return [((s["id"], s["name"], s["coursework_total"], s["exam"],
+                  f"{s['percentage']:.2f}%", s["grade"]), f"grade{s['grade']}")
+                for s in students]
+
+
+# SELECT STUDENT PAGE
+class SelectStudentPage(StudentListPage):
+    # Listbox is used in order to allow user to pick a student (Single)
+    # Idea and info gathered from GeeksforGeeks & PythonTutorial
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#4b1f24")
+        self.controller = controller
+
+        add_header(self)
+
+        tk.Label(self, text="Select a Student",
+                font=("Georgia", 22, "bold"),
+                bg="#4b1f24", fg="white").pack(pady=10)
+
+        # Contains a list of students with their ID number
+        self.add_student_list(height=10)
+
+        # Buttons to proceed or return to the page
+        tk.Button(self, text="View Student Record", cursor="hand2",
+                bg="white", fg="#4b1f24",
+                command=self.view_student).pack(pady=5)
+
+        tk.Button(self, text="Back to Menu", cursor="hand2",
+                bg="white", fg="#4b1f24",
+                command=lambda: controller.show_frame("MenuPage")).pack(pady=5)
+
+    # This shows the info of the selected student
+    def view_student(self):
+        student = self.selected_student()
+        if student is None:
+            messagebox.showinfo("Attention", "Please choose a student.")
+            return
+        self.controller.get_page("StudentDetailPage").set_student(student)
+        self.controller.show_frame("StudentDetailPage")
+
+
+# STUDENT DETAIL PAGE
+class StudentDetailPage(tk.Frame):
+    # To show user the data for the student they've chosen in a small table
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#4b1f24")
+        self.controller = controller
+
+        add_header(self)
+
+        tk.Label(self, text="Student Record",
+                font=("Georgia", 22, "bold"),
+                bg="#4b1f24", fg="white").pack(pady=10)
+
+        cols = ("Attribute", "Value")
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=6)
+        self.tree.heading("Attribute", text="Attribute")
+        self.tree.heading("Value", text="Value")
+        self.tree.column("Attribute", width=150, anchor="center")
+        self.tree.column("Value", width=200, anchor="center")
+        self.tree.pack(pady=20)
+
+        tk.Button(self, text="Back to Menu",
+                cursor="hand2", bg="white", fg="#4b1f24",
+                command=lambda: controller.show_frame("MenuPage")).pack(pady=10)
+
+    # Display data for chosen student (single)
+    def set_student(self, s):
+        # Clears old data and inserts the info of the new student
+        self.tree.delete(*self.tree.get_children())
+        grade_colors = {
+            "A": "#a8e6cf",
+            "B": "#dcedc1",
+            "C": "#fff9b0",
+            "D": "#ffd3b6",
+            "F": "#ff8b94"
+        }
+
+        data = [
+            ("Name", s["name"]),
+            ("Student ID", s["id"]),
+            ("Coursework Total", s["coursework_total"]),
+            ("Exam Mark", s["exam"]),
+            ("Overall Percentage", f"{s['percentage']:.2f}%"),
+            ("Grade", s["grade"]),
+        ]
+
+        for attr, value in data:
+            self.tree.insert("", tk.END, values=(attr, value))
+            # Grade row will only be colored to highlight the final grade
+            if attr == "Grade":
+                item = self.tree.get_children()[-1]
+                self.tree.tag_configure("grade", background=grade_colors.get(value, "white"))
+                self.tree.item(item, tags=("grade",))
+
+
+# TOP STUDENTS PAGE
+class TopStudentsPage(tk.Frame):
+    # The 10 students with the highest overall percentage, read from the rank index
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#4b1f24")
+        self.controller = controller
+
+        add_header(self)
+
+        tk.Label(self, text="Top 10 Students",
+                font=("Georgia", 22, "bold"), bg="#4b1f24", fg="white").pack(pady=10)
+        self.rendered_version = None
+
+        columns = ("Rank", "Student ID", "Name", "Overall Percentage", "Grade")
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=10)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor="center", width=60 if col == "Rank" else 140)
+        self.tree.pack(pady=10)
+
+        # One tag per grade, shared by every row with that grade
+        grade_colors = {'A':'#a8e6cf','B':'#dcedc1','C':'#fff9b0','D':'#ffd3b6','F':'#ff8b94'}
+        for grade, color in grade_colors.items():
+            self.tree.tag_configure(f"grade{grade}", background=color)
+
+        tk.Button(self, text="Back to Menu", width=20, cursor="hand2", bg="white", fg="#4b1f24",
+                command=lambda: controller.show_frame("MenuPage")).pack(pady=10)
+
+    def tkraise(self, *args, **kwargs):
+        self.controller.finish_loading()
+        # Nothing to redraw if the roster hasn't changed since last time
+        if self.rendered_version != self.controller.students.version:
+            self.tree.delete(*self.tree.get_children())
+            for rank, s in enumerate(self.controller.rank_index.top(10), 1):
+                self.tree.insert("", tk.END, tags=(f"grade{s['grade']}",), values=(
+                    rank, s['id'], s['name'], f"{s['percentage']:.2f}%", s['grade']
+                ))
+            self.rendered_version = self.controller.students.version
+        super().tkraise(*args, **kwargs)
+
+
+# STATISTICS PAGE
+class StatisticsPage(tk.Frame):
+    # Class-wide figures, read from running totals (see aggregates.py) so they show instantly
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#4b1f24")
+        self.controller = controller
+
+        add_header(self)
+
+        tk.Label(self, text="Class Statistics",
+                font=("Georgia", 22, "bold"), bg="#4b1f24", fg="white").pack(pady=10)
+
+        cols = ("Statistic", "Value")
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=15)
+        for col in cols:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=220, anchor="center")
+        self.tree.pack(pady=10)
+
+        # One row per figure, created once and only given new values afterwards
+        self.rows = {}
+        grade_colors = {'A':'#a8e6cf','B':'#dcedc1','C':'#fff9b0','D':'#ffd3b6','F':'#ff8b94'}
+        for label in ("Students", "Mean Percentage", "Standard Deviation", "Highest Percentage",
+                      "Lowest Percentage", "Average Coursework 1", "Average Coursework 2",
+                      "Average Coursework 3", "Average Coursework Total", "Average Exam Mark"):
+            self.rows[label] = self.tree.insert("", tk.END, values=(label, ""))
+        for grade, color in grade_colors.items():
+            self.tree.tag_configure(f"grade{grade}", background=color)
+            self.rows[f"Grade {grade}"] = self.tree.insert("", tk.END, tags=(f"grade{grade}",),
+                                                         values=(f"Grade {grade}", ""))
+
+        tk.Button(self, text="Back to Menu", width=20, cursor="hand2", bg="white", fg="#4b1f24",
+                command=lambda: controller.show_frame("MenuPage")).pack(pady=10)
+
+    def tkraise(self, *args, **kwargs):
+        self.refresh()
+        super().tkraise(*args, **kwargs)
+
+    # Called while the file is still loading, so the figures grow with it
+    def show_more(self, start):
+        self.refresh()
+
+    def refresh(self):
+        stats = self.controller.stats
+        count = stats.students()
+        figures = {"Students": count}
+        if count:
+            averages = stats.averages()
+            figures.update({
+                "Mean Percentage": f"{stats.mean_percentage():.2f}%",
+                "Standard Deviation": f"{stats.std_percentage():.2f}%",
+                "Highest Percentage": f"{stats.highest_percentage():.2f}%",
+                "Lowest Percentage": f"{stats.lowest_percentage():.2f}%",
+                "Average Coursework 1": f"{averages['cw1']:.2f}",
+                "Average Coursework 2": f"{averages['cw2']:.2f}",
+                "Average Coursework 3": f"{averages['cw3']:.2f}",
+                "Average Coursework Total": f"{averages['coursework_total']:.2f}",
+                "Average Exam Mark": f"{averages['exam']:.2f}",
+            })
+            for grade, n in stats.grade_counts().items():
+                figures[f"Grade {grade}"] = f"{n} ({n / count * 100:.1f}%)"
+        for label, item in self.rows.items():
+            self.tree.item(item, values=(label, figures.get(label, "-")))
@@ -0,0 +1,39 @@
+import os
+import sys
+import random
+import pytest
+
+# The modules sit next to this folder, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roster import Roster
+
+
+def random_student(rng, i):
+    # Few distinct scores and names, so there are plenty of ties
+    return {"id": str(10000 + i), "name": rng.choice(["ada", "Bob", "cy", "Dee", "eve"]) + f" {i % 7}",
+            "marks": [rng.randint(0, 20) for _ in range(3)], "exam": rng.randint(0, 100)}
+
+def random_edits(roster, rng, count, start=1000):
+    # A mix of adds, updates and deletes, the way the pages make them
+    for i in range(start, start + count):
+        action = rng.random()
+        if action < 0.5 or len(roster) < 2:
+            roster.append(random_student(rng, i))
+        elif action < 0.8:
+            changes = random_student(rng, i)
+            del changes["id"]
+            roster.update(roster[rng.randrange(len(roster))], **changes)
+        else:
+            roster.pop(rng.randrange(len(roster)))
+
+@pytest.fixture
+def edit_randomly():
+    return random_edits
+
+@pytest.fixture
+def make_roster():
+    def make(n, seed=0):
+        rng = random.Random(seed)
+        return Roster.from_records(random_student(rng, i) for i in range(n)), rng
+    return make
@@ -0,0 +1,37 @@
+import pytest
+
+from aggregates import RosterStats
+from roster import GRADES
+
+
+def check(stats, roster):
+    percentage = roster.column("percentage")
+    assert stats.students() == len(roster)
+    assert stats.mean_percentage() == pytest.approx(percentage.mean())
+    assert stats.std_percentage() == pytest.approx(percentage.std())
+    assert stats.highest_percentage() == pytest.approx(percentage.max())
+    assert stats.lowest_percentage() == pytest.approx(percentage.min())
+    grades = roster.column("grade").tolist()
+    assert stats.grade_counts() == {grade: grades.count(grade) for grade in GRADES}
+    marks = roster.column("marks")
+    averages = stats.averages()
+    assert [averages["cw1"], averages["cw2"], averages["cw3"]] == pytest.approx(marks.mean(axis=0).tolist())
+    assert averages["exam"] == pytest.approx(roster.column("exam").mean())
+    assert averages["coursework_total"] == pytest.approx(roster.column("coursework_total").mean())
+
+def test_running_totals_match_a_rescan(make_roster, edit_randomly):
+    roster, rng = make_roster(50)
+    stats = RosterStats(roster)
+    check(stats, roster)
+    for _ in range(5):
+        edit_randomly(roster, rng, 40)
+        check(stats, roster)
+
+def test_empty_roster_has_no_figures(make_roster):
+    roster, _ = make_roster(1)
+    stats = RosterStats(roster)
+    stats.students()
+    roster.pop()
+    assert stats.students() == 0
+    assert stats.mean_percentage() is None and stats.highest_percentage() is None
+    assert stats.averages() is None
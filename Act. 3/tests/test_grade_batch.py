@@ -0,0 +1,65 @@
+import json
+import pytest
+
+from grade_batch import main, summarize_roster
+from journal import RosterJournal
+
+
+MARKS = ("4\n"
+         "1000,Ada,20,20,20,100\n" # 100% A
+         "1001,Bob,10,10,10,50\n" # 50% C
+         "1002,Cy,1,1,1,1\n" # 2.5% F
+         "1003,Dee,20,20,20,100\n") # 100% A, ties with Ada
+
+
+def write(folder, name, text=MARKS):
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / name
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+def test_summary_counts_grades_and_finds_the_extremes(tmp_path):
+    summary = summarize_roster(write(tmp_path, "marks.txt"))
+    assert summary["students"] == 4 and summary["error"] == "" and summary["skipped_lines"] == 0
+    assert [summary[grade] for grade in "ABCDF"] == [2, 0, 1, 0, 1]
+    assert (summary["highest_id"], summary["highest_percentage"]) == ("1000", 100.0) # First of the tie
+    assert (summary["lowest_id"], summary["lowest_name"], summary["lowest_percentage"]) == ("1002", "Cy", 2.5)
+    assert summary["mean_percentage"] == round((100 + 50 + 2.5 + 100) / 4, 2)
+
+def test_edits_waiting_in_the_journal_are_counted(tmp_path):
+    path = write(tmp_path, "marks.txt")
+    journal = RosterJournal(path)
+    journal.log_add({"id": "1004", "name": "Eve", "marks": [0, 0, 0], "exam": 0})
+    journal.log_delete(0) # The app is still open, or crashed: nothing folded into the file yet
+    summary = summarize_roster(path)
+    assert summary["students"] == 4 and summary["F"] == 2
+    assert summary["highest_id"] == "1003" and summary["lowest_id"] == "1004"
+    with open(path + ".journal", encoding="utf-8") as f:
+        assert len(f.readlines()) == 3 # Left as it was
+
+def test_a_journal_for_another_file_is_refused(tmp_path):
+    path = write(tmp_path, "marks.txt")
+    RosterJournal(path).log_delete(0)
+    write(tmp_path, "marks.txt", MARKS + "1004,Eve,0,0,0,0\n") # Changed after the journal was started
+    summary = summarize_roster(path)
+    assert summary["students"] == "" and "does not belong" in summary["error"]
+
+def test_a_bad_file_does_not_stop_the_batch(tmp_path, capsys):
+    good = write(tmp_path, "a.txt")
+    other = write(tmp_path, "c.txt", "1\n1000,Ada,1,2,3,4\n")
+    missing = str(tmp_path / "b.txt")
+    assert main([good, missing, other, "--format", "json", "--workers", "1"]) == 1
+    assert "b.txt" in capsys.readouterr().err
+    with open(good + ".summary.json", encoding="utf-8") as f:
+        assert json.load(f)["students"] == 4
+    with open(other + ".summary.json", encoding="utf-8") as f:
+        assert json.load(f)["students"] == 1
+
+def test_summaries_that_would_overwrite_each_other_are_refused(tmp_path):
+    first = write(tmp_path / "term1", "a.txt")
+    second = write(tmp_path / "term2", "a.txt")
+    out = tmp_path / "out"
+    with pytest.raises(SystemExit):
+        main([first, second, "--out", str(out)])
+    assert not out.exists()
+    assert main([first, second]) == 0 # Next to each roster they don't clash
@@ -0,0 +1,71 @@
+import os
+import pytest
+from PIL import Image
+
+import image_cache
+from image_cache import CACHE_DIR, clear, load_image
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear()
+    yield
+    clear()
+
+def make_header(tmp_path, color=(10, 20, 30)):
+    path = tmp_path / "header.png"
+    Image.new("RGB", (60, 20), color).save(path)
+    return str(path)
+
+def cached_files(tmp_path):
+    return sorted(os.listdir(tmp_path / CACHE_DIR))
+
+def record_opens(monkeypatch):
+    # Names of the image files opened from now on (a saved copy is a different file from the source)
+    opened = []
+    real_open = Image.open
+    def open_image(path, *args, **kwargs):
+        img = real_open(path, *args, **kwargs) # A copy that isn't there yet raises and isn't counted
+        opened.append(os.path.basename(path))
+        return img
+    monkeypatch.setattr(image_cache.Image, "open", open_image)
+    return opened
+
+def test_a_miss_resizes_once_and_saves_a_copy(tmp_path, monkeypatch):
+    opened = record_opens(monkeypatch)
+    path = make_header(tmp_path)
+    img = load_image(path, (30, 10))
+    assert img.size == (30, 10) and img.getpixel((5, 5)) == (10, 20, 30)
+    assert opened == ["header.png"]
+    assert len(cached_files(tmp_path)) == 1
+
+def test_a_hit_shares_the_image_in_memory_then_on_disk(tmp_path, monkeypatch):
+    path = make_header(tmp_path)
+    img = load_image(path, (30, 10))
+    opened = record_opens(monkeypatch)
+    assert load_image(path, (30, 10)) is img # Same process: no file opened at all
+    assert opened == []
+    clear() # Next launch
+    again = load_image(path, (30, 10))
+    assert opened == cached_files(tmp_path) # Only the saved copy was read
+    assert again.tobytes() == img.tobytes()
+
+def test_a_changed_source_makes_a_new_copy(tmp_path, monkeypatch):
+    path = make_header(tmp_path)
+    load_image(path, (30, 10))
+    old = cached_files(tmp_path)
+    make_header(tmp_path, color=(200, 100, 0))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9)) # Even if saved within the same tick
+    clear()
+    opened = record_opens(monkeypatch)
+    img = load_image(path, (30, 10))
+    assert opened == ["header.png"]
+    assert img.getpixel((5, 5)) == (200, 100, 0)
+    assert len(cached_files(tmp_path)) == 1 and cached_files(tmp_path) != old # The stale copy is gone
+
+def test_each_size_is_its_own_entry(tmp_path):
+    path = make_header(tmp_path)
+    assert load_image(path, (30, 10)).size == (30, 10)
+    assert load_image(path, (12, 4)).size == (12, 4)
+    assert len(cached_files(tmp_path)) == 2
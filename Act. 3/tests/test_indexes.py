@@ -0,0 +1,41 @@
+from indexes import IdIndex, NamePrefixIndex, search_students
+
+
+def test_id_index_follows_edits(make_roster):
+    roster, _ = make_roster(10)
+    index = IdIndex(roster)
+    assert index.get("10003")["id"] == "10003"
+    roster.update(roster[3], id="renamed")
+    roster.pop(0)
+    roster.append({"id": "new", "name": "N", "marks": [1, 1, 1], "exam": 1})
+    assert "10003" not in index and "10000" not in index
+    assert index.get("renamed") == roster[2]
+    assert index.get("new") == roster[-1]
+    assert index.get("missing") is None
+
+def test_id_index_keeps_duplicates_from_the_file(make_roster):
+    roster, _ = make_roster(3)
+    roster.update(roster[2], id="10000")
+    index = IdIndex(roster)
+    assert index.duplicate_ids() == ["10000"]
+    roster.pop(0)
+    assert index.get("10000") == roster[1] # The repeat takes over
+    assert index.duplicate_ids() == []
+
+def test_name_prefix_index_ignores_case_and_follows_edits(make_roster, edit_randomly):
+    roster, rng = make_roster(60)
+    index = NamePrefixIndex(roster)
+    index.search("") # Built before the edits, then kept up to date by them
+    edit_randomly(roster, rng, 200)
+    for prefix in ("a", "B", "cy 3", "DEE", "zz"):
+        expected = sorted((s["name"].casefold(), s.slot) for s in roster
+                          if s["name"].casefold().startswith(prefix.casefold()))
+        assert sorted(index.search(prefix)) == sorted(slot for _, slot in expected)
+        assert [roster.record(slot)["name"].casefold() for slot in index.search(prefix)] == [name for name, _ in expected]
+    assert len(index.search("", limit=5)) == 5
+
+def test_search_puts_an_exact_id_first(make_roster):
+    roster, _ = make_roster(5)
+    roster.update(roster[4], name="10001 is also a name")
+    found = search_students(IdIndex(roster), NamePrefixIndex(roster), " 10001 ")
+    assert found == [roster[1].slot, roster[4].slot]
@@ -0,0 +1,116 @@
+import os
+import pytest
+
+from journal import RosterJournal
+from roster_binary import read_roster_file
+from storage import FileStorage
+
+
+@pytest.fixture
+def marks_file(tmp_path):
+    path = tmp_path / "studentMarks.txt"
+    path.write_bytes(b"1\n1000,Ada Byron,10,11,12,80\n")
+    return str(path)
+
+def student(i):
+    return {"id": str(2000 + i), "name": f"Student {i}", "marks": [i % 20, 5, 6], "exam": 50 + i}
+
+def open_storage(filename, compact_every=3):
+    roster = read_roster_file(filename)
+    storage = FileStorage(filename, roster)
+    storage.journal.compact_every = compact_every
+    return roster, storage
+
+def load(filename):
+    # What the app does on the next launch: the file, then whatever the journal holds
+    roster = read_roster_file(filename)
+    journal = RosterJournal(filename)
+    if journal.has_pending():
+        journal.replay(roster)
+    return roster
+
+def ids(roster):
+    return [record["id"] for record in roster]
+
+def settle(storage):
+    # Lets a background compaction finish, as it would between two clicks in the app
+    if storage.journal._compactor is not None:
+        storage.journal._compactor.join()
+
+
+def test_adds_survive_compaction_and_close(marks_file):
+    roster, storage = open_storage(marks_file)
+    for i in range(12):
+        storage.add(student(i))
+        settle(storage)
+    storage.close()
+    assert len(roster) == 13
+    assert ids(load(marks_file)) == ids(roster)
+    assert not os.path.exists(marks_file + ".journal")
+
+def test_adds_survive_compaction_and_crash(marks_file):
+    roster, storage = open_storage(marks_file)
+    for i in range(13):
+        storage.add(student(i))
+        settle(storage)
+    # Crash here, without close()
+    assert ids(load(marks_file)) == ids(roster)
+
+def test_updates_deletes_and_batches_survive_compaction(marks_file):
+    roster, storage = open_storage(marks_file)
+    storage.add_many(student(i) for i in range(5))
+    storage.update(roster[2], name="Renamed", exam=99)
+    storage.delete(roster[0])
+    with storage.batch():
+        storage.add(student(10))
+        storage.add(student(11))
+    storage.delete(roster[-1])
+    settle(storage)
+    reloaded = load(marks_file)
+    assert [record.to_dict() for record in reloaded] == [record.to_dict() for record in roster]
+    storage.close()
+    assert [record.to_dict() for record in load(marks_file)] == [record.to_dict() for record in roster]
+
+def test_replay_stops_at_a_torn_line(marks_file):
+    roster, storage = open_storage(marks_file, compact_every=100)
+    storage.add(student(1))
+    storage.add(student(2))
+    with open(marks_file + ".journal", "a", encoding="utf-8") as f:
+        f.write("A,3000,Half writ") # The crash happened mid-write
+    reloaded = read_roster_file(marks_file)
+    journal = RosterJournal(marks_file)
+    assert journal.replay(reloaded) == 2
+    assert journal.skipped == 1
+    assert ids(reloaded) == ids(roster)
+
+def test_sort_entries_from_old_journals_still_replay(marks_file):
+    roster, storage = open_storage(marks_file, compact_every=100)
+    storage.add(student(1))
+    storage.add(student(2))
+    storage.journal._append(["S", "exam", 1]) # Written by a version that still logged sorts
+    assert ids(load(marks_file)) == ["1000", "2002", "2001"]
+
+def test_out_of_range_mark_is_rejected_before_saving(marks_file):
+    roster, storage = open_storage(marks_file, compact_every=100)
+    with pytest.raises(ValueError):
+        storage.add({"id": "3000", "name": "Too High", "marks": [1, 2, 3], "exam": 100000})
+    with pytest.raises(ValueError):
+        storage.update(roster[0], marks=[100000, 0, 0])
+    with pytest.raises(ValueError):
+        storage.add_many([student(1), {"id": "3001", "name": "Too Low", "marks": [-40000, 0, 0], "exam": 1}])
+    assert len(roster) == 1
+    assert not RosterJournal(marks_file).has_pending()
+
+def test_replay_rejects_an_out_of_range_entry(marks_file):
+    RosterJournal(marks_file).log_add({"id": "3000", "name": "Too High", "marks": [1, 2, 3], "exam": 100000})
+    with pytest.raises(ValueError):
+        RosterJournal(marks_file).replay(read_roster_file(marks_file))
+
+def test_commas_in_id_or_name_are_rejected_before_saving(marks_file):
+    roster, storage = open_storage(marks_file, compact_every=1)
+    with pytest.raises(ValueError):
+        storage.add({"id": "3000", "name": "Smith, Jo", "marks": [1, 2, 3], "exam": 4})
+    with pytest.raises(ValueError):
+        storage.update(roster[0], id="10,00")
+    assert ids(roster) == ["1000"]
+    assert not RosterJournal(marks_file).has_pending()
@@ -0,0 +1,62 @@
+import pytest
+
+from ranking import RankIndex
+from roster import Roster
+
+
+def by_score(roster):
+    # Slots lowest score first, ties by slot (the order select() takes them in)
+    return sorted((s["coursework_total"] + s["exam"], s.slot) for s in roster)
+
+def check(index, roster):
+    expected = by_score(roster)
+    n = len(expected)
+    # The old pages: max()/min() and a stable sort over the list, so ties go to the first shown
+    assert index.lowest().slot == min(roster, key=lambda s: s["percentage"]).slot
+    assert index.highest().slot == max(roster, key=lambda s: s["percentage"]).slot
+    for k in range(n):
+        assert index.select(k)["percentage"] == roster.record(expected[k][1])["percentage"]
+    top = sorted(roster, key=lambda s: s["percentage"], reverse=True)[:10]
+    assert [s.slot for s in index.top(10)] == [s.slot for s in top]
+    assert index.median()["percentage"] == index.select((n - 1) // 2)["percentage"]
+    some = roster[n // 3]
+    assert index.rank(some) == sum(score < some["coursework_total"] + some["exam"] for score, _ in expected)
+
+def test_rank_index_matches_a_full_sort_after_edits(make_roster, edit_randomly):
+    roster, rng = make_roster(80)
+    index = RankIndex(roster)
+    check(index, roster)
+    for _ in range(5):
+        edit_randomly(roster, rng, 40)
+        check(index, roster)
+    check(RankIndex(roster), roster) # Built from scratch gives the same answers
+
+def test_a_tie_goes_to_the_first_shown_after_a_delete_and_an_add():
+    student = lambda i, exam: {"id": str(i), "name": f"S{i}", "marks": [1, 1, 1], "exam": exam}
+    roster = Roster.from_records([student(0, 50), student(1, 90), student(2, 10)])
+    index = RankIndex(roster)
+    index.highest()
+    roster.pop(0)
+    roster.append(student(3, 90)) # Reuses slot 0 but is shown last
+    roster.append(student(4, 10))
+    assert roster[-2].slot == 0
+    assert index.highest()["id"] == "1"
+    assert index.lowest()["id"] == "2"
+    assert [s["id"] for s in index.top(3)] == ["1", "3", "2"]
+
+def test_rank_index_on_an_empty_roster(make_roster):
+    roster, _ = make_roster(1)
+    index = RankIndex(roster)
+    roster.pop()
+    assert index.highest() is None and index.lowest() is None and index.median() is None
+    assert index.top(10) == [] and index.percentile(50) is None
+    with pytest.raises(IndexError):
+        index.select(0)
+
+def test_percentile_is_nearest_rank(make_roster):
+    roster, _ = make_roster(10)
+    index = RankIndex(roster)
+    expected = by_score(roster)
+    assert index.percentile(0).slot == index.select(0).slot
+    assert index.percentile(100).slot == index.select(9).slot
+    assert index.percentile(25)["percentage"] == roster.record(expected[2][1])["percentage"]
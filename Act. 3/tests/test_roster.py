@@ -0,0 +1,91 @@
+import pytest
+
+from roster import CHANGE_LOG_SIZE, LoadReport, plan_list_updates, read_roster_text
+
+
+def write(tmp_path, text):
+    path = tmp_path / "studentMarks.txt"
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def test_reads_a_well_formed_file(tmp_path):
+    report = LoadReport()
+    roster = read_roster_text(write(tmp_path, "2\n1000,Ada,10,11,12,80\n1001,Bob,1,2,3,40\n"), report)
+    assert [record["id"] for record in roster] == ["1000", "1001"]
+    assert roster[0]["coursework_total"] == 33
+    assert roster[0]["percentage"] == pytest.approx(113 / 160 * 100)
+    assert roster[0]["grade"] == "A"
+    assert roster[1]["grade"] == "F"
+    assert not report.errors and report.count_matches
+
+@pytest.mark.parametrize("bad", ["1.5", "", "z", "99999"])
+def test_bad_marks_are_reported_not_fatal(tmp_path, bad):
+    report = LoadReport()
+    roster = read_roster_text(write(tmp_path, f"3\n1000,Ada,10,11,12,80\n1001,Bob,{bad},2,3,40\n1002,Cy,1,1,1,1\n"),
+                              report)
+    assert [record["id"] for record in roster] == ["1000", "1002"]
+    assert [line_no for line_no, _, _ in report.errors] == [3]
+
+def test_wrong_field_count_and_header_are_reported(tmp_path):
+    report = LoadReport()
+    roster = read_roster_text(write(tmp_path, "five\n1000,Ada,10,11,12\n1001,Bob,1,2,3,40\n"), report)
+    assert len(roster) == 1
+    assert [line_no for line_no, _, _ in report.errors] == [1, 2]
+
+
+# COLUMNAR ROSTER
+def test_records_stay_valid_across_edits(make_roster):
+    roster, _ = make_roster(5)
+    third = roster[2]
+    roster.pop(0)
+    roster.append({"id": "x", "name": "New", "marks": [1, 2, 3], "exam": 4}) # Reuses slot 0
+    assert roster.position_of(third) == 1
+    assert roster[-1]["id"] == "x"
+    roster.update(third, marks=[20, 20, 20], exam=100)
+    assert (third["coursework_total"], third["percentage"], third["grade"]) == (60, 100.0, "A")
+    with pytest.raises(KeyError):
+        roster.update(third, grade="B")
+
+def test_long_names_widen_the_column(make_roster):
+    roster, _ = make_roster(3)
+    roster.update(roster[1], name="A much longer name than any before")
+    roster.append({"id": "1" * 40, "name": "n", "marks": [0, 0, 0], "exam": 0})
+    assert roster[1]["name"] == "A much longer name than any before"
+    assert roster[-1]["id"] == "1" * 40
+
+def test_sort_by_is_stable(make_roster):
+    roster, _ = make_roster(50)
+    expected = sorted(roster.to_dicts(), key=lambda s: s["grade"])
+    roster.sort_by("grade")
+    assert roster.to_dicts() == expected
+    expected = sorted(roster.to_dicts(), key=lambda s: s["exam"], reverse=True)
+    roster.sort_by("exam", reverse=True)
+    assert roster.to_dicts() == expected
+
+def test_change_log_replays_onto_a_list(make_roster, edit_randomly):
+    roster, rng = make_roster(20)
+    shown = [s["id"] for s in roster]
+    version = roster.version
+    for _ in range(30):
+        edit_randomly(roster, rng, rng.randint(1, 4), start=roster.version * 10)
+        steps, runs = plan_list_updates(roster.changes_since(version))
+        for kind, position, count in steps:
+            if kind == "insert":
+                shown[position:position] = [None] * count
+            else:
+                del shown[position]
+        for start, stop in runs:
+            shown[start:stop] = [s["id"] for s in roster[start:stop]]
+        assert shown == [s["id"] for s in roster]
+        version = roster.version
+
+def test_change_log_forgets_old_changes(make_roster):
+    roster, _ = make_roster(2)
+    version = roster.version
+    assert roster.changes_since(version) == []
+    for _ in range(CHANGE_LOG_SIZE + 1):
+        roster.update(roster[0], exam=1)
+    assert roster.changes_since(version) is None
+    roster.sort_by("name")
+    assert plan_list_updates(roster.changes_since(roster.version - 1)) is None
@@ -0,0 +1,55 @@
+import os
+
+from roster import LoadReport, read_roster_text, write_roster_text
+from roster_binary import (BinaryRosterFile, convert_roster, is_binary_roster, iter_binary_batches,
+                           read_roster_binary, read_roster_file, write_roster_file)
+
+
+def write_text(tmp_path, roster):
+    text = str(tmp_path / "marks.txt")
+    write_roster_text(text, roster.snapshot())
+    assert read_roster_text(text).to_dicts() == roster.to_dicts()
+    return text
+
+def test_text_and_binary_round_trip(tmp_path, make_roster):
+    roster, _ = make_roster(30)
+    roster.update(roster[0], name="Zoë Ünicode")
+    text, binary, back = (str(tmp_path / name) for name in ("marks.txt", "marks.bin", "back.txt"))
+    write_roster_text(text, roster.snapshot())
+    convert_roster(text, binary)
+    assert is_binary_roster(binary) and not is_binary_roster(text)
+    assert read_roster_binary(binary).to_dicts() == roster.to_dicts()
+    convert_roster(binary, back)
+    with open(text, "rb") as a, open(back, "rb") as b:
+        assert a.read() == b.read()
+
+def test_rows_and_batches_read_from_the_map(tmp_path, make_roster):
+    roster, _ = make_roster(25)
+    binary = str(tmp_path / "marks.bin")
+    convert_roster(write_text(tmp_path, roster), binary)
+    with BinaryRosterFile(binary) as f:
+        assert len(f) == 25
+        assert f[-1] == {key: roster[-1][key] for key in ("id", "name", "marks", "exam")}
+    report = LoadReport()
+    batches = list(iter_binary_batches(binary, batch_size=10, report=report))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [batch.first_line for batch in batches] == [1, 11, 21]
+    assert report.count_matches and report.finished
+
+def test_a_cut_short_file_keeps_its_complete_rows(tmp_path, make_roster):
+    roster, _ = make_roster(10)
+    binary = str(tmp_path / "marks.bin")
+    convert_roster(write_text(tmp_path, roster), binary)
+    os.truncate(binary, os.path.getsize(binary) - 3)
+    report = LoadReport()
+    assert read_roster_file(binary, report=report).to_dicts() == roster.to_dicts()[:9]
+    assert report.header_count == 10 and not report.count_matches
+
+def test_write_keeps_the_file_format(tmp_path, make_roster):
+    roster, _ = make_roster(5)
+    binary = str(tmp_path / "marks.bin")
+    convert_roster(write_text(tmp_path, roster), binary)
+    roster.pop(0)
+    write_roster_file(binary, roster.snapshot())
+    assert is_binary_roster(binary)
+    assert read_roster_file(binary).to_dicts() == roster.to_dicts()
@@ -0,0 +1,36 @@
+import pytest
+
+from sort_views import SORT_CHOICES, SortViews, make_key
+
+
+def expected_order(roster, key):
+    # Python's stable sort, least important field first
+    records = list(roster)
+    for field, descending in reversed(key):
+        records.sort(key=lambda s: s[field], reverse=descending)
+    return [s.slot for s in records]
+
+def test_every_choice_matches_a_stable_sort_after_edits(make_roster, edit_randomly):
+    roster, rng = make_roster(60)
+    views = SortViews(roster)
+    keys = [key for key in SORT_CHOICES.values() if key is not None]
+    for _ in range(4):
+        for key in keys:
+            assert views.get(key).tolist() == expected_order(roster, key)
+        edit_randomly(roster, rng, 30)
+
+def test_views_are_read_only_and_dropped_on_reorder(make_roster):
+    roster, _ = make_roster(10)
+    views = SortViews(roster)
+    key = make_key("-name")
+    with pytest.raises(ValueError):
+        views.get(key)[0] = 0
+    assert views.cached() == [key]
+    roster.sort_by("exam")
+    assert views.cached() == []
+    assert [s.slot for s in views.records(key, 2, 5)] == expected_order(roster, key)[2:5]
+
+def test_make_key_rejects_unknown_fields():
+    assert make_key("grade", "-percentage") == (("grade", False), ("percentage", True))
+    with pytest.raises(KeyError):
+        make_key("marks")
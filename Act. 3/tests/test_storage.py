@@ -0,0 +1,39 @@
+import pytest
+
+from roster import write_roster_text
+from storage import SQLiteStorage, import_roster, is_database, read_database
+
+
+@pytest.fixture
+def database(tmp_path, make_roster):
+    roster, rng = make_roster(40)
+    text, db = str(tmp_path / "marks.txt"), str(tmp_path / "marks.db")
+    write_roster_text(text, roster.snapshot())
+    report = import_roster(text, db)
+    assert report.rows_read == 40 and is_database(db)
+    return db, rng
+
+def test_edits_are_saved_to_the_database(database):
+    db, _ = database
+    roster = read_database(db)
+    storage = SQLiteStorage(db, roster)
+    storage.add({"id": "new", "name": "New", "marks": [1, 2, 3], "exam": 4})
+    storage.add_many([{"id": f"bulk{i}", "name": "Bulk", "marks": [5, 5, 5], "exam": i} for i in range(3)])
+    storage.update(roster[1], name="Changed", marks=[20, 20, 20])
+    storage.delete(roster[0])
+    with storage.batch():
+        storage.delete(roster[-1])
+        storage.add({"id": "last", "name": "Last", "marks": [0, 0, 0], "exam": 0})
+    storage.close()
+    assert read_database(db).to_dicts() == roster.to_dicts()
+
+def test_bad_students_never_reach_the_database(database):
+    db, _ = database
+    roster = read_database(db)
+    storage = SQLiteStorage(db, roster)
+    with pytest.raises(ValueError):
+        storage.add({"id": "x", "name": "Too High", "marks": [1, 2, 3], "exam": 100000})
+    with pytest.raises(ValueError):
+        storage.update(roster[0], name="Smith, Jo")
+    storage.close()
+    assert read_database(db).to_dicts() == roster.to_dicts()
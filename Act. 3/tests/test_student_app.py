@@ -0,0 +1,159 @@
+import io
+import tkinter as tk
+
+import pytest
+
+import student_pages
+from roster import Roster
+from startup_timeline import StartupTimeline
+from student_pages import StudentAppBase
+
+
+# No display here, so the window itself is stubbed out and only the page
+# bookkeeping in StudentAppBase runs for real
+class FakeFrame:
+    def __init__(self, *args, **kwargs):
+        self.bindings = {}
+
+    def pack(self, **kwargs):
+        pass
+
+    def place(self, **kwargs):
+        pass
+
+    def lower(self):
+        pass
+
+    def tkraise(self):
+        self.raised = True
+
+    def bind(self, event, callback):
+        self.bindings[event] = callback
+
+    def unbind(self, event):
+        del self.bindings[event]
+
+
+BUILT = [] # Page class names, in the order they were built
+
+class MenuPage(FakeFrame):
+    def __init__(self, parent, controller):
+        super().__init__()
+        BUILT.append("MenuPage")
+
+class AllStudentsPage(FakeFrame):
+    def __init__(self, parent, controller):
+        super().__init__()
+        BUILT.append("AllStudentsPage")
+
+class StatisticsPage(FakeFrame):
+    def __init__(self, parent, controller):
+        super().__init__()
+        BUILT.append("StatisticsPage")
+
+PAGES = (MenuPage, AllStudentsPage, StatisticsPage)
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    # after()/after_idle() callbacks, run by hand with run_jobs()
+    waiting = []
+    BUILT.clear()
+    monkeypatch.setattr(tk.Tk, "__init__", lambda self: None)
+    for name in ("title", "geometry", "resizable", "iconphoto"):
+        monkeypatch.setattr(tk.Tk, name, lambda self, *args: None)
+    monkeypatch.setattr(student_pages.ImageTk, "PhotoImage", lambda **kwargs: None)
+    monkeypatch.setattr(student_pages.tk, "Frame", FakeFrame)
+    monkeypatch.setattr(StudentAppBase, "after_idle", lambda self, func, *args: waiting.append((func, args)))
+    monkeypatch.setattr(StudentAppBase, "after", lambda self, ms, func, *args: waiting.append((func, args)))
+    return waiting
+
+def run_jobs(waiting):
+    while waiting:
+        func, args = waiting.pop(0)
+        func(*args)
+
+def make_app(prewarm=True):
+    output = io.StringIO()
+    app = StudentAppBase(Roster(), PAGES, timeline=StartupTimeline(output), prewarm=prewarm)
+    return app, output
+
+def events(app):
+    return [event for at, event, cost in app.timeline.events]
+
+
+def test_no_page_is_built_until_it_is_shown(jobs):
+    app, output = make_app()
+    assert app.frames == {} and BUILT == []
+    app.show_first_page()
+    assert BUILT == ["MenuPage"] and app.current_page == "MenuPage"
+    assert events(app) == ["built MenuPage"]
+    assert app.timeline.events[0][2] is not None # How long the build took
+    assert "built MenuPage (" in output.getvalue()
+
+def test_a_page_is_built_once_however_often_it_is_shown(jobs):
+    app, output = make_app(prewarm=False)
+    app.show_first_page()
+    app.show_frame("StatisticsPage")
+    app.show_frame("MenuPage")
+    app.show_frame("StatisticsPage")
+    assert BUILT == ["MenuPage", "StatisticsPage"]
+    assert app.current_page == "StatisticsPage"
+    assert events(app) == ["built MenuPage", "built StatisticsPage"]
+
+def test_the_rest_are_built_in_idle_time_after_the_first_frame(jobs):
+    app, output = make_app()
+    app.show_first_page()
+    app.frames["MenuPage"].bindings["<Map>"](None)
+    assert app.frames["MenuPage"].bindings == {} # Only the first frame counts
+    app.show_frame("AllStudentsPage") # Clicked before the idle build reached it
+    run_jobs(jobs)
+    assert BUILT == ["MenuPage", "AllStudentsPage", "StatisticsPage"]
+    assert events(app) == ["built MenuPage", "built AllStudentsPage", "first frame on screen",
+                           "built StatisticsPage in idle time", "all pages built"]
+    assert len(output.getvalue().splitlines()) == 5
+
+def test_prewarm_can_be_switched_off(jobs):
+    app, output = make_app(prewarm=False)
+    app.show_first_page()
+    app.frames["MenuPage"].bindings["<Map>"](None)
+    run_jobs(jobs)
+    assert BUILT == ["MenuPage"]
+    assert events(app) == ["built MenuPage", "first frame on screen"]
+
+
+# STARTUP TIMELINE
+def test_timed_returns_the_result_and_records_the_cost():
+    timeline = StartupTimeline()
+    assert timeline.timed("added", lambda a, b: a + b, 2, 3) == 5
+    [(at, event, cost)] = timeline.events
+    assert event == "added" and cost >= 0 and at >= cost
+
+def test_events_are_in_time_order():
+    timeline = StartupTimeline()
+    timeline.mark("first")
+    timeline.mark("second")
+    assert timeline.events[0][0] <= timeline.events[1][0]
+    assert [cost for at, event, cost in timeline.events] == [None, None]
+
+def test_switched_off_without_the_environment_variable(monkeypatch):
+    monkeypatch.delenv("STARTUP_TIMELINE", raising=False)
+    timeline = StartupTimeline.from_env()
+    timeline.mark("ignored")
+    assert timeline.output is None and len(timeline.events) == 1
+
+def test_writes_to_the_console_or_a_file(monkeypatch, tmp_path, capsys):
+    monkeypatch.setenv("STARTUP_TIMELINE", "-")
+    timeline = StartupTimeline.from_env()
+    timeline.mark("to the console")
+    timeline.close() # Leaves stdout open
+    assert capsys.readouterr().out.endswith("ms  to the console\n")
+
+    path = tmp_path / "startup.log"
+    monkeypatch.setenv("STARTUP_TIMELINE", str(path))
+    for run in range(2):
+        timeline = StartupTimeline.from_env()
+        timeline.mark(f"run {run}", 1.25)
+        timeline.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [line.split("ms  ", 1)[1] for line in lines] == ["run 0 (1.2 ms)", "run 1 (1.2 ms)"] # Appended
@@ -0,0 +1,91 @@
+import tkinter as tk
+from tkinter import ttk
+
+# VIRTUAL TABLE
+# A ttk.Treeview that only ever holds the rows you can see. Scrolling doesn't
+# move the Treeview itself; it changes which rows of the roster are copied into
+# the same few items. Rows just outside the window are fetched ahead of time
+# (the buffer) so small scrolls don't need to read the roster again.
+# Opening or refreshing the table costs the same for 100 rows or a million.
+
+GRADE_COLORS = {"A": "#a8e6cf", "B": "#dcedc1", "C": "#fff9b0", "D": "#ffd3b6", "F": "#ff8b94"}
+
+
+class VirtualTable(tk.Frame):
+    # row_count() -> number of rows; fetch_rows(start, stop) -> [(values, tag), ...]
+    def __init__(self, parent, columns, row_count, fetch_rows, height=10, buffer=20, width=120, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.row_count = row_count
+        self.fetch_rows = fetch_rows
+        self.height = height
+        self.buffer = buffer
+        self.first = 0 # Index of the top visible row
+        self._cache_start = 0
+        self._cache = [] # Rows fetched around the window
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=height)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor="center", width=width)
+        self.tree.pack(side="left")
+
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        # One tag per grade, shared by every row with that grade
+        for grade, color in GRADE_COLORS.items():
+            self.tree.tag_configure(f"grade{grade}", background=color)
+
+        # The same items are reused for every scroll position
+        self.items = [self.tree.insert("", tk.END, values=()) for _ in range(height)]
+
+        self.tree.bind("<MouseWheel>", self._on_wheel) # Windows / macOS
+        self.tree.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units")) # Linux
+        self.tree.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"))
+
+    # SCROLLING
+    def yview(self, *args):
+        # Same arguments the Scrollbar passes to a normal widget's yview
+        count = self.row_count()
+        if args[0] == "moveto":
+            first = int(float(args[1]) * count)
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            first = self.first + int(args[1]) * step
+        else:
+            return
+        self.scroll_to(first)
+
+    def _on_wheel(self, event):
+        self.yview("scroll", -1 if event.delta > 0 else 1, "units")
+        return "break"
+
+    def scroll_to(self, first):
+        count = self.row_count()
+        self.first = max(0, min(first, count - self.height))
+        self._render(count)
+
+    # DRAWING
+    def refresh(self):
+        # Call after the roster changes: forget the buffer and redraw the window
+        self._cache = []
+        self.scroll_to(self.first)
+
+    def _rows(self, start, stop):
+        cache_stop = self._cache_start + len(self._cache)
+        if not (self._cache_start <= start and stop <= cache_stop):
+            self._cache_start = max(0, start - self.buffer)
+            self._cache = self.fetch_rows(self._cache_start, stop + self.buffer)
+        return self._cache[start - self._cache_start:stop - self._cache_start]
+
+    def _render(self, count):
+        stop = min(self.first + self.height, count)
+        rows = self._rows(self.first, stop)
+        for item, (values, tag) in zip(self.items, rows):
+            self.tree.item(item, values=values, tags=(tag,))
+        for item in self.items[len(rows):]:
+            self.tree.item(item, values=(), tags=())
+        if count:
+            self.scrollbar.set(self.first / count, stop / count)
+        else:
+            self.scrollbar.set(0, 1)
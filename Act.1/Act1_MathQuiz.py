@@ -1,22 +1,22 @@
 import tkinter as tk
-from tkinter import font, messagebox
-import random # to randomize questions and operations
-import pygame # Info gathered from GeeksforGeeks
-from PIL import Image, ImageTk # for images
+from tkinter import font
+from PIL import ImageTk # for images
 import os
-
-pygame.mixer.init() # Applied to allow sounds/music
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For sound_bank.py at the top of the repo
+from quiz_assets import AssetLoader # Loads the background images (see quiz_assets.py)
+from problem_engine import QUESTIONS_PER_QUIZ, generate_problems # Makes the quiz questions (see problem_engine.py)
+from sound_bank import SoundBank # Music and sound effects (see sound_bank.py)
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # folder where this script lives
 
-# Background music
-pygame.mixer.music.load(os.path.join(BASE_DIR, "bg.mp3"))
-pygame.mixer.music.set_volume(0.2)
-pygame.mixer.music.play(-1)  # loop indefinitely
-
-correct_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "correct.wav")) # Correct answer sound effect
-wrong_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "wrong.wav")) # Wrong answer sound effect
+# Set QUIZ_SEED to a number to get the same questions every game (e.g. for testing)
+QUIZ_SEED = int(os.environ["QUIZ_SEED"]) if os.environ.get("QUIZ_SEED") else None
+# Set QUIZ_TIMING=1 to print how long each question takes to appear on screen, and
+# how long it is from one question to the next
+QUIZ_TIMING = bool(os.environ.get("QUIZ_TIMING"))
 
 root = tk.Tk()
 root.title("Arithmetic Quiz Game")
@@ -26,54 +26,111 @@ root.resizable(False, False) # Disables full screen option
 icon_image = ImageTk.PhotoImage(file=os.path.join(BASE_DIR, "icon.jpg"))
 root.iconphoto(False, icon_image) # Icon photo for my pages (Same icons for each page)
 
+sounds = SoundBank(BASE_DIR, {
+    "correct": ("correct.wav", 1.0), # Correct answer sound effect
+    "wrong": ("wrong.wav", 1.0), # Wrong answer sound effect
+})
+# Music starts and the effects are decoded once the window is up, not before it appears
+root.after_idle(sounds.play_music, "bg.mp3", 0.2) # Background music, loops indefinitely
+root.after_idle(sounds.preload)
+
 # Background images designed by me
-menu_bg_photo = ImageTk.PhotoImage(
-    Image.open(os.path.join(BASE_DIR, "menu.png")).resize((800, 500), Image.LANCZOS) # Background image for the menu page
-)
-instruction_bg_photo = ImageTk.PhotoImage(
-    Image.open(os.path.join(BASE_DIR, "ins.png")).resize((800, 500), Image.LANCZOS) # Background image for the instructions page
-)
-difficulty_bg_photo = ImageTk.PhotoImage(
-    Image.open(os.path.join(BASE_DIR, "dif.png")).resize((800, 500), Image.LANCZOS) # Background image for the select difficulty page
-)
-quiz_bg_photo = ImageTk.PhotoImage(
-    Image.open(os.path.join(BASE_DIR, "quiz.png")).resize((800, 500), Image.LANCZOS) # Background image for the quiz page
-)
-hight_bg_photo = ImageTk.PhotoImage(
-    Image.open(os.path.join(BASE_DIR, "high.png")).resize((800, 500), Image.LANCZOS) # Background image if user gets high score
-)
-med_bg_photo = ImageTk.PhotoImage(
-    Image.open(os.path.join(BASE_DIR, "med.png")).resize((800, 500), Image.LANCZOS) # Background image if user gets average score
-)
-low_bg_photo = ImageTk.PhotoImage(
-    Image.open(os.path.join(BASE_DIR, "low.png")).resize((800, 500), Image.LANCZOS) # Background image if user gets low/fail score
-)
+# Only the menu background is decoded before the window first appears, the others
+# are decoded on a worker thread, starting with the screen that is likely to come next
+assets = AssetLoader(BASE_DIR)
+assets.load_now("menu") # Background image for the menu page
+assets.start() # Instructions, difficulty, quiz and the three result backgrounds
+
+# SCREENS
+# Each screen is a frame built the first time it is shown and kept afterwards.
+# Changing screen just raises that frame above the others, and the quiz screen is
+# only updated (through the StringVars below) for each new question.
+screens = {} # Screen name -> its frame
+
+question_var = tk.StringVar() # "Question 3/10"
+problem_var = tk.StringVar() # "12 + 7 ="
+attempts_var = tk.StringVar() # "Attempts left: 2"
+result_var = tk.StringVar() # "Final Score: 80/100"
+grade_var = tk.StringVar() # "Your Grade: A"
+
+render_times = [] # ms each question took to appear, for QUIZ_TIMING
+question_gaps = [] # ms from one question appearing to the next one appearing
+answer_waits = [] # ms from submitting the final answer to a question until the next one appeared
+last_shown = None # perf_counter() when the last question appeared
+submitted_at = None # perf_counter() when the last question was finished with
+
+# ANSWER FEEDBACK
+# "Correct!" / "Try again" messages are shown on a banner over the window for a
+# moment instead of in a message box, so the player never has to click them away
+# and can keep typing while the banner is up.
+FEEDBACK_MS = 1500 # How long the banner stays up
+feedback_lbl = tk.Label(root, font=("Comic Sans MS", 16, "bold"), fg="white", padx=20, pady=8)
+feedback_job = None # after() id of the pending hideFeedback
 
 # FUNCTIONS
 
-def resetScreen():
-    for widget in root.winfo_children():
-        widget.destroy()
-
-def displayMenu():
-    resetScreen() # Removes other widgets
-    bg_label = tk.Label(root, image=menu_bg_photo) # Bg image for menu page
+def showScreen(name, build):
+    # Builds the screen with build(frame) the first time, afterwards only brings it to the front
+    frame = screens.get(name)
+    if frame is None:
+        frame = screens[name] = tk.Frame(root)
+        frame.place(x=0, y=0, relwidth=1, relheight=1)
+        build(frame)
+    frame.tkraise()
+    return frame
+
+def timeRender(label, started):
+    # Records how long until Tk has drawn the changes made since started
+    def drawn():
+        global last_shown, submitted_at
+        now = time.perf_counter()
+        ms = (now - started) * 1000
+        render_times.append(ms)
+        if last_shown is not None:
+            question_gaps.append((now - last_shown) * 1000)
+        if submitted_at is not None:
+            answer_waits.append((now - submitted_at) * 1000)
+        last_shown, submitted_at = now, None
+        if QUIZ_TIMING:
+            print(f"{label} shown in {ms:.1f} ms")
+    root.after_idle(drawn) # Runs after the redraws Tk queued for those changes
+
+def showFeedback(text, color):
+    # Shows the banner (replacing one that is still up) and hides it after FEEDBACK_MS
+    global feedback_job
+    feedback_lbl.config(text=text, bg=color)
+    feedback_lbl.place(relx=0.5, rely=0.22, anchor="center")
+    feedback_lbl.lift() # Above whichever screen is showing
+    if feedback_job is not None:
+        root.after_cancel(feedback_job)
+    feedback_job = root.after(FEEDBACK_MS, hideFeedback)
+
+def hideFeedback():
+    global feedback_job
+    feedback_job = None
+    feedback_lbl.place_forget()
+
+def buildMenu(frame):
+    bg_label = tk.Label(frame, image=assets.photo("menu")) # Bg image for menu page
     bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
-    start_btn = tk.Button(root, text="Start Game", command=instructionPage,
+    start_btn = tk.Button(frame, text="Start Game", command=instructionPage,
                         width=20, height=2, font=("Arial", 12, "bold"), bg="lightblue") # Start game button
     start_btn.place(relx=0.5, rely=0.65, anchor="center")  # Y axis adjusted to desired position
 
-    quit_btn = tk.Button(root, text="Quit Game", command=on_exit, 
+    quit_btn = tk.Button(frame, text="Quit Game", command=on_exit, 
                         width=20, height=2, font=("Arial", 12, "bold"), bg="tomato", fg="white") # Quit Game button
     quit_btn.place(relx=0.5, rely=0.8, anchor="center")
 
-def instructionPage(): # This page shows the instructions of the game
-    resetScreen()
-    bg_label = tk.Label(root, image=instruction_bg_photo) # Bg image for instructions page
+def displayMenu():
+    assets.visiting("menu") # Instructions background is decoded next
+    showScreen("menu", buildMenu)
+
+def buildInstructions(frame):
+    bg_label = tk.Label(frame, image=assets.photo("instructions")) # Bg image for instructions page
     bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
-    button_frame = tk.Frame(root, bg="")  # transparent frame
+    button_frame = tk.Frame(frame, bg="")  # transparent frame
     button_frame.place(relx=0.5, rely=0.78, anchor="center")
 
     continue_btn = tk.Button(button_frame, text="Continue", command=selectDifficulty,
@@ -85,129 +142,153 @@ def instructionPage(): # This page shows the instructions of the game
                         width=20, height=2, bg="lightgray", font=("Arial", 12, "bold"),
                         relief="flat", borderwidth=0, highlightthickness=0) # Back to Menu button
     back_btn.pack(side="left", padx=20)
+
+def instructionPage(): # This page shows the instructions of the game
+    assets.visiting("instructions")
+    showScreen("instructions", buildInstructions)
     
 def play_quiz(select_diff):
-    global currentProblem, level, marks # Starts the quiz after selecting difficulty
+    global currentProblem, level, marks, problems, last_shown, submitted_at # Starts the quiz after selecting difficulty
     currentProblem = 1 # Question counter
+    last_shown = submitted_at = None # Time spent on other screens isn't question time
     level = select_diff
     marks = 0 # Score at the beginning of the game
+    problems = generate_problems(level, QUESTIONS_PER_QUIZ, seed=QUIZ_SEED) # Every question (and answer) of this game
     displayProblem()
 
-def selectDifficulty(): # User shall select the difficulty level
-    resetScreen()
-    bg_label = tk.Label(root, image=difficulty_bg_photo) # Bg image for difficulty selection page
+def buildDifficulty(frame):
+    bg_label = tk.Label(frame, image=assets.photo("difficulty")) # Bg image for difficulty selection page
     bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
-    easy_btn = tk.Button(root, text="Easy (1-digit)", width=20, height=2, command=lambda: play_quiz("easy"),
+    easy_btn = tk.Button(frame, text="Easy (1-digit)", width=20, height=2, command=lambda: play_quiz("easy"),
             bg="DarkOliveGreen1", font=("Helvetica", 12, "bold")) # Easy level button
     easy_btn.place(relx=0.5, rely=0.39, anchor="center") 
     
-    moderate_btn = tk.Button(root, text="Moderate (2-digit)", width=20, height=2, command=lambda: play_quiz("moderate"),
+    moderate_btn = tk.Button(frame, text="Moderate (2-digit)", width=20, height=2, command=lambda: play_quiz("moderate"),
             bg="light goldenrod", font=("Helvetica", 12, "bold")) # Moderate level button
     moderate_btn.place(relx=0.5, rely=0.53, anchor="center") 
         
-    advanced_btn = tk.Button(root, text="Advanced (4-digit)", width=20, height=2, command=lambda: play_quiz("advanced"),
+    advanced_btn = tk.Button(frame, text="Advanced (4-digit)", width=20, height=2, command=lambda: play_quiz("advanced"),
             bg="salmon", font=("Helvetica", 12, "bold")) # Advanced level button
     advanced_btn.place(relx=0.5, rely=0.67, anchor="center")  
 
-    back_btn = tk.Button(root, text="Back", command=instructionPage, width=20, height=2,
+    back_btn = tk.Button(frame, text="Back", command=instructionPage, width=20, height=2,
             bg="lightgray", font=("Helvetica", 12, "bold")) # Back button to return to the instructions page
     back_btn.place(relx=0.5, rely=0.81, anchor="center")
 
-def randomInt(select_diff): 
-    if select_diff == "easy":
-        return random.randint(1, 9), random.randint(1, 9) # Generates 1 digit random numbers
-    elif select_diff == "moderate":
-        return random.randint(10, 99), random.randint(10, 99) # Generates 2 digit random numbers
-    else:
-        return random.randint(1000, 9999), random.randint(1000, 9999) # Generates 4 digit random numbers
-
-def decideOperation(): # Randomizes operation for the quiz
-    return random.choice(['+', '-'])
-
-def displayProblem(): # Displays the question
-    global num1, num2, operation, user_attempts
+def selectDifficulty(): # User shall select the difficulty level
+    assets.visiting("difficulty")
+    showScreen("difficulty", buildDifficulty)
 
-    resetScreen()
-    bg_label = tk.Label(root, image=quiz_bg_photo) # Bg image for quiz page
+def buildQuiz(frame):
+    global ans_entry # Box for users to enter their answer
+    bg_label = tk.Label(frame, image=assets.photo("quiz")) # Bg image for quiz page
     bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
-    num1, num2 = randomInt(level) # Create random question
-    operation = decideOperation()
-    user_attempts = 2 # Attempts given to the user
-
-    question_lbl = tk.Label(root, text=f"Question {currentProblem}/10", font=("Comic Sans Ms", 25), bg="#32651b", fg="white")
+    question_lbl = tk.Label(frame, textvariable=question_var, font=("Comic Sans Ms", 25), bg="#32651b", fg="white")
     question_lbl.place(relx=0.5, rely=0.37, anchor="center") 
     
-    operator_lbl = tk.Label(root, text=f"{num1} {operation} {num2} =", font=("Comic Sans Ms", 25), bg="#3c6d28", fg="white")
+    operator_lbl = tk.Label(frame, textvariable=problem_var, font=("Comic Sans Ms", 25), bg="#3c6d28", fg="white")
     operator_lbl.place(relx=0.5, rely=0.49, anchor="center") 
 
-    global ans_entry # Boxes for users to enter their answer
-    ans_entry = tk.Entry(root, font=("Comic Sans Ms", 16), justify='center')
+    ans_entry = tk.Entry(frame, font=("Comic Sans Ms", 16), justify='center')
     ans_entry.place(relx=0.5, rely=0.58, anchor="center") 
-    ans_entry.focus()
 
-    sub_btn = tk.Button(root, text="Submit", command=verifyAnswer, width=15, bg="lightblue", font=("Helvetica", 13, "bold")) # Submit button
+    sub_btn = tk.Button(frame, text="Submit", command=verifyAnswer, width=15, bg="lightblue", font=("Helvetica", 13, "bold")) # Submit button
     sub_btn.place(relx=0.5, rely=0.67, anchor="center") 
 
-    attempt_lbl = tk.Label(root, text=f"Attempts left: {user_attempts}", name="attempt_label", bg="darkred", fg="white",
+    attempt_lbl = tk.Label(frame, textvariable=attempts_var, bg="darkred", fg="white",
             font=("Helvetica", 10, "bold")) # Label to let user know how many attempts they have left in a problem
     attempt_lbl.place(relx=0.5, rely=0.75, anchor="center") 
 
-def ansCorrect(input_ans):
-    try: # Checks if user's answer is correct
-        correct_answer = eval(f"{num1} {operation} {num2}")
-        return int(input_ans) == correct_answer
-    except ValueError:
-        return False
+def displayProblem(): # Displays the question
+    global user_attempts
+    started = time.perf_counter()
+
+    assets.visiting("quiz") # Result backgrounds are decoded next
+    showScreen("quiz", buildQuiz)
+
+    user_attempts = 2 # Attempts given to the user
+    question_var.set(f"Question {currentProblem}/{QUESTIONS_PER_QUIZ}")
+    problem_var.set(problems.question(currentProblem - 1))
+    attempts_var.set(f"Attempts left: {user_attempts}")
+    ans_entry.delete(0, tk.END) # Clears the previous question's answer
+    ans_entry.focus()
+    timeRender(f"Question {currentProblem}", started)
+
+def ansCorrect(input_ans): # Checks if user's answer is correct
+    return problems.check(currentProblem - 1, input_ans)
 
 def verifyAnswer():
-    global marks, currentProblem, user_attempts # To verify the answer and to update score
+    global marks, currentProblem, user_attempts, submitted_at # To verify the answer and to update score
 
     input_ans = ans_entry.get()
 
+    # The next question (or the results) is shown straight away, with the banner on top
     if ansCorrect(input_ans):
-        correct_sound.play() # Sound will play if the answer is correct
+        sounds.play("correct") # Sound will play if the answer is correct
+        submitted_at = time.perf_counter()
         if user_attempts == 2: 
             marks += 10 # Score if first try answer is correct
-            messagebox.showinfo("Amazing!", "Correct on first try 🏆! (+10 points)")
+            nextProblem()
+            showFeedback("Correct on first try 🏆! (+10 points)", "#32651b")
         else:
             marks += 5 # User's second try and the score achieved if correct
-            messagebox.showinfo("Alright!", "Correct on second try 🏅! (+5 points)")
-        nextProblem()
+            nextProblem()
+            showFeedback("Correct on second try 🏅! (+5 points)", "#3c6d28")
     else:
-        wrong_sound.play() # Sound will play if answer is wrong
+        sounds.play("wrong") # Sound will play if answer is wrong
         user_attempts -= 1
         if user_attempts > 0:
-            messagebox.showwarning("Warning", f"Wrong answer 😔. Try again! ({user_attempts} attempt left)")
-            root.nametowidget(".attempt_label").config(text=f"Attempts left: {user_attempts}") # This label shows how many attempts left
+            attempts_var.set(f"Attempts left: {user_attempts}") # This label shows how many attempts left
+            ans_entry.select_range(0, tk.END) # Typing replaces the wrong answer
+            showFeedback(f"Wrong answer 😔. Try again! ({user_attempts} attempt left)", "darkorange")
         else:
-            messagebox.showerror("Fail Attempt", "No attempts left for this question 💔.")
+            submitted_at = time.perf_counter()
             nextProblem()
+            showFeedback("No attempts left for this question 💔.", "darkred")
 
 def nextProblem():
     global currentProblem # To proceed to the next question or to the result page once quiz is complete
     currentProblem += 1
-    if currentProblem <= 10:
+    if currentProblem <= QUESTIONS_PER_QUIZ:
         displayProblem()
     else:
         displayResults() # After quiz is over, user is moved to result page
 
-def displayResults():
-    resetScreen() # Decide which background to use based on score
-    if marks >= 70:
-        bg_label = tk.Label(root, image=hight_bg_photo)
-    elif marks >= 50:
-        bg_label = tk.Label(root, image=med_bg_photo)
-    else:
-        bg_label = tk.Label(root, image=low_bg_photo)
-
-    bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+def buildResults(frame):
+    global result_bg_label # Its image depends on the score
+    result_bg_label = tk.Label(frame)
+    result_bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
-    result_lbl = tk.Label(root, text=f"Final Score: {marks}/100", font=("Comic Sans MS", 20, "bold"),
+    result_lbl = tk.Label(frame, textvariable=result_var, font=("Comic Sans MS", 20, "bold"),
             bg="#32651b", fg="white") # Show final score
     result_lbl.place(relx=0.5, rely=0.47, anchor="center") 
 
+    grade_lbl = tk.Label(frame, textvariable=grade_var,
+            font=("Comic Sans MS", 18, "bold"), bg="#32651b", fg="white")
+    grade_lbl.place(relx=0.5, rely=0.56, anchor="center") 
+    
+    # Buttons to give user option either to play again or leave the game
+    restart_btn = tk.Button(frame, text="Play Again", command=displayMenu,
+            width=20, bg="lightblue", font=("Helvetica", 12, "bold"))
+    restart_btn.place(relx=0.5, rely=0.67, anchor="center") 
+
+    exit_btn = tk.Button(frame, text="Exit Game", command=on_exit,
+            width=20, bg="tomato", fg="white", font=("Helvetica", 12, "bold"))
+    exit_btn.place(relx=0.5, rely=0.77, anchor="center") 
+
+def displayResults():
+    if marks >= 70: # Decide which background to use based on score
+        screen = "high"
+    elif marks >= 50:
+        screen = "med"
+    else:
+        screen = "low"
+    assets.visiting(screen)
+    showScreen("results", buildResults)
+    result_bg_label.config(image=assets.photo(screen))
+
     if marks >= 90: # Determine grade result depending on the score
         grade = "A+"
     elif marks >= 80:
@@ -221,21 +302,17 @@ def displayResults():
     else:
         grade = "F"
 
-    grade_lbl = tk.Label(root, text=f"Your Grade: {grade}",
-            font=("Comic Sans MS", 18, "bold"), bg="#32651b", fg="white")
-    grade_lbl.place(relx=0.5, rely=0.56, anchor="center") 
-    
-    # Buttons to give user option either to play again or leave the game
-    restart_btn = tk.Button(root, text="Play Again", command=displayMenu,
-            width=20, bg="lightblue", font=("Helvetica", 12, "bold"))
-    restart_btn.place(relx=0.5, rely=0.67, anchor="center") 
-
-    exit_btn = tk.Button(root, text="Exit Game", command=on_exit,
-            width=20, bg="tomato", fg="white", font=("Helvetica", 12, "bold"))
-    exit_btn.place(relx=0.5, rely=0.77, anchor="center") 
+    result_var.set(f"Final Score: {marks}/100")
+    grade_var.set(f"Your Grade: {grade}")
+    if QUIZ_TIMING and render_times:
+        print(f"Questions shown in {sum(render_times) / len(render_times):.1f} ms on average "
+              f"(slowest {max(render_times):.1f} ms, {len(render_times)} questions)")
+    if QUIZ_TIMING and answer_waits:
+        print(f"{sum(question_gaps) / len(question_gaps):.0f} ms from one question to the next on average, "
+              f"{sum(answer_waits) / len(answer_waits):.1f} ms of it after the answer was submitted")
 
 def on_exit(): # Game stops as soon as player leaves the game
-    pygame.mixer.music.stop() # Music stops upon exiting
+    sounds.stop_music() # Music stops upon exiting
     root.destroy()
 
 # Starts the game at the menu page
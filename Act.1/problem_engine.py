@@ -0,0 +1,93 @@
+import numpy as np
+
+# PROBLEM ENGINE
+# Makes a whole quiz session of problems in one go with NumPy instead of one random
+# question at a time, and works out every answer up front. Checking an answer is then
+# just comparing two integers (no eval on a formatted string).
+# The same seed always gives the same problems, and no problem repeats in a session
+# (unless asked for more problems than a difficulty has).
+
+QUESTIONS_PER_QUIZ = 10
+
+# Operand range (inclusive) and operators for each difficulty
+DIFFICULTIES = {
+    "easy": {"range": (1, 9), "operators": ("+", "-")}, # 1 digit numbers
+    "moderate": {"range": (10, 99), "operators": ("+", "-")}, # 2 digit numbers
+    "advanced": {"range": (1000, 9999), "operators": ("+", "-")}, # 4 digit numbers
+}
+
+OPERATIONS = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+}
+
+
+class ProblemSet:
+    def __init__(self, left, operators, right, symbols):
+        self.left = left # Operand arrays (int64)
+        self.right = right
+        self.operators = operators # Index into symbols for each problem
+        self.symbols = symbols
+        self.answers = np.empty(len(left), dtype=np.int64)
+        for code, symbol in enumerate(symbols):
+            mask = operators == code
+            self.answers[mask] = OPERATIONS[symbol](left[mask], right[mask])
+
+    def __len__(self):
+        return len(self.left)
+
+    def question(self, i):
+        # Text shown to the player, e.g. "7 + 3 ="
+        return f"{int(self.left[i])} {self.symbols[self.operators[i]]} {int(self.right[i])} ="
+
+    def answer(self, i):
+        return int(self.answers[i])
+
+    def check(self, i, text):
+        # True if text is the right answer to problem i
+        try:
+            return int(text) == int(self.answers[i])
+        except ValueError:
+            return False
+
+
+def _unique_keys(rng, total, count):
+    # count different numbers from range(total), in a random order
+    if count > total // 2:
+        return rng.permutation(total)[:count] # Most of the range is needed anyway
+    keys = np.empty(0, dtype=np.int64)
+    while len(keys) < count:
+        missing = count - len(keys)
+        drawn = rng.integers(0, total, size=missing + missing // 4 + 16, dtype=np.int64)
+        keys = np.concatenate((keys, drawn))
+        _, first = np.unique(keys, return_index=True)
+        first.sort() # Keeps the draw order, so problems already picked stay where they are
+        keys = keys[first]
+    return keys[:count]
+
+def generate_problems(difficulty, count=QUESTIONS_PER_QUIZ, seed=None, unique=True, difficulties=DIFFICULTIES):
+    # count problems for a difficulty; seed=None gives a different session every time
+    settings = difficulties[difficulty]
+    low, high = settings["range"]
+    symbols = tuple(settings["operators"])
+    for symbol in symbols:
+        if symbol not in OPERATIONS:
+            raise ValueError(f"Unknown operator: {symbol!r}")
+    span = high - low + 1
+    rng = np.random.default_rng(seed)
+
+    if unique:
+        # Every (left, operator, right) problem is one number below span * operators * span
+        total = span * len(symbols) * span
+        if count > total:
+            raise ValueError(f"Only {total} different {difficulty} problems, asked for {count}")
+        keys = _unique_keys(rng, total, count)
+        left = keys // (span * len(symbols)) + low
+        operators = keys // span % len(symbols)
+        right = keys % span + low
+    else:
+        left = rng.integers(low, high, size=count, endpoint=True, dtype=np.int64)
+        operators = rng.integers(0, len(symbols), size=count, dtype=np.int64)
+        right = rng.integers(low, high, size=count, endpoint=True, dtype=np.int64)
+    return ProblemSet(left, operators, right, symbols)
@@ -0,0 +1,137 @@
+import os
+import sys
+import threading
+from collections import deque
+from PIL import Image, ImageTk
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) # For build_assets.py at the top of the repo
+from build_assets import lookup_prebuilt
+
+# Background images for every screen of the quiz, decoded off the main thread.
+# Only the menu background is decoded before the window first appears, the rest are
+# decoded one by one on a worker thread. Whenever a screen is shown, the screens that
+# can follow it (see NEXT_SCREENS) jump to the front of the worker's queue.
+# If a screen needs its image before the worker got to it, it waits for that image.
+# When build_assets.py has made pre-sized copies (build/manifest.json) those are
+# loaded instead, and only a missing or out of date copy is resized here.
+
+SCREEN_SIZE = (800, 500)
+
+BACKGROUNDS = {
+    "menu": "menu.png",
+    "instructions": "ins.png",
+    "difficulty": "dif.png",
+    "quiz": "quiz.png",
+    "high": "high.png", # Result screens
+    "med": "med.png",
+    "low": "low.png",
+}
+
+# Menu -> instructions -> difficulty -> quiz -> results (and back to the menu)
+NEXT_SCREENS = {
+    "menu": ("instructions",),
+    "instructions": ("difficulty", "menu"),
+    "difficulty": ("quiz", "instructions"),
+    "quiz": ("high", "med", "low"),
+    "high": ("menu",),
+    "med": ("menu",),
+    "low": ("menu",),
+}
+
+
+class AssetLoader:
+    def __init__(self, folder, files=BACKGROUNDS, size=SCREEN_SIZE, resample=Image.LANCZOS):
+        self.folder = folder
+        self.files = files
+        self.size = size
+        self.resample = resample
+        self._images = {} # name -> decoded and resized PIL image
+        self._errors = {} # name -> exception raised while decoding it
+        self._photos = {} # name -> PhotoImage (made on the main thread only)
+        self._busy = {} # name -> Event, set when the worker finishes that image
+        self._queue = deque() # Names still waiting for the worker
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def _decode(self, name):
+        # The copy made by build_assets.py if it is up to date (it is resized with LANCZOS)
+        if self.resample == Image.LANCZOS:
+            img = lookup_prebuilt(os.path.join(self.folder, self.files[name]), self.size)
+            if img is not None:
+                return img
+        with Image.open(os.path.join(self.folder, self.files[name])) as img:
+            return img.resize(self.size, self.resample)
+
+    def load_now(self, name):
+        # Decodes on this thread straight away (for the first screen)
+        self.image(name)
+
+    def start(self):
+        # Queues every image not loaded yet, in the order the screens are usually visited
+        with self._cond:
+            for name in self.files:
+                if name not in self._images and name not in self._busy and name not in self._queue:
+                    self._queue.append(name)
+            if self._queue and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._work, daemon=True)
+                self._thread.start()
+
+    def prefetch(self, names):
+        # Moves these images to the front of the queue (first name first)
+        with self._cond:
+            for name in reversed(names):
+                if name in self._queue:
+                    self._queue.remove(name)
+                    self._queue.appendleft(name)
+
+    def visiting(self, screen):
+        # Call when a screen is shown: whatever can come next is decoded next
+        self.prefetch(NEXT_SCREENS.get(screen, ()))
+
+    def _work(self):
+        while True:
+            with self._cond:
+                if not self._queue:
+                    return
+                name = self._queue.popleft()
+                done = self._busy[name] = threading.Event()
+            self._store(name, done)
+
+    def _store(self, name, done):
+        try:
+            img, error = self._decode(name), None
+        except Exception as e: # Handed to whoever asks for this image
+            img, error = None, e
+        with self._cond:
+            if error is None:
+                self._images[name] = img
+            else:
+                self._errors[name] = error
+            del self._busy[name]
+        done.set()
+
+    def image(self, name):
+        # The decoded image, waiting for the worker (or decoding it here) if needed
+        with self._cond:
+            done = self._busy.get(name)
+            if done is None and name not in self._images and name not in self._errors:
+                # Not started yet: quicker to decode it here than to wait in the queue
+                if name in self._queue:
+                    self._queue.remove(name)
+                done = self._busy[name] = threading.Event()
+                decode_here = True
+            else:
+                decode_here = False
+        if decode_here:
+            self._store(name, done)
+        elif done is not None:
+            done.wait()
+        if name in self._errors:
+            raise self._errors[name]
+        return self._images[name]
+
+    def photo(self, name):
+        # PhotoImage for a screen; Tk objects must be made on the main thread
+        photo = self._photos.get(name)
+        if photo is None:
+            photo = self._photos[name] = ImageTk.PhotoImage(self.image(name))
+        return photo
@@ -0,0 +1,51 @@
+import pytest
+
+from problem_engine import DIFFICULTIES, QUESTIONS_PER_QUIZ, generate_problems
+
+
+def triples(problems):
+    return [(int(problems.left[i]), problems.symbols[problems.operators[i]], int(problems.right[i]))
+            for i in range(len(problems))]
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_the_same_seed_gives_the_same_problems(difficulty):
+    first = generate_problems(difficulty, seed=42)
+    assert len(first) == QUESTIONS_PER_QUIZ
+    assert triples(generate_problems(difficulty, seed=42)) == triples(first)
+    assert triples(generate_problems(difficulty, seed=43)) != triples(first)
+
+@pytest.mark.parametrize("difficulty, count", [("easy", 100), ("easy", 162), ("moderate", 500), ("advanced", 300)])
+def test_no_problem_repeats_within_a_batch(difficulty, count):
+    # easy has 9 * 2 * 9 = 162 problems: asking for all of them takes the permutation path
+    problems = generate_problems(difficulty, count=count, seed=1)
+    assert len(set(triples(problems))) == count
+
+def test_asking_for_more_problems_than_exist():
+    with pytest.raises(ValueError):
+        generate_problems("easy", count=163)
+    assert len(generate_problems("easy", count=500, seed=2, unique=False)) == 500
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+@pytest.mark.parametrize("unique", [True, False])
+def test_operands_stay_in_range_and_answers_match_the_operator(difficulty, unique):
+    low, high = DIFFICULTIES[difficulty]["range"]
+    problems = generate_problems(difficulty, count=150, seed=3, unique=unique)
+    seen = set()
+    for i, (left, symbol, right) in enumerate(triples(problems)):
+        assert low <= left <= high and low <= right <= high
+        expected = left + right if symbol == "+" else left - right
+        assert problems.answer(i) == expected
+        assert problems.question(i) == f"{left} {symbol} {right} ="
+        assert problems.check(i, str(expected)) and problems.check(i, f" {expected} ")
+        assert not problems.check(i, str(expected + 1))
+        seen.add(symbol)
+    assert seen == {"+", "-"}
+
+def test_check_refuses_what_is_not_a_whole_number():
+    problems = generate_problems("easy", seed=4)
+    for text in ("", "abc", "1.5", str(problems.answer(0)) + "x"):
+        assert not problems.check(0, text)
+
+def test_unknown_operators_are_refused():
+    with pytest.raises(ValueError):
+        generate_problems("easy", difficulties={"easy": {"range": (1, 9), "operators": ("+", "/")}})
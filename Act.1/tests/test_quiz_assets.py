@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+from PIL import Image
+
+from quiz_assets import BACKGROUNDS, SCREEN_SIZE, AssetLoader
+
+
+def make_backgrounds(folder):
+    for colour, file in enumerate(BACKGROUNDS.values()):
+        Image.new("RGB", (40, 25), (colour * 30, 0, 0)).save(folder / file)
+    return str(folder)
+
+class RecordingLoader(AssetLoader):
+    # Remembers which images were decoded, in order, and can hold the worker
+    # thread inside its decodes until gate is set
+    def __init__(self, *args, hold=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decoded = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        if not hold:
+            self.gate.set()
+
+    def _decode(self, name):
+        self.decoded.append(name)
+        if threading.current_thread() is self._thread:
+            self.entered.set()
+            self.gate.wait(5)
+        return super()._decode(name)
+
+def finish(loader):
+    loader.gate.set()
+    loader._thread.join(5)
+    assert not loader._thread.is_alive()
+
+def call_with_timeout(func, *args):
+    # Runs func(*args) on another thread so a hang fails the test instead of stopping it
+    outcome = {}
+    def run():
+        try:
+            outcome["result"] = func(*args)
+        except Exception as e:
+            outcome["error"] = e
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive(), "still waiting for the image"
+    return outcome
+
+
+def test_every_background_is_decoded_to_the_screen_size(tmp_path):
+    loader = AssetLoader(make_backgrounds(tmp_path))
+    loader.load_now("menu")
+    loader.start()
+    for name in BACKGROUNDS:
+        img = loader.image(name)
+        assert isinstance(img, Image.Image) and img.size == SCREEN_SIZE
+    assert loader.image("menu").getpixel((0, 0)) == (0, 0, 0)
+    assert loader.image("quiz").getpixel((0, 0)) == (90, 0, 0)
+
+def test_the_menu_comes_first_and_is_not_decoded_twice(tmp_path):
+    loader = RecordingLoader(make_backgrounds(tmp_path))
+    loader.load_now("menu")
+    assert loader.decoded == ["menu"] # Before the worker has even started
+    loader.start()
+    finish(loader)
+    assert loader.decoded == list(BACKGROUNDS)
+
+def test_the_next_screens_jump_the_queue(tmp_path):
+    loader = RecordingLoader(make_backgrounds(tmp_path), hold=True)
+    loader.load_now("menu")
+    loader.start()
+    assert loader.entered.wait(5) # Worker is now busy with "instructions"
+    loader.visiting("quiz")
+    finish(loader)
+    assert loader.decoded == ["menu", "instructions", "high", "med", "low", "difficulty", "quiz"]
+
+def test_an_image_still_queued_is_decoded_by_whoever_asks(tmp_path):
+    loader = RecordingLoader(make_backgrounds(tmp_path), hold=True)
+    loader.start()
+    assert loader.entered.wait(5) # Worker is held on "menu"
+    assert "low" in loader._queue
+    outcome = call_with_timeout(loader.image, "low")
+    assert outcome["result"].size == SCREEN_SIZE and "low" not in loader._queue
+    finish(loader)
+    assert loader.decoded.count("low") == 1
+
+def test_a_missing_file_reports_an_error_instead_of_hanging(tmp_path):
+    files = dict(BACKGROUNDS, quiz="gone.png")
+    loader = AssetLoader(make_backgrounds(tmp_path), files=files)
+    loader.start()
+    outcome = call_with_timeout(loader.image, "quiz") # Decoded by the worker or here
+    assert isinstance(outcome["error"], FileNotFoundError)
+    loader._thread.join(5)
+    with pytest.raises(FileNotFoundError):
+        loader.image("quiz") # Asking again gives the same error
+    assert loader.image("menu").size == SCREEN_SIZE # The others are unaffected
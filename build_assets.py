@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import hashlib
+from PIL import Image
+
+# ASSET BUILD
+# Makes the resized images the apps would otherwise make on every launch and lists
+# them in a manifest next to the sources:
+#     Act.1/build/manifest.json, Act. 2/resources/build/manifest.json, Act. 3/assets/build/manifest.json
+# Each entry records the source image's size, mtime and SHA-256, so an app can tell
+# whether the pre-sized copy is still up to date. The apps ask lookup_prebuilt() for
+# it; if there is no up to date copy (or no build at all) they resize at runtime like before.
+#
+# Run with:  python build_assets.py           build whatever is missing or stale
+#            python build_assets.py --check   only report what is missing or stale
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BUILD_DIR = "build"
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+# (folder, source image, size, resample) - the same resizes the apps do
+ASSETS = [
+    *[("Act.1", name, (800, 500), "lanczos")
+      for name in ("menu.png", "ins.png", "dif.png", "quiz.png", "high.png", "med.png", "low.png")],
+    ("Act. 2/resources", "start.png", (360, 640), "default"),
+    ("Act. 2/resources", "alexheader.png", (360, 100), "default"),
+    ("Act. 3/assets", "header.png", (724, 200), "lanczos"),
+]
+
+RESAMPLE = {"lanczos": Image.Resampling.LANCZOS, "default": None} # None is Pillow's own default
+
+
+def asset_key(source, size):
+    return f"{source}@{size[0]}x{size[1]}"
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def read_manifest(folder):
+    try:
+        with open(os.path.join(folder, BUILD_DIR, MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"version": MANIFEST_VERSION, "assets": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "assets": {}}
+    return manifest
+
+def source_matches(path, entry):
+    # Same size and mtime as at build time is enough; a fresh checkout touches every
+    # file though, so otherwise the contents are compared
+    st = os.stat(path)
+    if (st.st_size, st.st_mtime_ns) == (entry["source_bytes"], entry["source_mtime_ns"]):
+        return True
+    return file_sha256(path) == entry["source_sha256"]
+
+def lookup_prebuilt(path, size, resample="lanczos"):
+    # For the apps: the pre-sized copy of the image at path, already loaded, or None if
+    # there isn't an up to date one made with this resample
+    folder, source = os.path.split(os.path.abspath(path))
+    entry = read_manifest(folder)["assets"].get(asset_key(source, size))
+    try:
+        if entry is None or entry["resample"] != resample or not source_matches(path, entry):
+            return None
+        with Image.open(os.path.join(folder, BUILD_DIR, entry["file"])) as img:
+            img.load()
+            return img
+    except (OSError, ValueError, KeyError):
+        return None # A broken build, or the source image is gone
+
+def is_fresh(folder, entry, source, size, resample):
+    # True if the entry's output exists and was made from the current source the same way
+    if entry is None or entry["resample"] != resample or not os.path.exists(os.path.join(folder, BUILD_DIR, entry["file"])):
+        return False
+    return file_sha256(os.path.join(folder, source)) == entry["source_sha256"]
+
+def build_asset(folder, source, size, resample):
+    source_path = os.path.join(folder, source)
+    st = os.stat(source_path)
+    source_hash = file_sha256(source_path)
+    with Image.open(source_path) as img:
+        # Converted to the mode Tk shows anyway, so loading it needs no conversion
+        img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        img = img.resize(size, RESAMPLE[resample])
+    stem, _ = os.path.splitext(source)
+    name = f"{stem}-{size[0]}x{size[1]}-{source_hash[:12]}.png"
+    path = os.path.join(folder, BUILD_DIR, name)
+    img.save(path + ".tmp", format="PNG", compress_level=1)
+    os.replace(path + ".tmp", path)
+    return {"source": source, "size": list(size), "resample": resample,
+            "source_bytes": st.st_size, "source_mtime_ns": st.st_mtime_ns, "source_sha256": source_hash,
+            "file": name, "sha256": file_sha256(path)}
+
+def build(check_only=False, log=print, assets=ASSETS, root=ROOT):
+    # Returns the list of assets that were (or, with check_only, would be) rebuilt
+    folders = {}
+    for folder, source, size, resample in assets:
+        folders.setdefault(os.path.join(root, folder), []).append((source, size, resample))
+
+    stale = []
+    for folder, folder_assets in folders.items():
+        manifest = read_manifest(folder)
+        entries = manifest["assets"]
+        changed = False
+        for source, size, resample in folder_assets:
+            key = asset_key(source, size)
+            if is_fresh(folder, entries.get(key), source, size, resample):
+                continue
+            stale.append((os.path.relpath(folder, root), key))
+            if check_only:
+                log(f"stale: {os.path.relpath(folder, root)}/{key}")
+                continue
+            os.makedirs(os.path.join(folder, BUILD_DIR), exist_ok=True)
+            old = entries.get(key)
+            entries[key] = build_asset(folder, source, size, resample)
+            if old is not None and old["file"] != entries[key]["file"]:
+                try:
+                    os.remove(os.path.join(folder, BUILD_DIR, old["file"]))
+                except FileNotFoundError:
+                    pass
+            changed = True
+            log(f"built: {os.path.relpath(folder, root)}/{BUILD_DIR}/{entries[key]['file']}")
+        if changed:
+            path = os.path.join(folder, BUILD_DIR, MANIFEST)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(path + ".tmp", path)
+    return stale
+
+
+if __name__ == "__main__":
+    check_only = "--check" in sys.argv[1:]
+    stale = build(check_only)
+    if not stale:
+        print("All assets are up to date.")
+    sys.exit(1 if check_only and stale else 0)
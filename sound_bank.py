@@ -0,0 +1,134 @@
+import os
+import time
+
+try:
+    import pygame
+except ImportError: # No pygame at all: everything stays silent
+    pygame = None
+
+# SOUND BANK
+# Every sound effect is decoded once (by preload() or the first time it is played)
+# and kept, instead of making a new pygame Sound each time. Effects play on a few
+# mixer channels reserved for them: playing an effect again while it is still going
+# restarts it on the same channel rather than stacking another copy, and when every
+# channel is busy the one that started longest ago is reused.
+# Without an audio device (or with SOUND=off) a silent backend is used, so the apps
+# still run headless. Shared by Act.1 and Act. 2, which add this folder to sys.path.
+
+CHANNELS = 4
+
+
+class PygameBackend:
+    def __init__(self, channels):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init() # Raises pygame.error when there is no audio device
+        if pygame.mixer.get_num_channels() < channels:
+            pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(channels) # pygame won't pick these for anything else
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+
+    def load(self, path, volume):
+        sound = pygame.mixer.Sound(path)
+        sound.set_volume(volume)
+        return sound
+
+    def play(self, sound, channel):
+        self.channels[channel].play(sound) # Stops whatever that channel was playing
+
+    def playing(self, channel):
+        # The sound on that channel, or None if it is free
+        return self.channels[channel].get_sound() if self.channels[channel].get_busy() else None
+
+    def play_music(self, path, volume, loops):
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops)
+
+    def stop_music(self):
+        pygame.mixer.music.stop()
+
+
+class SilentBackend:
+    # Plays nothing, but remembers what each channel was given (a silent sound never
+    # ends), so SoundBank picks channels the same way it would with pygame
+    def __init__(self, channels):
+        self.channels = [None] * channels
+
+    def load(self, path, volume):
+        return path
+
+    def play(self, sound, channel):
+        self.channels[channel] = sound
+
+    def playing(self, channel):
+        return self.channels[channel]
+
+    def play_music(self, path, volume, loops):
+        pass
+
+    def stop_music(self):
+        pass
+
+
+def open_backend(channels=CHANNELS):
+    # pygame if it can play sound here, otherwise the silent backend
+    if pygame is None or os.environ.get("SOUND") == "off":
+        return SilentBackend(channels)
+    try:
+        return PygameBackend(channels)
+    except pygame.error as e:
+        print("Sound disabled:", e)
+        return SilentBackend(channels)
+
+
+class SoundBank:
+    def __init__(self, folder, effects, backend=None):
+        self.folder = folder
+        self.effects = effects # name -> (file name, volume)
+        self.backend = backend if backend is not None else open_backend()
+        self._sounds = {} # name -> decoded sound, or None if it couldn't be loaded
+        self._started = [0.0] * len(self.backend.channels) # When each channel last started a sound
+
+    def _sound(self, name):
+        if name not in self._sounds:
+            file_name, volume = self.effects[name]
+            try:
+                self._sounds[name] = self.backend.load(os.path.join(self.folder, file_name), volume)
+            except Exception as e: # Missing or unreadable file: that effect just stays silent
+                print(f"Error loading sound {file_name}:", e)
+                self._sounds[name] = None
+        return self._sounds[name]
+
+    def preload(self):
+        # Decodes every effect now, so the first play doesn't have to
+        for name in self.effects:
+            self._sound(name)
+
+    def play(self, name):
+        sound = self._sound(name)
+        if sound is None:
+            return
+        channels = range(len(self._started))
+        playing = [self.backend.playing(channel) for channel in channels]
+        if sound in playing: # Already playing: restart it there
+            channel = playing.index(sound)
+        elif None in playing:
+            channel = playing.index(None)
+        else:
+            channel = min(channels, key=self._started.__getitem__)
+        self._started[channel] = time.perf_counter()
+        self.backend.play(sound, channel)
+
+    def play_music(self, file_name, volume, loops=-1):
+        # Background music, looped forever by default
+        path = os.path.join(self.folder, file_name)
+        if not os.path.exists(path):
+            print("Music file not found:", file_name)
+            return
+        try:
+            self.backend.play_music(path, volume, loops)
+        except Exception as e:
+            print("Error playing music:", e)
+
+    def stop_music(self):
+        self.backend.stop_music()
@@ -0,0 +1,48 @@
+import os
+from PIL import Image, ImageChops
+
+from build_assets import build, lookup_prebuilt
+
+
+def make_source(tmp_path, color=(200, 40, 40)):
+    folder = tmp_path / "art"
+    folder.mkdir(exist_ok=True)
+    path = folder / "bg.png"
+    img = Image.new("RGB", (40, 20), color)
+    img.paste((0, 0, 255), (0, 0, 20, 10))
+    img.save(path)
+    return str(path)
+
+def build_one(tmp_path, resample="lanczos"):
+    return build(log=lambda message: None, assets=[("art", "bg.png", (8, 4), resample)], root=str(tmp_path))
+
+def test_a_built_asset_loads_back(tmp_path):
+    path = make_source(tmp_path)
+    assert build_one(tmp_path) == [("art", "bg.png@8x4")]
+    assert build_one(tmp_path) == [] # Up to date now
+    img = lookup_prebuilt(path, (8, 4))
+    with Image.open(path) as source:
+        expected = source.resize((8, 4), Image.Resampling.LANCZOS)
+    assert img.size == (8, 4)
+    assert ImageChops.difference(img.convert("RGB"), expected).getbbox() is None
+    assert lookup_prebuilt(path, (8, 5)) is None # Never built at that size
+    assert lookup_prebuilt(path, (8, 4), "default") is None # Built with another resample
+
+def test_a_touched_but_unchanged_source_still_matches(tmp_path):
+    path = make_source(tmp_path)
+    build_one(tmp_path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9)) # As a fresh checkout would
+    assert lookup_prebuilt(path, (8, 4)) is not None
+
+def test_a_changed_source_falls_back(tmp_path):
+    path = make_source(tmp_path)
+    build_one(tmp_path)
+    make_source(tmp_path, color=(10, 200, 10)) # Edited after the build
+    assert lookup_prebuilt(path, (8, 4)) is None
+    assert build_one(tmp_path) == [("art", "bg.png@8x4")]
+    assert lookup_prebuilt(path, (8, 4)) is not None
+    assert len(os.listdir(tmp_path / "art" / "build")) == 2 # The old copy was removed
+
+def test_no_build_at_all(tmp_path):
+    assert lookup_prebuilt(make_source(tmp_path), (8, 4)) is None
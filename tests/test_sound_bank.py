@@ -0,0 +1,53 @@
+from sound_bank import CHANNELS, SilentBackend, SoundBank, open_backend
+
+
+class CountingBackend(SilentBackend):
+    # Silent, but keeps a log of every load and play
+    def __init__(self, channels):
+        super().__init__(channels)
+        self.loads = []
+        self.plays = []
+
+    def load(self, path, volume):
+        if path.endswith("missing.wav"):
+            raise FileNotFoundError(path)
+        self.loads.append(path)
+        return super().load(path, volume)
+
+    def play(self, sound, channel):
+        self.plays.append((sound, channel))
+        super().play(sound, channel)
+
+
+def bank(channels, *names):
+    return SoundBank("sfx", {name: (f"{name}.wav", 0.5) for name in names}, CountingBackend(channels))
+
+def channels_used(sounds):
+    return [channel for _, channel in sounds.backend.plays]
+
+def test_effects_use_only_the_reserved_channels_and_restart_in_place():
+    sounds = bank(3, "correct", "wrong", "click")
+    for name in ("correct", "wrong", "correct", "click", "wrong"):
+        sounds.play(name)
+    assert channels_used(sounds) == [0, 1, 0, 2, 1] # A replay restarts on the channel it is on
+    assert len(sounds.backend.loads) == 3 # Each effect decoded once
+
+def test_when_every_channel_is_busy_the_oldest_is_reused():
+    sounds = bank(2, "a", "b", "c", "d")
+    for name in ("a", "b", "c", "d", "a"):
+        sounds.play(name)
+    assert channels_used(sounds) == [0, 1, 0, 1, 0]
+    assert sounds.backend.channels == [sounds._sound("a"), sounds._sound("d")]
+
+def test_preload_decodes_everything_and_a_missing_file_stays_silent():
+    sounds = bank(2, "a", "missing")
+    sounds.preload()
+    assert len(sounds.backend.loads) == 1
+    sounds.play("missing")
+    sounds.play("a")
+    assert channels_used(sounds) == [0]
+
+def test_sound_off_gives_the_silent_backend(monkeypatch):
+    monkeypatch.setenv("SOUND", "off")
+    backend = open_backend()
+    assert isinstance(backend, SilentBackend) and len(backend.channels) == CHANNELS